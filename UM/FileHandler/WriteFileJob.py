@@ -2,7 +2,9 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 from UM.Job import Job
-from UM.FileHandler.gcode import TransformGCode 
+from UM.FileHandler.gcode import LayerMetrics, TransformGCode, TransformGCodeStream
+from UM.FileHandler.gcodecache import LayerCache
+from UM.FileHandler.gcodestatistics import ToolpathStatistics
 
 from UM.Logger import Logger
 from UM.FileHandler.FileWriter import FileWriter
@@ -13,7 +15,7 @@ import os
 import time
 import subprocess
 
-from typing import Any, Optional, Union
+from typing import Any, List, Optional, Union
 
 
 class WriteFileJob(Job):
@@ -41,7 +43,16 @@ class WriteFileJob(Job):
         self._mode = mode
         # If this file should be added to the "recent files" list upon success
         self._add_to_recent_files = False
+        # If a layer index of the G-code and the transformed G-code should be written
+        self._write_layer_index = False
+        # If the transformed layers should be kept in a layer cache next to the
+        # transformed G-code, to reuse them when the file is written again
+        self._use_layer_cache = False
+        # If the moves of the written G-code should be analyzed
+        self._analyze_toolpath = False
+        self._toolpath_statistics = None  # type: Optional[ToolpathStatistics]
         self._message = None  # type: Optional[Message]
+        self._transform_metrics = []  # type: List[LayerMetrics]
         self.progress.connect(self._onProgress)
         self.finished.connect(self._onFinished)
 
@@ -63,6 +74,61 @@ class WriteFileJob(Job):
     def getStream(self) -> Union[io.BytesIO, io.StringIO]:
         return self._stream
 
+    def getTransformedFileName(self) -> str:
+        """The file that the transformed G-code for the Merlin printer is written to."""
+
+        return os.path.splitext(self.getFileName())[0] + "_transformed.gcode"
+
+    def getLayerCacheFileName(self) -> str:
+        """The file that keeps the transformed layers, to reuse them when the file is written again."""
+
+        return os.path.splitext(self.getTransformedFileName())[0] + ".cache"
+
+    def getLayerIndexFileName(self) -> str:
+        """The file that the LayerIndex of the written and the transformed G-code is written to."""
+
+        return os.path.splitext(self.getTransformedFileName())[0] + ".index"
+
+    def setWriteLayerIndex(self, value: bool) -> None:
+        self._write_layer_index = value
+
+    def getWriteLayerIndex(self) -> bool:
+        return self._write_layer_index
+
+    def setUseLayerCache(self, value: bool) -> None:
+        """Keep the transformed layers in the file of getLayerCacheFileName().
+
+        Writing the same file again is then faster, but the cache takes a few
+        times the size of the G-code on disk and makes the first write slower.
+        """
+
+        self._use_layer_cache = value
+
+    def getUseLayerCache(self) -> bool:
+        return self._use_layer_cache
+
+    def setAnalyzeToolpath(self, value: bool) -> None:
+        self._analyze_toolpath = value
+
+    def getAnalyzeToolpath(self) -> bool:
+        return self._analyze_toolpath
+
+    def getToolpathStatistics(self) -> Optional[ToolpathStatistics]:
+        """The travel, extrusion, turns and estimated time of the written G-code,
+        once the job has run with setAnalyzeToolpath(True).
+
+        They are calculated a layer at a time from the moves that the transform
+        followed, so the written file is not read again and the moves of the
+        whole file are never held at once.
+        """
+
+        return self._toolpath_statistics
+
+    def getTransformMetrics(self) -> List[LayerMetrics]:
+        """What the G-code transform did in every layer, once the job has run."""
+
+        return self._transform_metrics
+
     def setMessage(self, message: Message) -> None:
         self._message = message
 
@@ -78,18 +144,70 @@ class WriteFileJob(Job):
     def run(self) -> None:
         Job.yieldThread()
         begin_time = time.time()
+        #------------------------------------
+        # call TransformGCode() from gcode.py
+        #------------------------------------
+        transform = TransformGCode()
+        transform.setAnalyzeToolpath(self._analyze_toolpath)
+        if self._file_name and self._mode == FileWriter.OutputMode.TextMode:
+            self._writeAndTransform(transform)
+        else:
+            self._write(self._stream)
+            if self._write_layer_index:
+                transform.setLayerIndexFile(self.getLayerIndexFileName())
+            transform.updateGcode(self.getFileName(), self.getTransformedFileName())
+        self._transform_metrics = transform.getMetrics()
+        if self._analyze_toolpath:
+            self._analyzeToolpath(transform)
+        end_time = time.time()
+        Logger.log("d", "Writing file took %s seconds", end_time - begin_time)
+        self._logTransformMetrics()
+
+    def _analyzeToolpath(self, transform: TransformGCode) -> None:
+        self._toolpath_statistics = transform.getToolpathStatistics()
+        Logger.log("d", "Toolpath of %s: %s", self.getFileName(), self._toolpath_statistics)
+
+    def _logTransformMetrics(self) -> None:
+        metrics = self._transform_metrics
+        if not metrics:
+            return
+        Logger.log("d", "Transformed %s lines into %s lines in %s layers (%s from the layer cache): %s moves, %s C lines, %s M1, %s M2 and %s M3 lines",
+                   sum(layer.linesIn for layer in metrics), sum(layer.linesOut for layer in metrics), len(metrics) - 1,
+                   sum(layer.cached for layer in metrics), sum(layer.moves for layer in metrics), sum(layer.cLines for layer in metrics),
+                   sum(layer.m1Lines for layer in metrics), sum(layer.m2Lines for layer in metrics), sum(layer.m3Lines for layer in metrics))
+        for layer in sorted(metrics, key = lambda layer: layer.seconds, reverse = True)[:5]:
+            Logger.log("d", "Slowest layers of the transform: %s", layer)
+
+    def _write(self, stream: Union[io.BytesIO, io.StringIO, TransformGCodeStream]) -> None:
         self.setResult(None if not self._writer else self._writer.write(
-            self._stream, self._data, self._mode))
+            stream, self._data, self._mode))
         Logger.log("d", "---------------------------------")
         Logger.log("d", self.getFileName())
         if not self.getResult():
             self.setError(Exception(
                 "No writer in WriteFileJob" if not self._writer else self._writer.getInformation()))
-        end_time = time.time()
-        Logger.log("d", "Writing file took %s seconds", end_time - begin_time)
-        #------------------------------------
-        # call TransformGCode() from gcode.py
-        #------------------------------------
-        transform = TransformGCode()
-        transform.updateGcode(self.getFileName(), os.path.splitext(
-            self.getFileName())[0]+"_transformed.gcode")
+
+    def _writeAndTransform(self, transform: TransformGCode) -> None:
+        """Writes the file while transforming the G-code as the writer produces it.
+
+        The writer's output is teed into the transform, so the transformed file is
+        complete as soon as the writer is, and the written file is never read back.
+        Layers that did not change since the file was last written are taken from
+        the layer cache, if it is used.
+        """
+
+        if self._use_layer_cache:
+            transform.setLayerCache(LayerCache(self.getLayerCacheFileName()))
+        transformed_file_name = self.getTransformedFileName()
+        with open(transformed_file_name, "w", buffering = TransformGCode.bufferSize) as transformed_stream:
+            stream = TransformGCodeStream(self._stream, transform, transformed_stream, indexLayers = self._write_layer_index)
+            try:
+                self._write(stream)
+                stream.finish()
+            except Exception:
+                transform.abort()
+                raise
+        if self._write_layer_index:
+            # Made from where the layers were while both files were written.
+            stream.writeLayerIndex(self.getLayerIndexFileName())
+        transform.openInCoach(transformed_file_name)
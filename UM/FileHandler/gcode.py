@@ -1,113 +1,161 @@
+import collections
+import io
+import json
 import os
 import math
-from enum import Enum
+import mmap
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
 import subprocess
+import time
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+import numpy
+
+from UM.FileHandler.gcodecache import LayerCache
+from UM.FileHandler.gcodeindex import LayerIndex, LayerIndexEntry, LineOffsets, findLineStarts
+from UM.FileHandler.gcodetokenizer import GCodeLine, tokenizeLine
+from UM.FileHandler.gcodestatistics import ToolpathAnalyzer, ToolpathStatistics
+from UM.FileHandler.gcodetoolpath import MoveFollower, SliceType, Toolpath
+
+# The state that is carried from one layer to the next; see TransformGCode._layerState().
+_LayerState = Tuple[float, float, int, SliceType, int, bool, bool]
+
+class LayerMetrics:
+    """What the transform did in one layer of the G-code."""
+
+    def __init__(self, layer: Optional[int]) -> None:
+        self.layer = layer  # The number of the layer, or None for the lines before the first layer.
+        self.linesIn = 0
+        self.linesOut = 0
+        self.moves = 0  # XY moves.
+        self.cLines = 0
+        self.m1Lines = 0
+        self.m2Lines = 0
+        self.m3Lines = 0
+        self.seconds = 0.0  # Time spent on the layer, by the process that transformed it.
+        self.cached = False  # Whether the layer was taken from the layer cache.
+
+    def __repr__(self) -> str:
+        return "LayerMetrics(layer={layer}, linesIn={linesIn}, linesOut={linesOut}, moves={moves}, cLines={cLines}, " \
+               "m1Lines={m1Lines}, m2Lines={m2Lines}, m3Lines={m3Lines}, seconds={seconds:.6f}, cached={cached})".format(**vars(self))
+
 
 class TransformGCode:
-    class SliceType(Enum):
-        NONE = 0
-        INNER = 1
-        OUTER = 2
-        SKIN = 3
-        FILL = 4
-        SKIRT = 5
+    SliceType = SliceType
 
+    # The preview of the transform: a chart of the moves of every slice type
+    # in a layer, and of all of them together. PREVIEW_JSON is replaced by
+    # getPreviewJSON().
     htmlTemplate = '''
     <html>
     <head>
         <script type="text/javascript" src="https://www.gstatic.com/charts/loader.js"></script>
         <script type="text/javascript">
+            var preview = PREVIEW_JSON;
             google.charts.load('current', { 'packages': ['corechart'] });
-            google.charts.setOnLoadCallback(drawChart);
-            function drawChart() {
-                JS_TEMPLATE
+            google.charts.setOnLoadCallback(drawCharts);
+            function drawChart(row, title, x, y) {
+                var data = [['X', 'Y']];
+                for (var i = 0; i < x.length; i++) {
+                    data.push([x[i], y[i]]);
+                }
+                var div = document.createElement('div');
+                div.style.width = '700px';
+                div.style.height = '400px';
+                row.insertCell().appendChild(div);
+                new google.visualization.LineChart(div).draw(google.visualization.arrayToDataTable(data), {
+                    title: title,
+                    legend: { position: 'none' },
+                    'chartArea': {'width': '90%', 'height': '80%'},
+                });
+            }
+            function drawCharts() {
+                var table = document.getElementById('preview');
+                preview.forEach(function (layer) {
+                    var row = table.insertRow();
+                    row.insertCell().textContent = layer.layer;
+                    var allX = [], allY = [];
+                    layer.paths.forEach(function (path) {
+                        drawChart(row, path.type, path.x, path.y);
+                        allX = allX.concat(path.x);
+                        allY = allY.concat(path.y);
+                    });
+                    drawChart(row, 'ALL', allX, allY);
+                });
             }
         </script>
     </head>
     <body>
-        <table border='0'>
-            DIV_TEMPLATE
+        <table id='preview' border='0'>
         </table>
     </body>
     </html>
     '''
 
-    jsTemplate = '''
-                    data1 = google.visualization.arrayToDataTable([
-                        ['X', 'Y'],
-                        DATA_1
-                    ]);
-                    data2 = google.visualization.arrayToDataTable([
-                        ['X', 'Y'],
-                        DATA_2
-                    ]);
-                    data3 = google.visualization.arrayToDataTable([
-                        ['X', 'Y'],
-                        DATA_3
-                    ]);
-                    data4 = google.visualization.arrayToDataTable([
-                        ['X', 'Y'],
-                        DATA_4
-                    ]);
-                    options1 = {
-                        title: 'TITLE_1',
-                        legend: { position: 'none' },
-                        'chartArea': {'width': '90%', 'height': '80%'},
-                    };
-                    options2 = {
-                        title: 'TITLE_2',
-                        legend: { position: 'none' },
-                        'chartArea': {'width': '90%', 'height': '80%'},
-                    };
-                    options3 = {
-                        title: 'TITLE_3',
-                        legend: { position: 'none' },
-                        'chartArea': {'width': '90%', 'height': '80%'},
-                    };
-                    options4 = {
-                        title: 'TITLE_4',
-                        legend: { position: 'none' },
-                        'chartArea': {'width': '90%', 'height': '80%'},
-                    };
-                    CHART_1 = new google.visualization.LineChart(document.getElementById('ROWCOL_1'));
-                    CHART_1.draw(data1, options1);
-                    CHART_2 = new google.visualization.LineChart(document.getElementById('ROWCOL_2'));
-                    CHART_2.draw(data2, options2);
-                    CHART_3 = new google.visualization.LineChart(document.getElementById('ROWCOL_3'));
-                    CHART_3.draw(data3, options3);
-                    CHART_3 = new google.visualization.LineChart(document.getElementById('ROWCOL_4'));
-                    CHART_3.draw(data4, options4);
-    '''
-
-    divTemplate = '''
-            <tr>
-                <td>
-                    _LAYER_
-                </td>
-                <td>
-                    <div id="ROWCOL_1" style="width: 700px; height: 400px"></div>
-                </td>
-                <td>
-                    <div id="ROWCOL_2" style="width: 700px; height: 400px"></div>
-                </td>
-                <td>
-                    <div id="ROWCOL_3" style="width: 700px; height: 400px"></div>
-                </td>
-                <td>
-                    <div id="ROWCOL_4" style="width: 700px; height: 400px"></div>
-                </td>
-            </tr>
-    '''
-
     layerHeight = 30
     secondaryZAxis = 1000
-    store = []
     sliceType = SliceType.NONE
     layer = 0
-    holdJSTemplate = ""
-    holdDivTemplate = ""
-    points = {}
-    pathOrder = []
+
+    # Slice types that are printed with the side lifted (M2 ... M3)
+    _liftSliceTypes = (SliceType.FILL, SliceType.SKIN, SliceType.SKIRT)
+
+    # Size of the read and write buffers used by updateGcode(). The file is
+    # streamed through these, so memory use does not depend on the file size.
+    bufferSize = 1024 * 1024
+
+    # Output lines are collected per layer, so that the C angles of all moves
+    # in the layer can be calculated at once. Very long layers are written out
+    # in batches of at most this many lines.
+    batchSize = 65536
+
+    # transformFile() with more than one process hands the file to the workers
+    # in ranges of whole layers of at least this many bytes.
+    layerRangeSize = 4 * 1024 * 1024
+
+    # Line numbers that stand for the lines still pending at the start of a
+    # range of layers, while it is transformed without the ranges before it.
+    _pendingSaveLine = -1
+    _pendingNonXYLines = -2
+    _pendingMarkers = {-3: "_writeLayer", -4: "_writeTypeStart", -5: "_writeTypeEnd"}
+
+    def __init__(self) -> None:
+        # Kept per instance, so one export never starts from the last point or
+        # the preview of the export before it.
+        self.store = []  # type: List[List[float]]
+        # The moves of the current layer, or of all layers if the toolpath is
+        # kept; see setKeepToolpath(). The C angles and the preview are
+        # calculated from them.
+        self.toolpath = Toolpath()
+        self._follower = MoveFollower(self.toolpath)
+        # The slice type and first move in toolpath of every ;TYPE: in the current layer.
+        self.pathStarts = []  # type: List[Tuple[TransformGCode.SliceType, int]]
+        # The layers that are previewed; see getPreviewJSON().
+        self.preview = []  # type: List[Dict[str, object]]
+        # Keep only every n-th point of the given slice types in the preview,
+        # for example {SliceType.FILL: 4}.
+        self.previewPointStep = {}  # type: Dict[TransformGCode.SliceType, int]
+        # What the transform did in every layer; see getMetrics().
+        self.metrics = []  # type: List[LayerMetrics]
+        self._destination = None  # type: Optional[TextIO]
+        self._layerCache = None  # type: Optional[LayerCache]
+        self._layerIndexFile = None  # type: Optional[str]
+        self._keepToolpath = False
+        self._cacheLayers = False  # Whether the layer cache is used by the current transform.
+        self._analyzeToolpath = False
+        # The statistics of the moves so far, if they are analyzed, and how
+        # many of the moves in toolpath are in them.
+        self._analyzer = None  # type: Optional[ToolpathAnalyzer]
+        self._analyzedMoves = 0
+        # Where the layers of the output are and the state each layer starts
+        # in, while they are recorded; see recordLayerOffsets().
+        self._outputOffsets = None  # type: Optional[LineOffsets]
+        self._layerStates = None  # type: Optional[List[Tuple[_LayerState, int]]]
+        self._indexedMetrics = 0  # Metrics of which the output start is recorded.
+        self._indexedLines = 0  # The output line those metrics end at.
+        self._resetStreamState()
 
     # ----------------------------------
     # toString()
@@ -116,36 +164,87 @@ class TransformGCode:
         return f"{type(self).__name__}(layerHeight={self.layerHeight}, secondaryZAxis={self.secondaryZAxis})"
 
     # ---------------------------------
-    # Generate HTML for the layer
+    # State that is carried from one line to the next while streaming
+    # ---------------------------------
+    def _resetStreamState(self) -> None:
+        self._count = 1
+        self._layerCount = 1
+        self._saveLine = None  # type: Optional[Tuple[int, str]]  # last G-code line, written out when the next one is known
+        self._saveTurn = None  # type: Optional[int]  # line number of the C line that follows _saveLine, if any
+        # Line numbers of the pending M1, M3 and M2 lines.
+        self._writeLayer = None  # type: Optional[int]
+        self._writeTypeStart = None  # type: Optional[int]
+        self._writeTypeEnd = None  # type: Optional[int]
+        self._nextZ = ""
+        self._nonXYLines = []  # type: List[Tuple[int, str]]
+        # The output of the current batch, as the number and the rest of every
+        # line. _turnSlots are the positions of the C lines in it, which are
+        # filled in when the batch is written.
+        self._numbers = []  # type: List[int]
+        self._codes = []  # type: List[str]
+        self._turnSlots = []  # type: List[int]
+        # The XY moves of the batch, as their rows in toolpath, and the position
+        # of the last XY move before the batch. The C angle of a relative move
+        # has always been taken to the X and Y it moves by, as if they were a
+        # position, so those are kept by the number of the move in the batch.
+        self._turnRows = []  # type: List[int]
+        self._relativeTurns = {}  # type: Dict[int, Tuple[float, float]]
+        self._lastTurn = None  # type: Optional[Tuple[float, float]]
+        # The metrics of the current layer. _metricsStart is when this process
+        # started on the layer, or None if the time was measured elsewhere.
+        self._metrics = LayerMetrics(None)
+        self._metricsStart = time.perf_counter()  # type: Optional[float]
+        self._countedLines = 0  # Lines of the current batch that are in the metrics.
+        # The source lines of the layer that is read, while layers are cached.
+        self._layerLines = None  # type: Optional[List[str]]
+
+    def _layerState(self) -> _LayerState:
+        """The state that is carried from one layer to the next, apart from the
+        pending lines, the line number and where the tool is: the layer height,
+        the secondary Z axis, the layer count, the slice type, the number of
+        the layer and whether moves and their E are relative."""
+
+        return self.layerHeight, self.secondaryZAxis, self._layerCount, self.sliceType, self.layer, self._follower.relative, self._follower.relativeE
+
+    def _log(self, text: str) -> None:
+        print(text)
+
+    # ---------------------------------
+    # Add the current layer to the preview
     # ---------------------------------
     def addLayerHTML(self):
-        if not self.points:
+        if not self.pathStarts:
             return
-        tempJS = self.jsTemplate
-        tempDiv = self.divTemplate
-        allPoints = ""
-        column = 0
-        for porder in self.pathOrder:
-            column = column + 1
-            if porder in self.points:
-                tempJS = tempJS.replace(
-                    "DATA_" + str(column), self.points[porder])
-                tempJS = tempJS.replace(
-                    "ROWCOL_" + str(column), "row_" + str(self.layer) + "_col_" + str(column))
-                tempJS = tempJS.replace("TITLE_" + str(column), str(porder))
-                tempDiv = tempDiv.replace(
-                    "ROWCOL_" + str(column), "row_" + str(self.layer) + "_col_" + str(column))
-                allPoints = allPoints + self.points[porder]
-
-        tempJS = tempJS.replace("DATA_4", allPoints)
-        tempJS = tempJS.replace("ROWCOL_4", "row_" +
-                                str(self.layer) + "_col_4")
-        tempJS = tempJS.replace("TITLE_4", "ALL")
-        tempDiv = tempDiv.replace(
-            "ROWCOL_4", "row_" + str(self.layer) + "_col_4")
-        tempDiv = tempDiv.replace("_LAYER_", str(self.layer))
-        self.holdJSTemplate = self.holdJSTemplate + tempJS
-        self.holdDivTemplate = self.holdDivTemplate + tempDiv
+        moves = self.toolpath.moves
+        # A slice type that occurs more than once in a layer is charted
+        # with the moves of its last occurrence, in the place of its first.
+        lastPaths = {}  # type: Dict[TransformGCode.SliceType, Tuple[int, int]]
+        ends = [start for _, start in self.pathStarts[1:]] + [len(moves)]
+        for (sliceType, start), end in zip(self.pathStarts, ends):
+            lastPaths[sliceType] = (start, end)
+        paths = []
+        # Moves at the start of a layer range before anything set where the tool is.
+        knownFrom = self._follower.knownFrom
+        first = len(moves) if knownFrom["x"] is None or knownFrom["y"] is None else max(knownFrom["x"], knownFrom["y"])
+        for sliceType, (start, end) in lastPaths.items():
+            rows = numpy.arange(start, end, self.previewPointStep.get(sliceType, 1))
+            path = moves[rows[rows >= first]]
+            paths.append({"type": sliceType.name, "x": path["x"].tolist(), "y": path["y"].tolist()})
+        self.preview.append({"layer": self.layer, "paths": paths})
+
+    # ---------------------------------
+    # The preview as compact JSON: a list of layers, each
+    # with the X and Y of the moves of every slice type.
+    # Only the first layers and the last one are in it.
+    # ---------------------------------
+    def getPreviewJSON(self) -> str:
+        return json.dumps(self.preview, separators = (",", ":"))
+
+    # ---------------------------------
+    # The preview as a page of charts
+    # ---------------------------------
+    def getPreviewHTML(self) -> str:
+        return self.htmlTemplate.replace("PREVIEW_JSON", self.getPreviewJSON())
 
     # ---------------------------------------------------
     # Calculate if there is a turn between three given points
@@ -160,6 +259,33 @@ class TransformGCode:
         angle = math.atan(formula)*(180/math.pi)
         return angle
 
+    # ---------------------------------------------------
+    # Calculate the C angles of all moves along the given
+    # XY positions at once; one angle for every position
+    # after the first, formatted like calculateTurn()
+    # ---------------------------------------------------
+    @staticmethod
+    def calculateTurns(x: numpy.ndarray, y: numpy.ndarray) -> List[str]:
+        deltaX = numpy.diff(x)
+        deltaY = numpy.diff(y)
+        vertical = deltaX == 0
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            angles = numpy.arctan(deltaY / deltaX) * (180 / math.pi)
+        angles[vertical] = 90
+        angles = numpy.where(angles < 0, 180 - angles, angles)
+
+        # NumPy's arctan may differ from math.atan in the last bit. That only
+        # shows in the output when an angle is right between two values of the
+        # 5th decimal, so those few are calculated again the same way as before.
+        scaled = angles * 100000
+        ambiguous = numpy.flatnonzero(numpy.abs(scaled - numpy.floor(scaled) - 0.5) < 1e-4)
+        angles = angles.tolist()
+        for index in ambiguous.tolist():
+            if not vertical[index]:
+                angle = math.atan(deltaY[index] / deltaX[index]) * (180 / math.pi)
+                angles[index] = 180 - angle if angle < 0 else angle
+        return [format(angle, '.5f') for angle in angles]
+
     # ---------------------------------------------------
     # find the shift in x-axis between two points
     # ---------------------------------------------------
@@ -176,199 +302,1166 @@ class TransformGCode:
             return 0
         return self.store[1][1] - self.store[0][1]
 
+    def updateGcode(self, source: str, dest: str, processes: int = 1):
+        """Transform the G-code file source into dest and open it in the Merlin coach.
+
+        :param processes: The number of processes to transform the file with;
+        see transformFile(). More than one is for scripts and other callers of
+        this API only: the application exports through WriteFileJob, which
+        transforms the G-code in a single pass while it is written.
+        """
+
+        print(dest+","+source)
+        with open(dest, "w", buffering = self.bufferSize) as of:
+            self.transformFile(source, of, processes)
+        if self._layerIndexFile is not None:
+            self.writeLayerIndex(source, dest, self._layerIndexFile)
+        print("-------------Done---------")
+        self.openInCoach(dest)
+
     # ---------------------------------------------------
-    # find the shift in x-axis between two points
+    # Open a transformed G-code file in the Merlin coach
     # ---------------------------------------------------
-    def updateGcode(self, source: str, dest: str):
-        print(dest+","+source)
-        f = open(source, "r")
-        of = open(dest,  "w")
-
-        count = 1
-        content = f.readlines()
-        layerCount = 1
-        saveLine = ""
-        writeLayer = ""
-        writeTypeStart = ""
-        writeTypeEnd = ""
-        nextZ = ""
-        nonXYLines = []
+    def openInCoach(self, dest: str) -> None:
+        subprocess.Popen([os.environ['PROGRAMFILES'] +
+                        "/Merlin Printer 1.0.0/UM/g2p/g2pcoach.exe", dest])
+
+    # ---------------------------------------------------
+    # Stream the lines of source through the transform
+    # into destination. At most one layer (or batchSize
+    # lines) of output is held in memory.
+    # ---------------------------------------------------
+    def transform(self, source: Iterable[str], destination: TextIO) -> None:
+        self.begin(destination)
+        try:
+            for line in source:
+                self.processLine(line)
+            self.end()
+        except Exception:
+            self.abort()
+            raise
+
+    def transformFile(self, source: str, destination: TextIO, processes: int = 1) -> None:
+        """Transform the G-code file source into destination.
+
+        With more than one process, ranges of layers are transformed in worker
+        processes and merged here; the output is the same as that of
+        transform(). This is not used by the application, whose exports are
+        transformed by WriteFileJob while they are written. The workers are
+        spawned, so a script that uses them must start from an
+        ``if __name__ == "__main__":`` block, and call
+        multiprocessing.freeze_support() there if it is frozen into an
+        executable.
+        """
+
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self.transform([], destination)
+                return
+            with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                if _loneCarriageReturn.search(data) is not None:
+                    # Only reading text splits the lines at a lone "\r".
+                    with open(source, "r", buffering = self.bufferSize) as text:
+                        self.transform(text, destination)
+                elif processes > 1 and not self._keepToolpath and len(data) > self.layerRangeSize:
+                    self._transformLayerRanges(source, data, destination, processes)
+                else:
+                    self.transformBytes(iter(data.readline, b""), destination)
+
+    # ---------------------------------------------------
+    # Like transform(), for lines of G-code that are not
+    # decoded yet. Only the lines the transform looks at
+    # are decoded; comments, M lines and empty lines are
+    # skipped as they are.
+    # ---------------------------------------------------
+    def transformBytes(self, source: Iterable[bytes], destination: TextIO) -> None:
+        self.begin(destination)
+        try:
+            for line in source:
+                self.processLineBytes(line)
+            self.end()
+        except Exception:
+            self.abort()
+            raise
+
+    # ---------------------------------------------------
+    # Start a new transform writing into destination.
+    # Lines are then pushed with processLine() and the
+    # transform is completed with end().
+    # ---------------------------------------------------
+    def begin(self, destination: TextIO) -> None:
+        self._destination = destination
+        self._resetStreamState()
+        self.store.clear()
+        self.toolpath = Toolpath()
+        self._follower = MoveFollower(self.toolpath)
+        self._analyzer = ToolpathAnalyzer() if self._analyzeToolpath else None
+        self._analyzedMoves = 0
+        self._outputOffsets = None
+        self._layerStates = None
+        self.pathStarts = []
+        self.preview = []
+        self.metrics = [self._metrics]
+        self.sliceType = self.SliceType.NONE
+        self.layer = 0
+        self._cacheLayers = self._layerCache is not None and not self._keepToolpath
+        if self._cacheLayers:
+            self._layerCache.begin()
 
-        for line in content:
-            line = line.strip()
-            if ";Layer height:" in line:
-                tempVal = line.split(":")[1].strip()
-                self.layerHeight = float(tempVal)
-                print("Layer Height : " + str(self.layerHeight))
-                continue
-            if ";secondary_z_axis:" in line:
-                tempVal = line.split(":")[1].strip()
+    # ---------------------------------------------------
+    # Stop a transform that failed between begin() and
+    # end(). The layer cache is left as it was before.
+    # ---------------------------------------------------
+    def abort(self) -> None:
+        if self._cacheLayers:
+            self._layerCache.abort()
+            self._cacheLayers = False
+        self._destination = None
+
+    # ---------------------------------------------------
+    # Reuse the layers of the last transform that was
+    # done with this cache, where they did not change.
+    # None transforms every layer again.
+    # ---------------------------------------------------
+    def setLayerCache(self, cache: Optional[LayerCache]) -> None:
+        self._layerCache = cache
+
+    def getLayerCache(self) -> Optional[LayerCache]:
+        return self._layerCache
+
+    # ---------------------------------------------------
+    # Keep the moves of all layers in toolpath, instead
+    # of only those of the current layer. Every layer is
+    # then transformed in order in this process; layer
+    # ranges and the layer cache are not used.
+    # ---------------------------------------------------
+    def setKeepToolpath(self, value: bool) -> None:
+        self._keepToolpath = value
+
+    def getKeepToolpath(self) -> bool:
+        return self._keepToolpath
+
+    # ---------------------------------------------------
+    # The moves of the last transform, with the position
+    # they end at; see setKeepToolpath()
+    # ---------------------------------------------------
+    def getToolpath(self) -> Toolpath:
+        return self.toolpath
+
+    # ---------------------------------------------------
+    # Calculate the ToolpathStatistics of the moves while
+    # they are transformed, a layer at a time, so that
+    # only the moves of a layer are held. Layer ranges
+    # and the layer cache are used as they are otherwise.
+    # ---------------------------------------------------
+    def setAnalyzeToolpath(self, value: bool) -> None:
+        self._analyzeToolpath = value
+
+    def getAnalyzeToolpath(self) -> bool:
+        return self._analyzeToolpath
+
+    # ---------------------------------------------------
+    # The statistics of the last transform, or None if
+    # it did not analyze the toolpath
+    # ---------------------------------------------------
+    def getToolpathStatistics(self) -> Optional[ToolpathStatistics]:
+        return None if self._analyzer is None else self._analyzer.statistics
+
+    # ---------------------------------------------------
+    # Let updateGcode() also write a LayerIndex of the
+    # files into this file. None writes no index.
+    # ---------------------------------------------------
+    def setLayerIndexFile(self, path: Optional[str]) -> None:
+        self._layerIndexFile = path
+
+    def getLayerIndexFile(self) -> Optional[str]:
+        return self._layerIndexFile
+
+    # ---------------------------------------------------
+    # Write the LayerIndex of the G-code file source and
+    # the file output it was just transformed into
+    # ---------------------------------------------------
+    def writeLayerIndex(self, source: str, output: str, path: str) -> LayerIndex:
+        with open(source, "rb") as f:
+            sourceSize = os.fstat(f.fileno()).st_size
+            if sourceSize == 0:
+                layerStarts = []
+            else:
+                with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                    layerStarts = _scanLayerStarts(data)
+        if len(self.metrics) - 1 != len(layerStarts):
+            raise ValueError("The transform was not of " + source)
+
+        outputLines = numpy.cumsum([0] + [metrics.linesOut for metrics in self.metrics]).tolist()
+        with open(output, "rb") as f:
+            outputSize = os.fstat(f.fileno()).st_size
+            if outputSize == 0:
+                outputStarts = [0] * len(outputLines)
+            else:
+                with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                    outputStarts = findLineStarts(data, outputLines)
+        return self._saveLayerIndex(layerStarts, sourceSize, outputStarts, outputSize, path)
+
+    def _saveLayerIndex(self, layerStarts: List[Tuple[int, _LayerState, int]], sourceSize: int,
+                        outputStarts: List[int], outputSize: int, path: str) -> LayerIndex:
+        """Saves the LayerIndex of the last transform.
+
+        :param layerStarts: The offset in the source, the state before it and
+        the number of every layer.
+        :param outputStarts: The offset in the output of the lines of every
+        metrics, and of the end.
+        """
+
+        layers = self.metrics[1:]
+        sourceLines = numpy.cumsum([0] + [metrics.linesIn for metrics in self.metrics]).tolist()
+        outputLines = numpy.cumsum([0] + [metrics.linesOut for metrics in self.metrics]).tolist()
+        sourceEnds = [start for start, _, _ in layerStarts[1:]] + [sourceSize]
+        entries = []
+        for i, ((sourceStart, state, layer), sourceEnd) in enumerate(zip(layerStarts, sourceEnds)):
+            layerHeight, secondaryZAxis, layerCount, sliceType, previousLayer, relative, relativeE = state
+            entries.append(LayerIndexEntry(layer, sourceStart, sourceEnd, sourceLines[i + 1], layers[i].linesIn,
+                                           outputStarts[i + 1], outputStarts[i + 2], outputLines[i + 1], layers[i].linesOut,
+                                           layerHeight, secondaryZAxis, layerCount, sliceType.value, previousLayer,
+                                           relative, relativeE))
+        index = LayerIndex(entries, sourceSize, outputSize)
+        index.save(path)
+        return index
+
+    # ---------------------------------------------------
+    # Record where the layers of the output start while it
+    # is written, in bytes of the given encoding, and the
+    # state every layer starts in. Called after begin(),
+    # for that transform; see TransformGCodeStream.
+    # ---------------------------------------------------
+    def recordLayerOffsets(self, encoding: str) -> None:
+        self._outputOffsets = LineOffsets(encoding)
+        self._layerStates = []
+        self._indexedMetrics = 0
+        self._indexedLines = 0
+
+    # ---------------------------------------------------
+    # Transform one layer of the G-code file source again,
+    # found with its LayerIndex. The result has the preview
+    # and metrics of the layer, without the lines and the
+    # move that are still pending from the layer before.
+    # ---------------------------------------------------
+    def transformLayer(self, source: str, index: LayerIndex, layer: int) -> "TransformGCode":
+        entry = index.getLayer(layer)
+        transform = _LayerRangeTransform((entry.layerHeight, entry.secondaryZAxis, entry.layerCount,
+                                          self.SliceType(entry.sliceType), entry.previousLayer,
+                                          entry.relative, entry.relativeE))
+        transform.previewPointStep = self.previewPointStep
+        for line in io.BytesIO(index.readSource(source, layer)):
+            transform.processLineBytes(line)
+        transform.finish()
+        transform.addLayerHTML()
+        return transform
+
+    # ---------------------------------------------------
+    # What the transform did in every layer so far. The
+    # first entry is for the lines before the first layer.
+    # ---------------------------------------------------
+    def getMetrics(self) -> List[LayerMetrics]:
+        return self.metrics
+
+    # ---------------------------------------------------
+    # Transform a single line of the source G-code
+    # ---------------------------------------------------
+    def processLine(self, line: str) -> None:
+        if self._cacheLayers and (self._layerLines is not None or ";LAYER:" in line):
+            self._readCachedLayerLine(line)
+            return
+        self.processTokens(tokenizeLine(line))
+
+    # ---------------------------------------------------
+    # Transform a single line of the source G-code that is
+    # not decoded yet
+    # ---------------------------------------------------
+    def processLineBytes(self, line: bytes) -> None:
+        if not self._cacheLayers and (not line or line[0] in _skippedLineStarts) and _skippedLine.match(line) is not None:
+            self._metrics.linesIn += 1
+            return
+        self.processLine(line.decode(_sourceEncoding))
+
+    # ---------------------------------------------------
+    # Transform a single line that is already tokenized
+    # ---------------------------------------------------
+    def processTokens(self, tokens: GCodeLine) -> None:
+        self._metrics.linesIn += 1
+        if tokens.comment is not None and ":" in tokens.comment:
+            if tokens.hasTag("Layer height:"):
+                self.layerHeight = float(tokens.getTagValue("Layer height:"))
+                self._log("Layer Height : " + str(self.layerHeight))
+                return
+            if tokens.hasTag("secondary_z_axis:"):
+                tempVal = tokens.getTagValue("secondary_z_axis:")
                 if tempVal.replace(".", "").isnumeric():
                     self.secondaryZAxis = float(tempVal)
-                    print("secondaryZAxis : " + str(self.secondaryZAxis))
-                continue
-            if line.startswith("M"):
-                continue
-
-            if ";LAYER:" in line:
-                if self.layer < 3:
-                    self.addLayerHTML()
-                # self.sliceType = SliceType.NONE
-                self.layer = int(line.split(";LAYER:")[1].strip())
-                # print("Layer = " + str(self.layer))
-                self.points.clear()
-                # writeLayer = "; ---- LAYER " + str(self.layer) + " --------"
-                # writeLayer = writeLayer + '\nN' + str(count) + " M1"
-                #writeLayer =  'N' + str(count) + " M1"
-                #of.write("; ---- LAYER " + str(self.layer) + " --------")
-                self.pathOrder = []
-
-                localValue = layerCount * self.layerHeight
-                if localValue > self.secondaryZAxis:
-                    layerCount = 1
-                    localValue = 0
-                if localValue == 0:
-                    writeLayer = 'N' + str(count) + " M1"
-                    nextZ = "Z" + str(self.layerHeight)
-                else:
-                    nextZ = "Z" + str(localValue)
-                layerCount = layerCount + 1
-                continue
-
-            # -----------------------------------------------
-            # New Slicetype is starting. SliceType can be
-            # INNER WALL, OUTER WALL, FILL, or SKIN
-            # -----------------------------------------------
-            elif ";TYPE:" in line:
-                liftSideValue = ""
-                # -----------------------------------------------
-                # if the Last SliceType was a SKIN or FILE
-                # add a "M3"
-                # -----------------------------------------------
-                if self.sliceType == self.SliceType.FILL or self.sliceType == self.SliceType.SKIN or self.sliceType == self.SliceType.SKIRT:
-                    liftSideValue = 'N' + str(count) + " M3"
-                    count = count + 1
-                    writeTypeStart = liftSideValue
-                    # print(writeTypeStart)
-
-                # -----------------------------------------------
-                # if SliceType of type SKIN or FILE started
-                # add a "M2"
-                # -----------------------------------------------
-                self.sliceType = self.SliceType[line.split(
-                    ":")[1].replace("WALL-", "").strip()]
-                #print("slice = " + str(self.sliceType.value))
-                if self.sliceType == self.SliceType.FILL or self.sliceType == self.SliceType.SKIN or self.sliceType == self.SliceType.SKIRT:
-                    liftSideValue = 'N' + str(count) + " M2"
-                    count = count + 1
-                    writeTypeEnd = liftSideValue
-                    # print(writeTypeEnd)
-                # writeType = "; ---- " + \
-                #     str(self.sliceType) + " --------" + liftSideValue
-                # of.write("; ---- " +      str(self.sliceType) + " --------")
-
-                # -----------------------------------------------
-                # generate heading for HTML and the order of
-                # SliceType for this Layer
-                # -----------------------------------------------
-                self.points[self.sliceType] = "// -- " + \
-                    str(self.layer) + " :: " + str(self.sliceType) + "\n"
-                self.pathOrder.append(self.sliceType)
-                continue
-
-            if len(line.strip()) > 0 and line[0] != ';':
-                if ";" in line:
-                    out = 'N' + str(count) + " " + \
-                        line.split(";")[0].replace("E", "A").strip()
-                elif "S" in line:
-                    out = 'N' + str(count) + " " + \
-                        line.split("S")[0].strip()
-                else:
-                    out = 'N' + str(count) + " " + \
-                        line.replace("E", "A").strip()
-                fields = out.split(" ")
-                if len(fields) > 2 and (fields[1] == "G1" or fields[1] == "G0"):
-                    currX = -1
-                    currY = -1
-                    for fld in fields:
-                        if fld.startswith("X"):
-                            currX = float(fld.replace("X", ""))
-                        if fld.startswith("Y"):
-                            currY = float(fld.replace("Y", ""))
-
-                    if " Z" in line:
-                        tempVal = line.split(" Z")[1].split(" ")[0]
-                        out = out.replace(" Z" + tempVal, "")
-
-                    if " X" not in out and " Y" not in out:
-                        if len(nextZ) > 0:
-                            out = out + " " + nextZ
-                        nextZ = ""
-                        nonXYLines.append(out)
-                        continue
-
-                    if " X" in out and " Y" in out:
-                        self.store.append([currX, currY])
-                        if len(self.store) > 2:
-                            self.store.pop(0)
-                        if len(self.store) == 2:
-                            angle = self.calculateTurn()
-                            if angle < 0:
-                                angle = 180 - angle
-                            count = count + 1
-                            saveLine = saveLine + '\nN' + str(count) + " C" + format(angle, '.5f')
-
-                if len(saveLine.strip()) > 0:
-                    saveLine = saveLine.replace(" G28 ", " G0 ")
-                    # of.write(saveLine + "\t; -- " + str(self.cordX()
-                    #                                     ) + ", " + str(self.cordY()) + "\n")
-                    of.write(saveLine + "\n")
-                    for nxyLine in nonXYLines:
-                        of.write(nxyLine + "\n")
-                    nonXYLines = []
-                    if len(writeLayer.strip()) > 0:
-                        of.write(writeLayer + "\n")
-                        writeLayer = ""
-                    if len(writeTypeStart.strip()) > 0:
-                        of.write(writeTypeStart + "\n")
-                        writeTypeStart = ""
-                    if len(writeTypeEnd.strip()) > 0:
-                        of.write(writeTypeEnd + "\n")
-                        writeTypeEnd = ""
-                if " X" in saveLine and " Y" in saveLine:
-                    xVal = saveLine.split(" X")[1].split(" ")[0]
-                    yVal = saveLine.split(" Y")[1].split(" ")[0]
-                    self.points[self.sliceType] = self.points[self.sliceType] + \
-                        "[" + xVal + ", " + yVal + "],\n"
-                saveLine = out
-                if len(nextZ) > 0:
-                    saveLine = saveLine + " " + nextZ
-                    nextZ = ""
-                count = count + 1
-        if len(saveLine.strip()) > 0:
-            saveLine = saveLine.replace(" G28 ", " G0 ")
-            # of.write(saveLine + "\t; -- " + str(self.cordX()) +
-            #          ", " + str(self.cordY()) + "\n")
-            of.write(saveLine + "\n")
-            for nxyLine in nonXYLines:
-                of.write(nxyLine + "\n")
-                nonXYLines = []
-                if len(writeTypeStart.strip()) > 0:
-                    of.write(writeTypeStart + "\n")
-                    writeTypeStart = ""
-                if len(writeTypeEnd.strip()) > 0:
-                    of.write(writeTypeEnd + "\n")
-                    writeTypeEnd = ""
+                    self._log("secondaryZAxis : " + str(self.secondaryZAxis))
+                return
+            if not tokens.command.startswith("M"):
+                if tokens.hasTag("LAYER:"):
+                    self._writeBatch()
+                    self._startLayer(int(tokens.getTagValue("LAYER:")))
+                    return
+                if tokens.hasTag("TYPE:"):
+                    self._startSliceType(tokens.getTagValue("TYPE:"))
+                    return
+        if not tokens.code:
+            return
+        if not tokens.command.startswith("M"):
+            self._processCommand(tokens)
+        elif tokens.command == "M82" or tokens.command == "M83":
+            self._follower.command(tokens.command, tokens.words)
+
+    # ---------------------------------------------------
+    # Write whatever is still waiting for a next line
+    # ---------------------------------------------------
+    def end(self) -> None:
+        if self._layerLines is not None:
+            # The preview of the last layer is made at the end, from the points
+            # in this transform, so it is not taken from the cache.
+            self._transformCachedLayer(cacheable = False)
+        if self._saveLine is not None:
+            self._writeSaveLine()
+            for number, code in self._nonXYLines:
+                self._numbers.append(number)
+                self._codes.append(code)
+                # The pending slice type markers go after the first of
+                # the remaining lines; kept as is to not change the output.
+                if self._writeTypeStart is not None:
+                    self._numbers.append(self._writeTypeStart)
+                    self._codes.append("M3")
+                    self._writeTypeStart = None
+                if self._writeTypeEnd is not None:
+                    self._numbers.append(self._writeTypeEnd)
+                    self._codes.append("M2")
+                    self._writeTypeEnd = None
+            self._nonXYLines = []
+        self._writeBatch()
+        if self._outputOffsets is not None:
+            self._outputOffsets.add("", self._outputLayerStarts([]))
+        self._analyzeMoves()
         self.addLayerHTML()
-        print("-------------Done---------")
-        # plot = open("plot.html", "w")
-        # plot.write(self.htmlTemplate.replace("JS_TEMPLATE", self.holdJSTemplate).replace(
-        #     "DIV_TEMPLATE", self.holdDivTemplate))
-        # plot.close()
-        f.close()
-        of.close()
-        subprocess.Popen([os.environ['PROGRAMFILES'] +
-                        "/Merlin Printer 1.0.0/UM/g2p/g2pcoach.exe", dest])
+        self._finishMetrics()
+        self._destination = None
+        if self._cacheLayers:
+            self._layerCache.end()
+
+    # ---------------------------------------------------
+    # Collect the lines of a layer, to transform them at
+    # once when the next layer starts
+    # ---------------------------------------------------
+    def _readCachedLayerLine(self, line: str) -> None:
+        if ";LAYER:" in line:
+            tokens = tokenizeLine(line)
+            if _startsLayer(tokens):
+                if self._layerLines is not None:
+                    self._transformCachedLayer(cacheable = True)
+                self._layerLines = [line]
+                return
+            if self._layerLines is None:
+                self.processTokens(tokens)
+                return
+        self._layerLines.append(line)
+
+    # ---------------------------------------------------
+    # Transform the collected layer, or take it from the
+    # cache. Only layers that can be transformed without
+    # the rest of the file are cached; see _splitLayerRanges().
+    # ---------------------------------------------------
+    def _transformCachedLayer(self, cacheable: bool) -> None:
+        lines = self._layerLines
+        self._layerLines = None
+        entry = self._layerState()
+        layer = int(tokenizeLine(lines[0]).getTagValue("LAYER:"))
+        if not cacheable or self.layer < 3 or layer < 3 or self._saveLine is None or self._lastTurn is None:
+            for line in lines:
+                self.processTokens(tokenizeLine(line))
+            return
+
+        if self._layerStates is not None:
+            self._layerStates.append((entry, layer))
+        start = time.perf_counter()
+        state = entry
+        if self._analyzer is not None:
+            # The statistics of the layer also depend on where the tool is.
+            self._analyzeMoves()
+            follower = self._follower
+            state = entry + (follower.x, follower.y, follower.z, follower.e, follower.feedrate,
+                             self._analyzer.lastMove is None, self._analyzer.lastHeading)
+        key = self._layerCache.key(lines, state)
+        record = self._layerCache.get(key)
+        layerRange = None
+        if record is not None:
+            try:
+                layerRange = _LayerRangeTransform.fromRecord(record, entry)
+            except (ValueError, TypeError, KeyError, IndexError):
+                pass  # A damaged record is transformed again.
+        if layerRange is None:
+            layerRange = _transformLayerRangeLines(lines, entry)
+            if self._analyzer is not None:
+                self._analyzeLayerRange(layerRange)
+            # Made before the merge, which fills in the range.
+            record = layerRange.toRecord()
+        elif layerRange.analyzer is not None and layerRange.analyzer.lastMove is not None:
+            # The filament fed is stored from the start of the layer.
+            layerRange.analyzer.lastMove["e"] += self._follower.eOffset + self._follower.e
+        self._layerCache.put(key, record)
+        self._writeBatch()
+        self._mergeLayerRange(layerRange)
+        if layerRange.metrics[0].cached:
+            layerRange.metrics[0].seconds = time.perf_counter() - start
+
+    def _startLayer(self, layer: int) -> None:
+        if self._layerStates is not None:
+            self._layerStates.append((self._layerState(), layer))
+        # The ;LAYER: line itself counts for the new layer.
+        self._metrics.linesIn -= 1
+        self._finishMetrics()
+        self._metrics = LayerMetrics(layer)
+        self._metrics.linesIn = 1
+        self._metricsStart = time.perf_counter()
+        self.metrics.append(self._metrics)
+
+        if self.layer < 3:
+            self.addLayerHTML()
+        self.layer = layer
+        self._analyzeMoves()
+        if not self._keepToolpath:
+            self._follower.clear()
+            self._analyzedMoves = 0
+        self.pathStarts = []
+
+        localValue = self._layerCount * self.layerHeight
+        if localValue > self.secondaryZAxis:
+            self._layerCount = 1
+            localValue = 0
+        if localValue == 0:
+            self._writeLayer = self._count
+            self._nextZ = "Z" + str(self.layerHeight)
+        else:
+            self._nextZ = "Z" + str(localValue)
+        self._layerCount = self._layerCount + 1
+
+    # -----------------------------------------------
+    # New Slicetype is starting. SliceType can be
+    # INNER WALL, OUTER WALL, FILL, or SKIN
+    # -----------------------------------------------
+    def _startSliceType(self, typeName: str) -> None:
+        # -----------------------------------------------
+        # if the Last SliceType was a SKIN or FILE
+        # add a "M3"
+        # -----------------------------------------------
+        if self.sliceType in self._liftSliceTypes:
+            self._writeTypeStart = self._count
+            self._count = self._count + 1
+
+        # -----------------------------------------------
+        # if SliceType of type SKIN or FILE started
+        # add a "M2"
+        # -----------------------------------------------
+        self.sliceType = self.SliceType.fromTypeName(typeName)
+        if self.sliceType in self._liftSliceTypes:
+            self._writeTypeEnd = self._count
+            self._count = self._count + 1
+
+        # -----------------------------------------------
+        # start the moves of the SliceType in the preview
+        # and keep the order of SliceType for this Layer
+        # -----------------------------------------------
+        self.pathStarts.append((self.sliceType, len(self.toolpath)))
+
+    # -----------------------------------------------
+    # Number a G-code command, add the C angle of XY
+    # moves and write out the previous command
+    # -----------------------------------------------
+    def _processCommand(self, tokens: GCodeLine) -> None:
+        number = self._count
+        count = number
+        words = tokens.words
+        if tokens.comment is None and "S" in tokens.code:
+            # Everything from the S onwards is dropped, E is left alone.
+            code = tokens.code.split("S")[0].strip()
+            words = tokenizeLine(code).words
+        else:
+            code = tokens.code.replace("E", "A")
+        turn = None
+        isMove = tokens.command == "G1" or tokens.command == "G0"
+        if isMove:
+            layer = self._metrics.layer
+            row = self._follower.move(tokens.words, self.sliceType.value, -1 if layer is None else layer)
+        elif tokens.command == "G90" or tokens.command == "G91" or tokens.command == "G92":
+            self._follower.command(tokens.command, tokens.words)
+        if words and isMove:
+            if "Z" in tokens.words:
+                code = code.replace(" Z" + tokens.words["Z"], "")
+
+            hasX = "X" in words
+            hasY = "Y" in words
+            if not hasX and not hasY:
+                if len(self._nextZ) > 0:
+                    code = code + " " + self._nextZ
+                self._nextZ = ""
+                self._nonXYLines.append((number, code))
+                return
+
+            if hasX and hasY:
+                self._metrics.moves += 1
+                # Every move after the first gets a C line with the angle from
+                # the previous position. The angles are calculated per batch.
+                if self._lastTurn is not None or self._turnRows:
+                    count = count + 1
+                    turn = count
+                if self._follower.relative:
+                    self._relativeTurns[len(self._turnRows)] = (float(words["X"]), float(words["Y"]))
+                self._turnRows.append(row)
+
+        if self._saveLine is not None:
+            self._saveTurn = turn
+            self._writeSaveLine()
+            numbers = self._numbers
+            codes = self._codes
+            for nonXYNumber, nonXYCode in self._nonXYLines:
+                numbers.append(nonXYNumber)
+                codes.append(nonXYCode)
+            self._nonXYLines = []
+            if self._writeLayer is not None:
+                numbers.append(self._writeLayer)
+                codes.append("M1")
+                self._writeLayer = None
+            if self._writeTypeStart is not None:
+                numbers.append(self._writeTypeStart)
+                codes.append("M3")
+                self._writeTypeStart = None
+            if self._writeTypeEnd is not None:
+                numbers.append(self._writeTypeEnd)
+                codes.append("M2")
+                self._writeTypeEnd = None
+
+        if len(self._nextZ) > 0:
+            code = code + " " + self._nextZ
+            self._nextZ = ""
+        self._saveLine = (number, code)
+        self._count = count + 1
+        if len(self._numbers) >= self.batchSize:
+            self._writeBatch()
+
+    def _writeSaveLine(self) -> None:
+        number, code = self._saveLine
+        if "G28 " in code:
+            code = (" " + code).replace(" G28 ", " G0 ")[1:]
+        self._numbers.append(number)
+        self._codes.append(code)
+        if self._saveTurn is not None:
+            self._turnSlots.append(len(self._numbers))
+            self._numbers.append(self._saveTurn)
+            self._codes.append("")
+            self._saveTurn = None
+
+    # ---------------------------------------------------
+    # Fill in the C angles of the current batch and write
+    # it out. The last position is kept for the next batch.
+    # ---------------------------------------------------
+    def _writeBatch(self) -> None:
+        if self._turnRows:
+            x, y = self._turnPositions()
+            if self._turnSlots:
+                # Every position after the first has its C line in this batch.
+                angles = self.calculateTurns(numpy.array(x), numpy.array(y))
+                for slot, angle in zip(self._turnSlots, angles):
+                    self._codes[slot] = "C" + angle
+                self._metrics.cLines += len(self._turnSlots)
+                self._turnSlots = []
+            if len(x) > 1:
+                self.store = [[x[-2], y[-2]], [x[-1], y[-1]]]
+            self._lastTurn = (x[-1], y[-1])
+            self._turnRows = []
+            self._relativeTurns = {}
+        if len(self._numbers) > self._countedLines:
+            self._countLines(self._codes[self._countedLines:], self._metrics)
+            self._countedLines = len(self._numbers)
+            self._writeLines()
+
+    def _turnPositions(self) -> Tuple[List[float], List[float]]:
+        """The X and Y of the XY moves of the batch, after those of the last one before it."""
+
+        moves = self.toolpath.moves[self._turnRows]
+        x = moves["x"].tolist()
+        y = moves["y"].tolist()
+        for index, (relativeX, relativeY) in self._relativeTurns.items():
+            x[index] = relativeX
+            y[index] = relativeY
+        if self._lastTurn is not None:
+            x.insert(0, self._lastTurn[0])
+            y.insert(0, self._lastTurn[1])
+        return x, y
+
+    def _writeLines(self) -> None:
+        lines = [f"N{number} {code}\n" for number, code in zip(self._numbers, self._codes)]
+        text = "".join(lines)
+        if self._outputOffsets is not None:
+            self._outputOffsets.add(text, self._outputLayerStarts(lines))
+        self._destination.write(text)
+        self._numbers = []
+        self._codes = []
+        self._countedLines = 0
+
+    def _outputLayerStarts(self, lines: List[str]) -> List[Tuple[int, int]]:
+        """The layers that start in the next output lines, as the number of
+        their first line and its position in the text of the lines."""
+
+        starts = []
+        end = self._outputOffsets.lines + len(lines)
+        # The current layer is the last one of which it is known where it starts.
+        while self._indexedMetrics < len(self.metrics) - 1:
+            start = self._indexedLines + self.metrics[self._indexedMetrics].linesOut
+            if start > end:
+                break
+            starts.append((start, sum(map(len, lines[:start - self._outputOffsets.lines]))))
+            self._indexedMetrics += 1
+            self._indexedLines = start
+        return starts
+
+    @staticmethod
+    def _countLines(codes: List[str], metrics: LayerMetrics, sign: int = 1) -> None:
+        metrics.linesOut += sign * len(codes)
+        metrics.m1Lines += sign * codes.count("M1")
+        metrics.m2Lines += sign * codes.count("M2")
+        metrics.m3Lines += sign * codes.count("M3")
+
+    def _finishMetrics(self) -> None:
+        if self._metricsStart is not None:
+            self._metrics.seconds += time.perf_counter() - self._metricsStart
+            self._metricsStart = None
+
+    def _analyzeMoves(self) -> None:
+        """Adds the moves in toolpath that are not in the statistics yet."""
+
+        if self._analyzer is not None and self._analyzedMoves < len(self.toolpath):
+            self._analyzer.add(self.toolpath.moves[self._analyzedMoves:])
+            self._analyzedMoves = len(self.toolpath)
+
+    def _analyzeLayerRange(self, layerRange: "_LayerRangeTransform") -> None:
+        """Calculates the statistics of the moves of a range of layers that
+        goes on from where this transform is, unless it has them already."""
+
+        if layerRange.analyzer is not None:
+            return
+        self._analyzeMoves()
+        moves = layerRange.toolpath.moves
+        layerRange._follower.locate(moves, self._follower)
+        layerRange.eStart = self._follower.eOffset + self._follower.e
+        layerRange.analyzer = ToolpathAnalyzer(self._analyzer.lastMove, self._analyzer.lastHeading)
+        layerRange.analyzer.add(moves)
+
+    # ---------------------------------------------------
+    # Transform the file source with ranges of layers
+    # transformed by a pool of worker processes
+    # ---------------------------------------------------
+    def _transformLayerRanges(self, source: str, data: mmap.mmap, destination: TextIO, processes: int) -> None:
+        ranges = _splitLayerRanges(data, self.layerRangeSize)
+        if len(ranges) == 1:
+            self.transformBytes(iter(data.readline, b""), destination)
+            return
+
+        self.begin(destination)
+        try:
+            # Workers are started fresh instead of forked, so they do not inherit
+            # the threads and open files of the application.
+            with ProcessPoolExecutor(processes, mp_context = multiprocessing.get_context("spawn")) as pool:
+                # Only a few ranges are transformed ahead of the merge, to bound
+                # the memory that the transformed ranges take while they wait.
+                tasks = iter(ranges[1:])
+                pending = collections.deque()
+                for start, end, entry in tasks:
+                    pending.append((start, end, pool.submit(_transformLayerRange, source, start, end, entry, self._analyzeToolpath)))
+                    if len(pending) == 2 * processes:
+                        break
+
+                # The first range has no state to depend on, so that is done here.
+                for line in io.BytesIO(data[:ranges[0][1]]):
+                    self.processLineBytes(line)
+                while pending:
+                    start, end, future = pending.popleft()
+                    task = next(tasks, None)
+                    if task is not None:
+                        pending.append((task[0], task[1], pool.submit(_transformLayerRange, source, *task, self._analyzeToolpath)))
+
+                    layerRange = future.result()
+                    self._writeBatch()
+                    if layerRange.entry == self._layerState() and self._saveLine is not None and self._lastTurn is not None:
+                        self._mergeLayerRange(layerRange)
+                    else:
+                        # The range was transformed from another state than the
+                        # one it follows, so it is done again here.
+                        for line in io.BytesIO(data[start:end]):
+                            self.processLineBytes(line)
+            self.end()
+        except Exception:
+            self.abort()
+            raise
+
+    # ---------------------------------------------------
+    # Continue the transform with a range of layers that
+    # was transformed by _transformLayerRange(). The
+    # pending lines in it are filled in, the line numbers
+    # shifted and its last state is taken over.
+    # ---------------------------------------------------
+    def _mergeLayerRange(self, layerRange: "_LayerRangeTransform") -> None:
+        if self._analyzer is not None:
+            self._analyzeLayerRange(layerRange)
+            self._analyzer.statistics.add(layerRange.analyzer.statistics)
+            self._analyzer.lastMove = layerRange.analyzer.lastMove
+            self._analyzer.lastHeading = layerRange.analyzer.lastHeading
+        offset = self._count
+        numbers = self._numbers
+        codes = self._codes
+        rangeCodes = layerRange._codes
+        if layerRange.firstTurn is not None:
+            firstX, firstY = layerRange.firstPoint
+            angles = self.calculateTurns(numpy.array([self._lastTurn[0], firstX]), numpy.array([self._lastTurn[1], firstY]))
+            rangeCodes[layerRange.firstTurn] = "C" + angles[0]
+
+        # The pending lines can only be in the lines written by the first
+        # command of the range.
+        headLength = layerRange.headLength or 0
+        headStart = len(numbers)
+        for number, code in zip(layerRange._numbers[:headLength], rangeCodes[:headLength]):
+            if number >= 0:
+                numbers.append(number + offset)
+                codes.append(code)
+            elif number == self._pendingSaveLine:
+                self._writeSaveLine()
+                self._saveLine = None
+            elif number == self._pendingNonXYLines:
+                for nonXYNumber, nonXYCode in self._nonXYLines:
+                    numbers.append(nonXYNumber)
+                    codes.append(nonXYCode)
+                self._nonXYLines = []
+            else:
+                marker = self._pendingMarkers[number]
+                if getattr(self, marker) is not None:
+                    numbers.append(getattr(self, marker))
+                    codes.append(code)
+                    setattr(self, marker, None)
+        if headLength:
+            # The range counted its placeholders instead of the lines they stand for.
+            self._countLines(rangeCodes[:headLength], layerRange.headMetrics, -1)
+            self._countLines(codes[headStart:], layerRange.headMetrics)
+        numbers.extend([number + offset for number in layerRange._numbers[headLength:]])
+        codes.extend(rangeCodes[headLength:])
+        self._countedLines = len(numbers)
+
+        # Whatever is still pending at the end of the range, from the range or
+        # from before it.
+        if layerRange._saveLine[0] != self._pendingSaveLine:
+            self._saveLine = (layerRange._saveLine[0] + offset, layerRange._saveLine[1])
+        nonXYLines = []
+        for number, code in layerRange._nonXYLines:
+            if number == self._pendingNonXYLines:
+                nonXYLines.extend(self._nonXYLines)
+            else:
+                nonXYLines.append((number + offset, code))
+        self._nonXYLines = nonXYLines
+        for pending, marker in self._pendingMarkers.items():
+            number = getattr(layerRange, marker)
+            if number != pending:
+                setattr(self, marker, None if number is None else number + offset)
+        self._count = layerRange._count + offset
+        self._nextZ = layerRange._nextZ
+        self.layerHeight, self.secondaryZAxis, self._layerCount, self.sliceType, self.layer = layerRange._layerState()[:5]
+
+        if layerRange.firstTurn is not None:
+            lastX, lastY = layerRange.store[-1]
+            if layerRange.turnCount < 2:
+                self.store = [list(self._lastTurn), [lastX, lastY]]
+            else:
+                self.store = layerRange.store
+            self._lastTurn = (lastX, lastY)
+        self._follower.continueFrom(layerRange._follower)
+        self.toolpath = layerRange.toolpath
+        self._follower.toolpath = self.toolpath
+        self._analyzedMoves = len(self.toolpath)
+        self.pathStarts = layerRange.pathStarts
+        self.preview.extend(layerRange.preview)
+        self._finishMetrics()
+        self.metrics.extend(layerRange.metrics)
+        self._metrics = layerRange._metrics
+
+
+class _LayerScanner(TransformGCode):
+    """Follows only the lines of a file that change the state between layers,
+    to know that state at the start of every layer. Of the commands, those are
+    G90, G91, M82 and M83.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.begin(None)
+        self.lineStart = 0  # Offset in the file of the line that is processed.
+        # The offset, the state before it and the number of every ;LAYER: line.
+        self.layerStarts = []  # type: List[Tuple[int, _LayerState, int]]
+
+    def _log(self, text: str) -> None:
+        pass  # Only the transform itself reports the settings it finds.
+
+    def _startLayer(self, layer: int) -> None:
+        self.layerStarts.append((self.lineStart, self._layerState(), layer))
+        super()._startLayer(layer)
+
+    def _processCommand(self, tokens: GCodeLine) -> None:
+        self._follower.command(tokens.command, tokens.words)  # Only the lines that make moves relative or absolute are scanned.
+
+
+class _LayerRangeTransform(TransformGCode):
+    """Transforms a range of layers in a worker process.
+
+    The range is transformed from the state the file is in at its first
+    layer, except for what only the transform of the ranges before it can
+    tell: its line numbers start at 0, the lines still pending from before it
+    are written as placeholders and the C angle of its first move is left for
+    TransformGCode._mergeLayerRange() to fill in. Where the tool is at the
+    start is not known either, so the positions in its toolpath are counted
+    from the start until a move sets them; see MoveFollower.
+    """
+
+    # All output is kept until the range is merged.
+    batchSize = float("inf")
+
+    def __init__(self, entry: _LayerState) -> None:
+        super().__init__()
+        self.begin(None)
+        self.metrics = []  # Starts with the metrics of its first layer.
+        self.entry = entry
+        self.layerHeight, self.secondaryZAxis, self._layerCount, self.sliceType, self.layer = entry[:5]
+        self._count = 0
+        self._saveLine = (self._pendingSaveLine, "")
+        self._nonXYLines = [(self._pendingNonXYLines, "")]
+        for pending, marker in self._pendingMarkers.items():
+            setattr(self, marker, pending)
+        self._follower = MoveFollower(self.toolpath, known = False, relative = entry[5], relativeE = entry[6])
+        # Stands in for the last position before the range.
+        self._lastTurn = (0.0, 0.0)
+        self.headLength = None  # type: Optional[int]  # Number of output lines written by the first command.
+        self.headMetrics = None  # type: Optional[LayerMetrics]  # The metrics of the layer of the first command.
+        self.firstTurn = None  # type: Optional[int]  # Output line of the C line of the first move.
+        self.firstPoint = None  # type: Optional[Tuple[float, float]]
+        self.turnCount = 0
+        # The statistics of the moves of the range, once they are analyzed,
+        # and the filament fed at its start.
+        self.analyzer = None  # type: Optional[ToolpathAnalyzer]
+        self.eStart = 0.0
+
+    def _processCommand(self, tokens: GCodeLine) -> None:
+        super()._processCommand(tokens)
+        if self.headLength is None and self._saveLine[0] != self._pendingSaveLine:
+            self.headLength = len(self._numbers)
+            self.headMetrics = self._metrics
+
+    def _writeBatch(self) -> None:
+        if self._turnSlots and self.firstTurn is None:
+            self.firstTurn = self._turnSlots[0]
+            x, y = self._turnPositions()
+            self.firstPoint = (x[1], y[1])
+        self.turnCount = self.turnCount + len(self._turnSlots)
+        super()._writeBatch()
+
+    def _writeLines(self) -> None:
+        pass
+
+    def finish(self) -> "_LayerRangeTransform":
+        """Completes the range after its last line."""
+
+        self._writeBatch()
+        self._finishMetrics()
+        return self
+
+    def toRecord(self) -> bytes:
+        """The finished range as a record for the layer cache.
+
+        The record is a line of JSON with the state the range ends in, followed
+        by its output lines as they would be written, with their line numbers
+        counted from the start of the range and the placeholders for the lines
+        pending from before it, and the statistics of its moves if they were
+        analyzed. The moves and the preview are left out; a cached range is
+        never previewed and its moves are not kept.
+        """
+
+        follower = self._follower
+        state = {
+            "headLength": self.headLength,
+            "headMetrics": None if self.headMetrics is None else self.metrics.index(self.headMetrics),
+            "firstTurn": self.firstTurn,
+            "firstPoint": self.firstPoint,
+            "turnCount": self.turnCount,
+            "store": self.store,
+            "saveLine": self._saveLine,
+            "nonXYLines": self._nonXYLines,
+            "markers": [getattr(self, marker) for marker in self._pendingMarkers.values()],
+            "count": self._count,
+            "nextZ": self._nextZ,
+            "layerState": [self.layerHeight, self.secondaryZAxis, self._layerCount, self.sliceType.value, self.layer],
+            "metrics": [vars(metrics) for metrics in self.metrics],
+            "follower": follower.getState()
+        }
+        if self.analyzer is not None:
+            lastMove = self.analyzer.lastMove
+            state["statistics"] = self.analyzer.statistics.toDict()
+            state["lastMove"] = None
+            if lastMove is not None:
+                state["lastMove"] = [float(lastMove[0][name]) for name in ("x", "y", "z", "e", "feedrate")]
+                state["lastMove"][3] -= self.eStart
+            state["lastHeading"] = self.analyzer.lastHeading
+        text = "".join([f"N{number} {code}\n" for number, code in zip(self._numbers, self._codes)])
+        return (json.dumps(state) + "\n" + text).encode("utf-8", "surrogatepass")
+
+    @classmethod
+    def fromRecord(cls, record: bytes, entry: _LayerState) -> "_LayerRangeTransform":
+        """The range that toRecord() made a record of, to merge it again.
+
+        :param entry: The state the range was transformed from.
+        :raises ValueError: If the record is not one of a range.
+        :return: The range. The filament fed of the last move of its
+        statistics is counted from the start of the range.
+        """
+
+        stateLine, _, text = record.decode("utf-8", "surrogatepass").partition("\n")
+        state = json.loads(stateLine)
+        layerRange = cls(entry)
+        for line in text.split("\n")[:-1]:
+            number, _, code = line.partition(" ")
+            layerRange._numbers.append(int(number[1:]))
+            layerRange._codes.append(code)
+        layerRange.headLength = state["headLength"]
+        layerRange.firstTurn = state["firstTurn"]
+        layerRange.firstPoint = None if state["firstPoint"] is None else tuple(state["firstPoint"])
+        layerRange.turnCount = state["turnCount"]
+        layerRange.store = state["store"]
+        layerRange._saveLine = tuple(state["saveLine"])
+        layerRange._nonXYLines = [tuple(line) for line in state["nonXYLines"]]
+        for marker, number in zip(cls._pendingMarkers.values(), state["markers"]):
+            setattr(layerRange, marker, number)
+        layerRange._count = state["count"]
+        layerRange._nextZ = state["nextZ"]
+        layerHeight, secondaryZAxis, layerCount, sliceType, layer = state["layerState"]
+        layerRange.layerHeight, layerRange.secondaryZAxis, layerRange._layerCount = layerHeight, secondaryZAxis, layerCount
+        layerRange.sliceType, layerRange.layer = cls.SliceType(sliceType), layer
+        layerRange.metrics = []
+        for values in state["metrics"]:
+            metrics = LayerMetrics(values["layer"])
+            vars(metrics).update(values)
+            metrics.cached = True
+            layerRange.metrics.append(metrics)
+        layerRange._metrics = layerRange.metrics[-1]
+        layerRange.headMetrics = None if state["headMetrics"] is None else layerRange.metrics[state["headMetrics"]]
+        layerRange._follower.setState(state["follower"])
+        if "statistics" in state:
+            lastMove = state["lastMove"]
+            if lastMove is not None:
+                lastMove = numpy.array([tuple(lastMove) + (0, -1, -1)], Toolpath.dtype)
+            layerRange.analyzer = ToolpathAnalyzer(lastMove, state["lastHeading"])
+            layerRange.analyzer.statistics = ToolpathStatistics.fromDict(state["statistics"])
+        return layerRange
+
+
+_layerStateTags = re.compile(rb";(?:LAYER|TYPE|Layer height|secondary_z_axis):")
+
+# The lines that _LayerScanner follows: those with the tags above, and those
+# with a command that makes moves relative or absolute.
+_layerStateLines = re.compile(_layerStateTags.pattern + rb"|(?m:^[ \t]*(?:G9[01]|M8[23])(?![0-9.]))")
+
+# Comment lines, M lines other than M82 and M83 and empty lines without any of
+# the tags above, which TransformGCode.processTokens() does nothing with.
+_skippedLine = re.compile(rb"[ \t\r\n\f\v]*(?:(?!.*" + _layerStateTags.pattern + rb")(?:;|M(?!8[23](?![0-9])))|$)")
+_skippedLineStarts = frozenset(b" \t\r\n\f\v;M")
+
+# Line ends that are not found by splitting bytes at "\n".
+_loneCarriageReturn = re.compile(rb"\r(?!\n)")
+
+# The encoding that open(source, "r") reads G-code with.
+_sourceEncoding = io.TextIOWrapper(io.BytesIO()).encoding
+
+
+def _splitLayerRanges(data: mmap.mmap, rangeSize: int) -> List[Tuple[int, int, Optional[_LayerState]]]:
+    """Splits G-code into ranges of layers to transform separately.
+
+    :param data: The G-code file.
+    :param rangeSize: The number of bytes from which on a range is ended at
+    the next layer.
+    :return: The start and end offset of every range and the state at its
+    start. The first range starts at the top of the file and has no state.
+    """
+
+    ranges = []
+    rangeStart = 0
+    entry = None
+    # Ranges do not start at the first layers or the last one, as their
+    # previews would need the points of the range before them.
+    for lineStart, state, layer in _scanLayerStarts(data)[:-1]:
+        if lineStart - rangeStart >= rangeSize and state[4] >= 3 and layer >= 3:
+            ranges.append((rangeStart, lineStart, entry))
+            rangeStart = lineStart
+            entry = state
+    ranges.append((rangeStart, len(data), entry))
+    return ranges
+
+
+def _scanLayerStarts(data: mmap.mmap) -> List[Tuple[int, _LayerState, int]]:
+    """Finds where the layers of G-code start, by following only the lines
+    that change the state between layers; see _LayerScanner.
+
+    :return: The offset of the ;LAYER: line, the state before it and the
+    number of every layer.
+    """
+
+    scanner = _LayerScanner()
+    lastLineStart = -1
+    for match in _layerStateLines.finditer(data):
+        lineStart = max(data.rfind(b"\n", 0, match.start()), data.rfind(b"\r", 0, match.start())) + 1
+        if lineStart == lastLineStart:
+            continue  # A line with more than one of the tags.
+        lastLineStart = lineStart
+        lineEnd = len(data)
+        for newline in (b"\n", b"\r"):
+            position = data.find(newline, match.end())
+            if position != -1:
+                lineEnd = min(lineEnd, position)
+        scanner.lineStart = lineStart
+        scanner.processLine(data[lineStart:lineEnd].decode(_sourceEncoding))
+    return scanner.layerStarts
+
+
+def _transformLayerRange(source: str, start: int, end: int, entry: _LayerState, keepToolpath: bool = False) -> _LayerRangeTransform:
+    """Transforms the layers between two offsets of a file, in a worker process.
+
+    :param keepToolpath: Whether to keep the moves of all layers of the range,
+    to analyze them once it is known where they start.
+    """
+
+    with open(source, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    transform = _LayerRangeTransform(entry)
+    transform.setKeepToolpath(keepToolpath)
+    for line in io.BytesIO(data):
+        transform.processLineBytes(line)
+    return transform.finish()
+
+
+def _transformLayerRangeLines(lines: Iterable[str], entry: _LayerState) -> _LayerRangeTransform:
+    transform = _LayerRangeTransform(entry)
+    for line in lines:
+        transform.processLine(line)
+    return transform.finish()
+
+
+def _startsLayer(tokens: GCodeLine) -> bool:
+    """Whether TransformGCode.processTokens() starts a new layer at a line."""
+
+    return tokens.hasTag("LAYER:") and not tokens.hasTag("Layer height:") and \
+        not tokens.hasTag("secondary_z_axis:") and not tokens.command.startswith("M")
+
+
+class TransformGCodeStream(io.TextIOBase):
+    """Text stream that passes everything written to it on to another stream,
+    and transforms the same G-code on the fly.
+
+    This lets a writer produce the G-code file and its transformed version in a
+    single pass, without reading the written file back from disk.
+    """
+
+    def __init__(self, stream: TextIO, transform: TransformGCode, destination: TextIO, indexLayers: bool = False) -> None:
+        """Creates a stream that tees into a transform.
+
+        :param stream: The stream that receives the G-code as it is written.
+        :param transform: The transform to feed the G-code lines to.
+        :param destination: The stream to write the transformed G-code to.
+        :param indexLayers: Whether to record where the layers are in both
+        files, for writeLayerIndex().
+        """
+
+        super().__init__()
+        self._stream = stream
+        self._transform = transform
+        self._partial_line = ""
+        self._transform.begin(destination)
+        # Where the ;LAYER: lines are in the written file, while they are recorded.
+        self._sourceOffsets = None  # type: Optional[LineOffsets]
+        if indexLayers:
+            self._sourceOffsets = LineOffsets(getattr(stream, "encoding", None) or _sourceEncoding)
+            self._transform.recordLayerOffsets(getattr(destination, "encoding", None) or _sourceEncoding)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        written = self._stream.write(text)
+        text = self._partial_line + text
+        lines = text.split("\n")
+        self._partial_line = lines.pop()
+        if self._sourceOffsets is not None:
+            self._recordLayerLines(text[:len(text) - len(self._partial_line)])
+        for line in lines:
+            self._transform.processLine(line)
+        return written
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def finish(self) -> None:
+        """Transforms whatever is left after the last write.
+
+        The wrapped stream is left open; it belongs to whoever created it.
+        """
+
+        if self._partial_line:
+            if self._sourceOffsets is not None:
+                self._recordLayerLines(self._partial_line)
+            self._transform.processLine(self._partial_line)
+            self._partial_line = ""
+        self._transform.end()
+
+    def writeLayerIndex(self, path: str) -> LayerIndex:
+        """Writes the LayerIndex of the written file and the transformed file,
+        from where their layers were while they were written.
+
+        :param path: The file to write the index to.
+        :raises ValueError: If the stream is not finished or did not index its
+        layers.
+        """
+
+        transform = self._transform
+        sourceOffsets = self._sourceOffsets
+        outputOffsets = transform._outputOffsets
+        if sourceOffsets is None or outputOffsets is None or len(transform._layerStates) != len(transform.metrics) - 1:
+            raise ValueError("The layers of the stream were not indexed.")
+        sourceLines = numpy.cumsum([0] + [metrics.linesIn for metrics in transform.metrics]).tolist()
+        outputLines = numpy.cumsum([0] + [metrics.linesOut for metrics in transform.metrics]).tolist()
+        try:
+            layerStarts = [(sourceOffsets.starts[line], state, layer) for line, (state, layer) in zip(sourceLines[1:], transform._layerStates)]
+            outputStarts = [0] + [outputOffsets.starts[line] for line in outputLines[1:-1]] + [outputOffsets.size]
+        except KeyError:
+            raise ValueError("A layer did not start where the stream found its ;LAYER: line.")
+        return transform._saveLayerIndex(layerStarts, sourceOffsets.size, outputStarts, outputOffsets.size, path)
+
+    def _recordLayerLines(self, text: str) -> None:
+        """Records where the lines with a ;LAYER: tag start in the next text
+        written, which ends with a whole line.
+        """
+
+        starts = []
+        lines = self._sourceOffsets.lines
+        counted = 0  # The position up to which lines are counted.
+        position = text.find(";LAYER:")
+        while position >= 0:
+            lineStart = text.rfind("\n", 0, position) + 1
+            lines += text.count("\n", counted, lineStart)
+            counted = lineStart
+            starts.append((lines, lineStart))
+            lineEnd = text.find("\n", position)
+            position = -1 if lineEnd < 0 else text.find(";LAYER:", lineEnd)
+        self._sourceOffsets.add(text, starts)
 
 
 #---------- TESTING ---------------------------
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import struct
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Tuple
+
+
+class LayerCache:
+    """The transformed layers of the last transform of a G-code file.
+
+    A transform that is given a LayerCache looks up every layer by the text of
+    the layer and the state the transform is in when the layer starts. Layers
+    that were transformed before are taken from the cache instead of being
+    transformed again. After the transform, the cache holds the layers of that
+    transform only.
+
+    The file consists of a header, the records of the layers, an index of the
+    records in JSON and the offset of that index. Only the index is read up
+    front. What a record holds is up to the transform; the cache only stores
+    and finds the bytes.
+    """
+
+    # Counted up whenever the records change form, to not load the layers of
+    # an older version.
+    header = b"Uranium G-code layer cache 7\n"
+
+    def __init__(self, path: str) -> None:
+        """Creates a cache that is kept in a file.
+
+        :param path: The file to keep the cache in. It does not need to exist.
+        """
+
+        self._path = path
+        self._file = None  # type: Optional[BinaryIO]
+        self._index = {}  # type: Dict[str, Tuple[int, int]]
+        self._newFile = None  # type: Optional[BinaryIO]
+        self._newIndex = {}  # type: Dict[str, Tuple[int, int]]
+
+    @staticmethod
+    def key(lines: Iterable[str], state: Tuple[Any, ...]) -> str:
+        """The key of a layer.
+
+        :param lines: The G-code lines of the layer, with or without line ends.
+        :param state: The state of the transform at the start of the layer.
+        """
+
+        hasher = hashlib.sha256(repr(state).encode())
+        hasher.update("\n".join([line.rstrip("\r\n") for line in lines]).encode())
+        return hasher.hexdigest()
+
+    def begin(self) -> None:
+        """Opens the layers of the last transform and starts a new cache next to them."""
+
+        self._index = {}
+        try:
+            self._file = open(self._path, "rb")
+            if self._file.read(len(self.header)) != self.header:
+                raise ValueError("Not a G-code layer cache of this version")
+            self._file.seek(-8, os.SEEK_END)
+            indexOffset = struct.unpack("<Q", self._file.read(8))[0]
+            self._file.seek(indexOffset)
+            self._index = {key: (int(location[0]), int(location[1])) for key, location in json.loads(self._file.read()[:-8]).items()}
+        except FileNotFoundError:
+            self._closeFile()
+        except (OSError, ValueError, TypeError, AttributeError, IndexError, struct.error):
+            # A cache that can't be read is started over.
+            self._closeFile()
+            self._index = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok = True)
+        self._newFile = open(self._path + ".tmp", "wb")
+        self._newFile.write(self.header)
+        self._newIndex = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        """The record that was stored with a key, or None if there is none."""
+
+        location = self._index.get(key)
+        if location is None or self._file is None:
+            return None
+        self._file.seek(location[0])
+        record = self._file.read(location[1])
+        if len(record) != location[1]:
+            return None
+        return record
+
+    def put(self, key: str, record: bytes) -> None:
+        """Stores the record of a layer for the next transform."""
+
+        if key in self._newIndex:
+            return
+        self._newIndex[key] = (self._newFile.tell(), len(record))
+        self._newFile.write(record)
+
+    def end(self) -> None:
+        """Replaces the layers of the last transform by those of this one."""
+
+        try:
+            indexOffset = self._newFile.tell()
+            self._newFile.write(json.dumps(self._newIndex).encode())
+            self._newFile.write(struct.pack("<Q", indexOffset))
+            self._newFile.close()
+            self._newFile = None
+            self._closeFile()
+            os.replace(self._path + ".tmp", self._path)
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        """Leaves the layers of the last transform as they were, and removes
+        what was stored since begin(). Does nothing if the cache is not begun."""
+
+        self._closeFile()
+        self._index = {}
+        self._newIndex = {}
+        if self._newFile is not None:
+            self._newFile.close()
+            self._newFile = None
+            try:
+                os.remove(self._path + ".tmp")
+            except OSError:
+                pass
+
+    def _closeFile(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,184 @@
+import os
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy
+
+
+class LayerIndexEntry(NamedTuple):
+    """Where one layer is in a G-code file and in its transformed file.
+
+    Offsets are in bytes and lines are counted from 0; the end offsets are
+    those of the first byte after the layer. The transformed lines of a layer
+    are those written while the layer was transformed, so the last move of a
+    layer is in the lines of the next one.
+    """
+
+    layer: int
+    sourceStart: int
+    sourceEnd: int
+    sourceFirstLine: int
+    sourceLineCount: int
+    outputStart: int
+    outputEnd: int
+    outputFirstLine: int
+    outputLineCount: int
+    # The state of the transform at the start of the layer: the layer height,
+    # the secondary Z axis, the layer count, the slice type value, the
+    # number of the layer before it and whether moves and the extruder are
+    # relative.
+    layerHeight: float
+    secondaryZAxis: float
+    layerCount: int
+    sliceType: int
+    previousLayer: int
+    relative: bool
+    relativeE: bool
+
+
+class LayerIndex:
+    """An index of the layers of a G-code file and its transformed file, so
+    that a single layer can be read without reading the files up to it.
+
+    The index is kept in a small binary file: a header, the sizes of both
+    files and one fixed size record per layer.
+    """
+
+    # Counted up whenever the records change form.
+    header = b"Uranium G-code layer index 2\n"
+
+    dtype = numpy.dtype([
+        ("layer", "<i4"), ("sourceStart", "<i8"), ("sourceEnd", "<i8"), ("sourceFirstLine", "<i8"), ("sourceLineCount", "<i8"),
+        ("outputStart", "<i8"), ("outputEnd", "<i8"), ("outputFirstLine", "<i8"), ("outputLineCount", "<i8"),
+        ("layerHeight", "<f8"), ("secondaryZAxis", "<f8"), ("layerCount", "<i4"), ("sliceType", "u1"), ("previousLayer", "<i4"),
+        ("relative", "?"), ("relativeE", "?")
+    ])
+    _sizes = numpy.dtype([("sourceSize", "<i8"), ("outputSize", "<i8")])
+
+    def __init__(self, entries: Iterable[LayerIndexEntry], sourceSize: int, outputSize: int) -> None:
+        """Creates an index.
+
+        :param entries: The layers in the order they are in the files.
+        :param sourceSize: The size of the G-code file, to know whether the
+        index is still about that file.
+        :param outputSize: The size of the transformed file.
+        """
+
+        self.entries = list(entries)  # type: List[LayerIndexEntry]
+        self.sourceSize = sourceSize
+        self.outputSize = outputSize
+        self._byLayer = {}  # type: Dict[int, LayerIndexEntry]
+        for entry in reversed(self.entries):
+            self._byLayer[entry.layer] = entry  # A layer number that occurs twice finds the first.
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def getLayer(self, layer: int) -> LayerIndexEntry:
+        """The entry of a layer.
+
+        :raise KeyError: When the files have no such layer.
+        """
+
+        return self._byLayer[layer]
+
+    def save(self, path: str) -> None:
+        records = numpy.array([tuple(entry) for entry in self.entries], self.dtype)
+        with open(path + ".tmp", "wb") as f:
+            f.write(self.header)
+            f.write(numpy.array([(self.sourceSize, self.outputSize)], self._sizes).tobytes())
+            f.write(records.tobytes())
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "LayerIndex":
+        """Reads an index that was saved with save().
+
+        :raise ValueError: When the file is not an index of this version.
+        """
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(cls.header) or (len(data) - len(cls.header) - cls._sizes.itemsize) % cls.dtype.itemsize != 0:
+            raise ValueError("Not a G-code layer index of this version: " + path)
+        sizes = numpy.frombuffer(data, cls._sizes, 1, len(cls.header))[0]
+        records = numpy.frombuffer(data, cls.dtype, offset = len(cls.header) + cls._sizes.itemsize)
+        return cls([LayerIndexEntry(*record) for record in records.tolist()], int(sizes["sourceSize"]), int(sizes["outputSize"]))
+
+    def readSource(self, source: str, layer: int) -> bytes:
+        """The G-code of a layer, read from the file the index is about."""
+
+        entry = self.getLayer(layer)
+        return self._read(source, self.sourceSize, entry.sourceStart, entry.sourceEnd)
+
+    def readOutput(self, output: str, layer: int) -> bytes:
+        """The transformed G-code of a layer, read from the transformed file."""
+
+        entry = self.getLayer(layer)
+        return self._read(output, self.outputSize, entry.outputStart, entry.outputEnd)
+
+    @staticmethod
+    def _read(path: str, size: int, start: int, end: int) -> bytes:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != size:
+                raise ValueError("The layer index is not about the current version of " + path)
+            f.seek(start)
+            return f.read(end - start)
+
+
+class LineOffsets:
+    """Finds the offsets at which lines start in a file while its text is
+    written, so that the file does not have to be read back for them.
+
+    Offsets are in bytes of the encoding of the file, with the line ends that
+    a file opened in text mode writes.
+    """
+
+    def __init__(self, encoding: str, newline: str = os.linesep) -> None:
+        self.encoding = encoding
+        self.lines = 0  # Line ends so far.
+        self.size = 0  # Bytes so far.
+        self.starts = {}  # type: Dict[int, int]  # The offsets of the lines that were asked for, by line.
+        self._newlineExtra = len(newline.encode(encoding)) - 1
+
+    def add(self, text: str, starts: Iterable[Tuple[int, int]] = ()) -> None:
+        """Counts the next text of the file.
+
+        :param starts: The lines of which to keep the offset, as the number of
+        the line, counted from 0, and the position in the text where it
+        starts, in ascending order. The position can be the end of the text.
+        """
+
+        size = self.size
+        counted = 0
+        for line, position in starts:
+            size += self._byteCount(text[counted:position])
+            counted = position
+            self.starts[line] = size
+        self.lines += text.count("\n")
+        self.size = size + self._byteCount(text[counted:])
+
+    def _byteCount(self, text: str) -> int:
+        count = len(text) if text.isascii() else len(text.encode(self.encoding, "surrogateescape"))
+        return count + self._newlineExtra * text.count("\n") if self._newlineExtra else count
+
+
+def findLineStarts(data, lines: List[int], chunkSize: int = 16 * 1024 * 1024) -> List[int]:
+    """The offsets at which lines start in a file, found with NumPy a chunk at a time.
+
+    :param data: The file, as bytes or memory-mapped.
+    :param lines: The line numbers, counted from 0, in ascending order. A
+    line after the last one starts at the end of the file.
+    """
+
+    wanted = numpy.array(lines, numpy.int64)
+    starts = numpy.full(len(wanted), len(data), numpy.int64)
+    starts[wanted == 0] = 0
+    newlines = 0  # Line ends before the current chunk.
+    for chunkStart in range(0, len(data), chunkSize):
+        chunk = numpy.frombuffer(data, numpy.uint8, min(chunkSize, len(data) - chunkStart), chunkStart)
+        nextLines = numpy.flatnonzero(chunk == ord("\n")) + (chunkStart + 1)
+        # Line n starts after the n-th line end.
+        inChunk = (wanted > newlines) & (wanted <= newlines + len(nextLines))
+        starts[inChunk] = nextLines[wanted[inChunk] - newlines - 1]
+        newlines += len(nextLines)
+    return starts.tolist()
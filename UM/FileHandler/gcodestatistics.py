@@ -0,0 +1,177 @@
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy
+
+from UM.FileHandler.gcodetoolpath import SliceType, Toolpath
+
+
+class ToolpathStatistics:
+    """Totals of the moves of G-code, per slice type and per layer.
+
+    A move counts for the slice type and layer it is in. Moves that feed
+    filament are extrusions, all other moves are travels. Times are estimated
+    from the length and feedrate of every move, without acceleration, so they
+    are lower than what the printer will take.
+    """
+
+    # The edges of the bins of the turn angle histograms, in degrees.
+    turnBins = list(range(0, 190, 10))
+
+    def __init__(self) -> None:
+        self.travelDistance = {}  # type: Dict[SliceType, float]  # mm
+        self.extrusionLength = {}  # type: Dict[SliceType, float]  # mm of path
+        self.filament = {}  # type: Dict[SliceType, float]  # mm of filament
+        self.seconds = {}  # type: Dict[SliceType, float]
+        # The number of turns between two moves, per bin of turnBins.
+        self.turnHistogram = {}  # type: Dict[SliceType, List[int]]
+        self.layerSeconds = {}  # type: Dict[int, float]
+
+    @property
+    def totalSeconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def add(self, other: "ToolpathStatistics") -> None:
+        """Adds the statistics of other moves to these."""
+
+        for name in ("travelDistance", "extrusionLength", "filament", "seconds", "layerSeconds"):
+            totals = getattr(self, name)
+            for key, value in getattr(other, name).items():
+                totals[key] = totals.get(key, 0.0) + value
+        for sliceType, histogram in other.turnHistogram.items():
+            if sliceType in self.turnHistogram:
+                self.turnHistogram[sliceType] = [count + otherCount for count, otherCount in zip(self.turnHistogram[sliceType], histogram)]
+            else:
+                self.turnHistogram[sliceType] = list(histogram)
+
+    def toDict(self) -> Dict[str, Any]:
+        """The statistics as plain values that can be written as JSON; see fromDict()."""
+
+        result = {name: {str(sliceType.value): value for sliceType, value in getattr(self, name).items()}
+                  for name in ("travelDistance", "extrusionLength", "filament", "seconds", "turnHistogram")}
+        result["layerSeconds"] = {str(layer): value for layer, value in self.layerSeconds.items()}
+        return result
+
+    @classmethod
+    def fromDict(cls, values: Dict[str, Any]) -> "ToolpathStatistics":
+        """The statistics of the values of toDict()."""
+
+        statistics = cls()
+        for name in ("travelDistance", "extrusionLength", "filament", "seconds", "turnHistogram"):
+            setattr(statistics, name, {SliceType(int(sliceType)): value for sliceType, value in values[name].items()})
+        statistics.layerSeconds = {int(layer): value for layer, value in values["layerSeconds"].items()}
+        return statistics
+
+    def __repr__(self) -> str:
+        return "ToolpathStatistics(travelDistance={travel:.1f}, extrusionLength={extrusion:.1f}, filament={filament:.1f}, seconds={seconds:.0f})".format(
+            travel = sum(self.travelDistance.values()), extrusion = sum(self.extrusionLength.values()),
+            filament = sum(self.filament.values()), seconds = self.totalSeconds)
+
+
+def analyzeToolpath(toolpath: Toolpath) -> ToolpathStatistics:
+    """Calculates the statistics of all moves of a toolpath at once.
+
+    Every move goes from the position of the move before it, so the first
+    move only sets where the toolpath starts.
+    """
+
+    analyzer = ToolpathAnalyzer()
+    analyzer.add(toolpath.moves)
+    return analyzer.statistics
+
+
+class ToolpathAnalyzer:
+    """Calculates the statistics of a toolpath a part at a time, like a layer.
+
+    The parts add up to the statistics of the whole toolpath, as
+    analyzeToolpath() calculates them: a part goes on from the last move of
+    the part before it, and from the direction of the last move before it
+    that went somewhere in XY.
+    """
+
+    # Changes in position and filament smaller than these, in mm, are rounding:
+    # the moves of a part can be followed without knowing where it starts and
+    # get their start added later, in single precision for Z, so a move that
+    # stays put may not quite.
+    positionTolerance = 1e-4
+    filamentTolerance = 1e-7
+
+    def __init__(self, lastMove: Optional[numpy.ndarray] = None, lastHeading: float = math.nan) -> None:
+        """Creates an analyzer that goes on from where another part ended.
+
+        :param lastMove: The last move before the first part, as an array of
+        one row of Toolpath.dtype, or None to start with the first move.
+        :param lastHeading: The direction in radians of the last move before
+        the first part that went somewhere in XY, or NaN if there is none.
+        """
+
+        self.statistics = ToolpathStatistics()
+        self.lastMove = lastMove
+        self.lastHeading = lastHeading
+
+    def add(self, moves: numpy.ndarray) -> None:
+        """Adds the statistics of the next part of the toolpath.
+
+        :param moves: The moves of the part, as Toolpath.moves has them.
+        """
+
+        if len(moves) == 0:
+            return
+        if self.lastMove is not None:
+            moves = numpy.concatenate((self.lastMove, moves))
+        self.lastMove = moves[-1:].copy()
+        if len(moves) < 2:
+            return
+
+        x = moves["x"]
+        y = moves["y"]
+        deltaX = numpy.diff(x)
+        deltaY = numpy.diff(y)
+        deltaZ = numpy.diff(moves["z"].astype(numpy.float64))
+        deltaE = numpy.nan_to_num(numpy.diff(moves["e"]))
+        lengthXY = numpy.hypot(deltaX, deltaY)
+        length = numpy.nan_to_num(numpy.hypot(lengthXY, deltaZ))
+        extruding = deltaE > self.filamentTolerance
+        # Moves that only retract or prime take as long as feeding the filament.
+        distance = numpy.where(length > self.positionTolerance, length, numpy.abs(deltaE))
+        feedrate = numpy.nan_to_num(moves["feedrate"][1:].astype(numpy.float64))
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            seconds = numpy.where(feedrate > 0, distance / (feedrate / 60), 0.0)
+
+        moveTypes = moves["moveType"][1:].astype(numpy.intp)
+        typeCount = max(sliceType.value for sliceType in SliceType) + 1
+        travel = numpy.bincount(moveTypes, numpy.where(extruding, 0.0, length), typeCount)
+        extrusion = numpy.bincount(moveTypes, numpy.where(extruding, length, 0.0), typeCount)
+        filament = numpy.bincount(moveTypes, numpy.where(extruding, deltaE, 0.0), typeCount)
+        typeSeconds = numpy.bincount(moveTypes, seconds, typeCount)
+
+        # The turn between two moves that go somewhere in XY, counted for the
+        # slice type of the second of them.
+        going = numpy.flatnonzero(lengthXY > self.positionTolerance)
+        headings = numpy.arctan2(deltaY[going], deltaX[going])
+        turnTypes = moveTypes[going]
+        if not math.isnan(self.lastHeading):
+            headings = numpy.concatenate(([self.lastHeading], headings))
+        else:
+            turnTypes = turnTypes[1:]
+        if len(going):
+            self.lastHeading = float(headings[-1])
+        turns = numpy.degrees(numpy.abs((numpy.diff(headings) + numpy.pi) % (2 * numpy.pi) - numpy.pi))
+        turnBins = numpy.clip(numpy.searchsorted(ToolpathStatistics.turnBins, turns, side = "right") - 1, 0, len(ToolpathStatistics.turnBins) - 2)
+        histograms = numpy.zeros((typeCount, len(ToolpathStatistics.turnBins) - 1), numpy.int64)
+        numpy.add.at(histograms, (turnTypes, turnBins), 1)
+
+        part = ToolpathStatistics()
+        for sliceType in SliceType:
+            value = sliceType.value
+            if numpy.any(moveTypes == value):
+                part.travelDistance[sliceType] = float(travel[value])
+                part.extrusionLength[sliceType] = float(extrusion[value])
+                part.filament[sliceType] = float(filament[value])
+                part.seconds[sliceType] = float(typeSeconds[value])
+                part.turnHistogram[sliceType] = histograms[value].tolist()
+
+        layers, layerIndices = numpy.unique(moves["layer"][1:], return_inverse = True)
+        layerSeconds = numpy.bincount(layerIndices.ravel(), seconds, len(layers))
+        part.layerSeconds = dict(zip(layers.tolist(), layerSeconds.tolist()))
+        self.statistics.add(part)
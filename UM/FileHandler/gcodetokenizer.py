@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+
+
+class GCodeLine(NamedTuple):
+    """A single line of G-code, split into its parts.
+
+    For "G1 X10.5 Y3 E0.2 ;outer wall" this is command "G1", words
+    {"X": "10.5", "Y": "3", "E": "0.2"}, code "G1 X10.5 Y3 E0.2" and
+    comment "outer wall". The values of the words are kept as text, so that
+    they can be written back exactly as they were read.
+    """
+
+    command: str  # The first word of the line, or "" for comment and empty lines.
+    words: Dict[str, str]  # The letter and value text of every word after the command.
+    code: str  # The line without its comment and surrounding whitespace.
+    comment: Optional[str]  # Everything after the first ";", or None if there is no ";".
+
+    def hasTag(self, tag: str) -> bool:
+        """Whether the comment contains a tag such as "LAYER:", directly after a ";"."""
+
+        return self.comment is not None and (self.comment.startswith(tag) or ";" + tag in self.comment)
+
+    def getTagValue(self, tag: str) -> str:
+        """The text after the first occurrence of a tag in the comment."""
+
+        return (";" + self.comment).split(";" + tag)[1].strip()
+
+
+_empty_words = {}  # type: Dict[str, str]
+_newLine = tuple.__new__  # Skips the keyword handling of GCodeLine(), which is most of the time spent on short lines.
+
+
+def tokenizeLine(line: str) -> GCodeLine:
+    """Splits one line of G-code into a GCodeLine.
+
+    Words are separated by single spaces, like the rest of the transform has
+    always done; a letter that occurs twice keeps its last value.
+    """
+
+    line = line.strip()
+    if not line or line[0] == ";":
+        return _newLine(GCodeLine, ("", _empty_words, "", line[1:] if line else None))
+    code, separator, comment = line.partition(";")
+    if separator:
+        code = code.rstrip()
+    else:
+        comment = None
+    tokens = code.split(" ")
+    return _newLine(GCodeLine, (tokens[0], {token[0]: token[1:] for token in tokens[1:] if token}, code, comment))
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[GCodeLine]:
+    """Tokenizes a stream of G-code lines, one GCodeLine per line."""
+
+    return map(tokenizeLine, lines)
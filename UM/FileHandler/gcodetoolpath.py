@@ -0,0 +1,382 @@
+import math
+import mmap
+import os
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy
+
+from UM.FileHandler.gcodetokenizer import tokenizeLine
+
+
+class SliceType(Enum):
+    """The kind of print move, as set by the ;TYPE: comments of the slicer."""
+
+    NONE = 0
+    INNER = 1
+    OUTER = 2
+    SKIN = 3
+    FILL = 4
+    SKIRT = 5
+
+    @classmethod
+    def fromTypeName(cls, typeName: str) -> "SliceType":
+        """The slice type of the name in a ;TYPE: comment, like "WALL-INNER".
+
+        :raise KeyError: When the name is not one of the slice types.
+        """
+
+        return cls[typeName.replace("WALL-", "").strip()]
+
+
+class Toolpath:
+    """The moves of G-code, in columns.
+
+    Every move is a row of x, y, z, e, feedrate, moveType (the value of its
+    SliceType), layer and lineOffset (where its line starts in the source).
+    The rows are kept in a single NumPy array of 45 bytes per move; the
+    columns are views on it. Columns that whoever added the moves did not
+    know are NaN, or -1 for the layer and the line offset.
+    """
+
+    dtype = numpy.dtype([
+        ("x", numpy.float64), ("y", numpy.float64), ("z", numpy.float32), ("e", numpy.float64),
+        ("feedrate", numpy.float32), ("moveType", numpy.uint8), ("layer", numpy.int32), ("lineOffset", numpy.int64)
+    ])
+
+    # Moves are added to a list first and copied into the array in chunks of
+    # this many moves, as setting single rows of a NumPy array is slow.
+    chunkSize = 4096
+
+    def __init__(self) -> None:
+        self._moves = numpy.empty(0, self.dtype)
+        self._size = 0
+        self._pending = []  # type: List[Tuple[float, float, float, float, float, int, int, int]]
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending)
+
+    def append(self, x: float, y: float, z: float = math.nan, e: float = math.nan, feedrate: float = math.nan,
+               moveType: int = 0, layer: int = -1, lineOffset: int = -1) -> None:
+        self._pending.append((x, y, z, e, feedrate, moveType, layer, lineOffset))
+        if len(self._pending) >= self.chunkSize:
+            self._flush()
+
+    def clear(self) -> None:
+        self._size = 0
+        self._pending = []
+
+    @property
+    def moves(self) -> numpy.ndarray:
+        """All moves, as a structured array with a field per column."""
+
+        self._flush()
+        return self._moves[:self._size]
+
+    @property
+    def x(self) -> numpy.ndarray:
+        return self.moves["x"]
+
+    @property
+    def y(self) -> numpy.ndarray:
+        return self.moves["y"]
+
+    @property
+    def z(self) -> numpy.ndarray:
+        return self.moves["z"]
+
+    @property
+    def e(self) -> numpy.ndarray:
+        return self.moves["e"]
+
+    @property
+    def feedrate(self) -> numpy.ndarray:
+        return self.moves["feedrate"]
+
+    @property
+    def moveType(self) -> numpy.ndarray:
+        return self.moves["moveType"]
+
+    @property
+    def layer(self) -> numpy.ndarray:
+        return self.moves["layer"]
+
+    @property
+    def lineOffset(self) -> numpy.ndarray:
+        return self.moves["lineOffset"]
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the moves."""
+
+        return self.moves.nbytes
+
+    def getLayer(self, layer: int) -> "Toolpath":
+        """The moves of one layer, as a new Toolpath."""
+
+        moves = self.moves
+        return Toolpath.fromArray(moves[moves["layer"] == layer])
+
+    @classmethod
+    def fromArray(cls, moves: numpy.ndarray) -> "Toolpath":
+        """Creates a Toolpath of a copy of a structured array with the columns of Toolpath.dtype."""
+
+        toolpath = cls()
+        toolpath._moves = numpy.array(moves, dtype = cls.dtype)
+        toolpath._size = len(toolpath._moves)
+        return toolpath
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        size = self._size + len(self._pending)
+        if size > len(self._moves):
+            moves = numpy.empty(max(size, 2 * len(self._moves)), self.dtype)
+            moves[:self._size] = self._moves[:self._size]
+            self._moves = moves
+        self._moves[self._size:size] = self._pending
+        self._size = size
+        self._pending = []
+
+    # Pickled as the bytes of the rows, so that the toolpath of a range of
+    # layers comes back from a worker process as one block of memory.
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"moves": self.moves.tobytes()}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._moves = numpy.frombuffer(state["moves"], self.dtype).copy()
+        self._size = len(self._moves)
+        self._pending = []
+
+
+class MoveFollower:
+    """Follows where the tool is through G-code, and adds every G0 and G1 move to a Toolpath.
+
+    Positions are followed through G90/G91, M82/M83 and G92, so every move has
+    the position it ends at. E is the filament fed since the follower started,
+    so G92 does not reset it and the difference between two moves is what the
+    second one extruded. A word that is not a number is left out of a move.
+
+    A follower that starts somewhere within G-code does not know where the
+    tool is. Until a move sets them, its positions are counted from where it
+    started, its feedrate is NaN, and the filament fed is counted from the
+    start as well; knownFrom tells from which move on they are not. Once the
+    start is known, locate() moves its moves to where they really are.
+    """
+
+    def __init__(self, toolpath: Toolpath, known: bool = True, relative: bool = False, relativeE: bool = False) -> None:
+        """Creates a follower that adds to a toolpath.
+
+        :param known: Whether the follower starts at the start of the G-code,
+        where everything is 0, rather than somewhere within it.
+        :param relative: Whether the moves at the start are relative (G91).
+        :param relativeE: Whether the E of the moves at the start is relative (M83).
+        """
+
+        self.toolpath = toolpath
+        self.x = self.y = self.z = 0.0
+        self.e = 0.0  # E as the G-code has it, since the last G92.
+        self.eOffset = 0.0  # The filament fed before the last G92 that set E.
+        self.feedrate = math.nan
+        self.relative = relative
+        self.relativeE = relativeE
+        # The first move in toolpath from which x, y, z, feedrate and the
+        # filament fed are known, or None if that is not known yet. Before it,
+        # they are counted from the start. E is known once a G92 sets it, but
+        # only an absolute E changes from which move on the filament is known.
+        self.knownFrom = dict.fromkeys(("x", "y", "z", "feedrate", "e"), 0 if known else None)  # type: Dict[str, Optional[int]]
+        self.eKnown = known
+        self._unknown = not known
+
+    def move(self, words: Dict[str, str], moveType: int, layer: int, lineOffset: int = -1) -> int:
+        """Adds a G0 or G1 move.
+
+        :param words: The words of the move, like GCodeLine.words.
+        :return: The number of the move in the toolpath.
+        """
+
+        x, y, z, e, feedrate = self.x, self.y, self.z, self.e, self.feedrate
+        try:
+            if self.relative:
+                x += float(words.get("X", 0))
+                y += float(words.get("Y", 0))
+                z += float(words.get("Z", 0))
+            else:
+                x = float(words.get("X", x))
+                y = float(words.get("Y", y))
+                z = float(words.get("Z", z))
+            e = e + float(words.get("E", 0)) if self.relativeE else float(words.get("E", e))
+            feedrate = float(words.get("F", feedrate))
+        except ValueError:
+            # Only the words that are numbers.
+            x, y, z, e, feedrate = self.x, self.y, self.z, self.e, self.feedrate
+            if self.relative:
+                x += _parseFloat(words.get("X"), 0)
+                y += _parseFloat(words.get("Y"), 0)
+                z += _parseFloat(words.get("Z"), 0)
+            else:
+                x = _parseFloat(words.get("X"), x)
+                y = _parseFloat(words.get("Y"), y)
+                z = _parseFloat(words.get("Z"), z)
+            e = e + _parseFloat(words.get("E"), 0) if self.relativeE else _parseFloat(words.get("E"), e)
+            feedrate = _parseFloat(words.get("F"), feedrate)
+        self.x, self.y, self.z, self.e, self.feedrate = x, y, z, e, feedrate
+        if self._unknown:
+            self._learn(words)
+        self.toolpath.append(x, y, z, self.eOffset + e, feedrate, moveType, layer, lineOffset)
+        return len(self.toolpath) - 1
+
+    def command(self, command: str, words: Dict[str, str]) -> None:
+        """Follows a command that changes how the moves after it are read:
+        G90, G91, G92, M82 or M83. Other commands are ignored."""
+
+        if command == "G92":
+            newE = _parseFloat(words.get("E"), math.nan)
+            if not math.isnan(newE):
+                self.eOffset += self.e - newE
+                self.e = newE
+                self.eKnown = True
+        elif command == "G90" or command == "G91":
+            self.relative = command == "G91"
+            self.relativeE = self.relative
+        elif command == "M82" or command == "M83":
+            self.relativeE = command == "M83"
+
+    def clear(self) -> None:
+        """Clears the toolpath, and goes on with the moves after it."""
+
+        self.toolpath.clear()
+        for name, row in self.knownFrom.items():
+            if row is not None:
+                self.knownFrom[name] = 0
+
+    def locate(self, moves: numpy.ndarray, start: "MoveFollower") -> None:
+        """Moves the moves of this follower to where they are, now that it is
+        known that this follower started where another one is.
+
+        :param moves: The moves in the toolpath of this follower, which are
+        changed in place.
+        :param start: A follower that knows where it is.
+        """
+
+        for name in ("x", "y", "z", "e"):
+            moves[name][:self._rowsBefore(name, len(moves))] += getattr(start, name)
+        moves["e"] += start.eOffset
+        moves["feedrate"][:self._rowsBefore("feedrate", len(moves))] = start.feedrate
+
+    def continueFrom(self, other: "MoveFollower") -> None:
+        """Takes over where another follower, that started where this one is, ended."""
+
+        for name in ("x", "y", "z"):
+            value = getattr(other, name)
+            setattr(self, name, value if other.knownFrom[name] is not None else getattr(self, name) + value)
+        if other.knownFrom["feedrate"] is not None:
+            self.feedrate = other.feedrate
+        if not other.eKnown:
+            self.e += other.e
+        elif other.knownFrom["e"] is None:
+            # E was set by a G92, so the filament fed still counts from here.
+            self.eOffset += self.e
+            self.e = other.e
+        else:
+            self.e = other.e
+        self.eOffset += other.eOffset
+        self.relative = other.relative
+        self.relativeE = other.relativeE
+
+    def getState(self) -> List[Any]:
+        """Where the follower is and what it knows, as plain values; see setState()."""
+
+        return [self.x, self.y, self.z, self.e, self.eOffset, self.feedrate, self.relative, self.relativeE, self.eKnown,
+                [self.knownFrom[name] for name in ("x", "y", "z", "feedrate", "e")]]
+
+    def setState(self, state: List[Any]) -> None:
+        """Continues from the values of getState()."""
+
+        self.x, self.y, self.z, self.e, self.eOffset, self.feedrate, self.relative, self.relativeE, self.eKnown, knownFrom = state
+        self.knownFrom = dict(zip(("x", "y", "z", "feedrate", "e"), knownFrom))
+        self._unknown = self._knowsTooLittle()
+
+    def _learn(self, words: Dict[str, str]) -> None:
+        """Notes which of the positions a move of a follower that started within G-code set."""
+
+        row = len(self.toolpath)
+        knownFrom = self.knownFrom
+        if not self.relative:
+            for name in ("x", "y", "z"):
+                if knownFrom[name] is None and not math.isnan(_parseFloat(words.get(name.upper()), math.nan)):
+                    knownFrom[name] = row
+        if knownFrom["feedrate"] is None and not math.isnan(self.feedrate):
+            knownFrom["feedrate"] = row
+        if not self.eKnown and not self.relativeE and not math.isnan(_parseFloat(words.get("E"), math.nan)):
+            self.eKnown = True
+            knownFrom["e"] = row
+        self._unknown = self._knowsTooLittle()
+
+    def _knowsTooLittle(self) -> bool:
+        knownFrom = self.knownFrom
+        return not self.eKnown or knownFrom["x"] is None or knownFrom["y"] is None or knownFrom["z"] is None or knownFrom["feedrate"] is None
+
+    def _rowsBefore(self, name: str, count: int) -> int:
+        row = self.knownFrom[name]
+        return count if row is None else row
+
+
+def parseToolpath(data: Union[bytes, bytearray, memoryview, Any]) -> Toolpath:
+    """Parses the G0 and G1 moves of G-code into a Toolpath; see MoveFollower.
+
+    The slice type and layer of a move are those of the last ;TYPE: and
+    ;LAYER: comments before it.
+
+    :param data: The G-code, as bytes or a memory-mapped file.
+    """
+
+    toolpath = Toolpath()
+    follower = MoveFollower(toolpath)
+    moveType = SliceType.NONE.value
+    layer = -1
+    start = 0
+    end = len(data)
+    while start < end:
+        lineEnd = data.find(b"\n", start)
+        lineEnd = end if lineEnd == -1 else lineEnd + 1
+        line = bytes(data[start:lineEnd]).lstrip()
+        lineStart = start
+        start = lineEnd
+        if not line or line[0] not in _parsedLineStarts:
+            continue
+
+        tokens = tokenizeLine(line.decode("utf-8", "replace"))
+        if tokens.command in ("G0", "G1"):
+            follower.move(tokens.words, moveType, layer, lineStart)
+        elif tokens.command:
+            follower.command(tokens.command, tokens.words)
+        elif tokens.comment is not None:
+            if tokens.hasTag("LAYER:"):
+                layer = int(_parseFloat(tokens.getTagValue("LAYER:"), layer))
+            elif tokens.hasTag("TYPE:"):
+                try:
+                    moveType = SliceType.fromTypeName(tokens.getTagValue("TYPE:")).value
+                except KeyError:
+                    moveType = SliceType.NONE.value
+    return toolpath
+
+
+def parseToolpathFile(path: str) -> Toolpath:
+    """Parses the moves of a G-code file into a Toolpath; see parseToolpath()."""
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return Toolpath()
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+            return parseToolpath(data)
+
+
+_parsedLineStarts = frozenset(b";GM")
+
+
+def _parseFloat(text: Optional[str], default: float) -> float:
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return default
@@ -1,21 +1,182 @@
+"""Numbers the lines of G-code files for the Merlin controller.
+
+    transform.py source.gcode destination.gcode
+    transform.py archive/ transformed/ --processes 8
+    transform.py "archive/*.gcode" transformed/
+
+With a directory or a glob pattern, every G-code file in it is transformed
+into the destination directory, keeping the folders below the source. The
+files are divided over a pool of processes. A file that is the same as the
+last time it was transformed is skipped; the hashes of the transformed files
+are kept in the destination directory.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
 import sys
-print(sys.argv)
-print(sys.argv[0])
-print(sys.argv[1])
-f = open(sys.argv[1], "r")
-of = open(sys.argv[2],  "w")
-count = 1
-content = f.readlines()
-for line in content:
-    line = line.strip()
-    if line != '' and line[0] != ';':
-        if ";" in line:
-            of.write('N' + str(count) + " " + line.split(";")[0].replace("E", "Z").strip() + "\n")
-        elif "S" in line:
-            of.write('N' + str(count) + " " + line.split("S")[0].strip() + "\n")
-        else :
-            of.write( 'N' + str(count)  + " " + line.replace("E", "Z").strip() + "\n")
-        count = count + 1    
-print("-------------Done---------")
-f.close()
-of.close()
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import UM
+except ImportError:  # Started as a script from this folder, without Uranium on the path.
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+
+from UM.FileHandler.gcode import _sourceEncoding
+from UM.FileHandler.gcodetokenizer import tokenize
+
+# Comment lines and empty lines, which are left out without being decoded.
+commentLine = re.compile(rb"[ \t\r\n\f\v]*(?:;|$)")
+
+# The file in the destination directory with the hashes of the transformed files.
+hashesFileName = ".transform_hashes.json"
+
+
+def readLines(f):
+    """The lines of the file with code in them, decoded. The file is memory
+    mapped; lines that are left out are never decoded."""
+
+    if f.seek(0, 2) == 0:
+        return
+    with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+        if re.search(rb"\r(?!\n)", data) is not None:
+            # Only reading text splits the lines at a lone "\r".
+            with open(f.name, "r") as text:
+                yield from text
+            return
+        for line in iter(data.readline, b""):
+            if commentLine.match(line) is None:
+                yield line.decode(_sourceEncoding)
+
+
+def transformFile(source, destination):
+    """Transforms one G-code file and returns the number of lines written."""
+
+    count = 1
+    with open(source, "rb") as f, open(destination, "w", buffering = 1024 * 1024) as of:
+        for tokens in tokenize(readLines(f)):
+            if tokens.code:
+                if tokens.comment is not None:
+                    code = tokens.code.replace("E", "Z")
+                elif "S" in tokens.code:
+                    code = tokens.code.split("S")[0].strip()
+                else:
+                    code = tokens.code.replace("E", "Z")
+                of.write('N' + str(count) + " " + code + "\n")
+                count = count + 1
+    return count - 1
+
+
+def hashFile(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def findSources(source):
+    """The G-code files of a directory, or the files matching a glob pattern,
+    with the directory they are all in."""
+
+    if os.path.isdir(source):
+        files = glob.glob(os.path.join(glob.escape(source), "**", "*.gcode"), recursive = True)
+        root = source
+    else:
+        files = [path for path in glob.glob(source, recursive = True) if os.path.isfile(path)]
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files]) if files else "."
+    return sorted(files), root
+
+
+def transformBatchFile(source, destination, lastHash):
+    """Transforms one file of a batch, unless it has the hash it had last time.
+
+    :return: The hash of the source, the number of lines written and the time
+    it took, or None for the number of lines if the file was skipped.
+    """
+
+    sourceHash = hashFile(source)
+    if sourceHash == lastHash and os.path.exists(destination):
+        return sourceHash, None, 0.0
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok = True)
+    start = time.perf_counter()
+    lines = transformFile(source, destination)
+    return sourceHash, lines, time.perf_counter() - start
+
+
+def transformBatch(source, destinationDir, processes = None, report = print):
+    """Transforms every G-code file of a directory or glob pattern.
+
+    :return: The number of files transformed and the number skipped.
+    """
+
+    files, root = findSources(source)
+    hashesPath = os.path.join(destinationDir, hashesFileName)
+    try:
+        with open(hashesPath) as f:
+            hashes = json.load(f)
+    except (OSError, ValueError):
+        hashes = {}
+
+    transformed = skipped = 0
+    tasks = {}
+    with ProcessPoolExecutor(processes) as pool:
+        for path in files:
+            name = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+            destination = os.path.join(destinationDir, name)
+            tasks[pool.submit(transformBatchFile, path, destination, hashes.get(name))] = name
+        try:
+            for task in as_completed(tasks):
+                name = tasks[task]
+                try:
+                    sourceHash, lines, seconds = task.result()
+                except (OSError, UnicodeDecodeError) as e:
+                    hashes.pop(name, None)
+                    report("{name}: failed: {error}".format(name = name, error = e))
+                    continue
+                hashes[name] = sourceHash
+                if lines is None:
+                    skipped += 1
+                    report("{name}: unchanged, skipped".format(name = name))
+                else:
+                    transformed += 1
+                    report("{name}: {lines} lines in {seconds:.3f} s ({rate:.0f} lines/s)".format(
+                        name = name, lines = lines, seconds = seconds, rate = lines / seconds if seconds > 0 else 0))
+        finally:
+            # Kept for the files that are done, also when the batch is interrupted.
+            os.makedirs(destinationDir, exist_ok = True)
+            with open(hashesPath, "w") as f:
+                json.dump(hashes, f, indent = 1, sort_keys = True)
+    return transformed, skipped
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Numbers the lines of G-code files for the Merlin controller.")
+    parser.add_argument("source", help = "A G-code file, a directory of G-code files or a glob pattern.")
+    parser.add_argument("destination", help = "The transformed file, or the directory to put the transformed files in.")
+    parser.add_argument("-j", "--processes", type = int, default = None, help = "Number of files transformed at once. Defaults to the number of CPUs.")
+    arguments = parser.parse_args(argv)
+
+    if os.path.isfile(arguments.source):
+        print(sys.argv)
+        print(sys.argv[0])
+        print(arguments.source)
+        transformFile(arguments.source, arguments.destination)
+        print("-------------Done---------")
+        return
+
+    if not findSources(arguments.source)[0]:
+        parser.error("no G-code files found at " + arguments.source)
+    start = time.perf_counter()
+    transformed, skipped = transformBatch(arguments.source, arguments.destination, arguments.processes)
+    print("Transformed {transformed} files and skipped {skipped} unchanged files in {seconds:.1f} s".format(
+        transformed = transformed, skipped = skipped, seconds = time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from UM.Mesh.MeshData import MeshData
 from UM.Mesh.MeshData import MeshType
 from UM.Mesh.MeshData import calculateNormalsFromVertices
 from UM.Mesh.MeshData import calculateNormalsFromIndexedVertices
+from UM.Mesh.MeshData import weldVertices
 from UM.Math.Vector import Vector
 from UM.Math.Matrix import Matrix
 from UM.Logger import Logger
@@ -12,6 +13,7 @@ from UM.Logger import Logger
 import numpy
 import math
 import numbers
+from time import time
 
 from typing import Optional, Union
 
@@ -39,17 +41,54 @@ class MeshBuilder:
         self._file_name = None  # type: Optional[str]
         # original center position
         self._center_position = None  # type: Optional[Vector]
+        self._weld_vertices = False
+        self._weld_tolerance = 0.0
+        self._weld_saved_bytes = 0
 
     def build(self) -> MeshData:
         """Build a MeshData object.
 
+        If welding is on, see setWeldVertices(), the mesh data gets every distinct vertex once, with indices.
+
         :return: A Mesh data.
         """
 
-        return MeshData(vertices = self.getVertices(), normals = self.getNormals(), indices = self.getIndices(),
-                        colors = self.getColors(), uvs = self.getUVCoordinates(), file_name = self.getFileName(),
+        vertices = self.getVertices()
+        normals = self.getNormals()
+        indices = self.getIndices()
+        colors = self.getColors()
+        uvs = self.getUVCoordinates()
+        if self._weld_vertices and vertices is not None and self._type == MeshType.faces:
+            vertices, normals, indices, colors, uvs = self._weld(vertices, normals, indices, colors, uvs)
+
+        return MeshData(vertices = vertices, normals = normals, indices = indices,
+                        colors = colors, uvs = uvs, file_name = self.getFileName(),
                         center_position = self.getCenterPosition())
 
+    def setWeldVertices(self, weld_vertices: bool, tolerance: float = 0.0) -> None:
+        """Set whether build() welds the vertices of the mesh.
+
+        Welding stores the vertices that are the same once and refers to them by indices, which makes a mesh of
+        separate triangles, like those of STL files, take about half the memory. Vertices are the same if they have
+        the same position, colors and texture coordinates. Normals are calculated anew from the welded triangles, so
+        they are the mean of the normals of the triangles around a vertex: edges look rounded off when they are drawn.
+
+        :param weld_vertices: Whether to weld the vertices.
+        :param tolerance: If more than 0, vertices are at the same position if they round off to the same multiple of
+        this. Triangles that become too small to have three different vertices are removed.
+        """
+
+        self._weld_vertices = weld_vertices
+        self._weld_tolerance = tolerance
+
+    def getWeldVertices(self) -> bool:
+        return self._weld_vertices
+
+    def getWeldSavedBytes(self) -> int:
+        """The number of bytes of mesh data that welding saved in the last build()."""
+
+        return self._weld_saved_bytes
+
     def setCenterPosition(self, position: Optional[Vector]) -> None:
         self._center_position = position
 
@@ -429,6 +468,28 @@ class MeshBuilder:
 
         self._colors = colors
 
+    def _weld(self, vertices, normals, indices, colors, uvs):
+        start_time = time()
+        arrays = (vertices, normals, indices, colors, uvs)
+        size = sum(array.nbytes for array in arrays if array is not None)
+        kept, indices = weldVertices(vertices, indices, [array for array in (colors, uvs) if array is not None], self._weld_tolerance)
+
+        vertices = vertices[kept]
+        if normals is not None:
+            normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
+        if colors is not None:
+            colors = colors[kept]
+        if uvs is not None:
+            uvs = uvs[kept]
+        arrays = (vertices, normals, indices, colors, uvs)
+        for array in arrays:
+            if array is not None:
+                array.flags.writeable = False  # Nobody else has them, so MeshData doesn't need to copy them.
+
+        self._weld_saved_bytes = size - sum(array.nbytes for array in arrays if array is not None)
+        Logger.log("d", "Welded %s vertices into %s in %s seconds, saving %s MiB", self._vertex_count, len(vertices), time() - start_time, self._weld_saved_bytes // (1024 * 1024))
+        return arrays
+
     def calculateNormals(self, fast=False):
         """Calculate the normals of this mesh, assuming it was created by using addFace (eg; the verts are connected)
 
@@ -0,0 +1,233 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy
+
+from UM.Logger import Logger
+from UM.Mesh.MeshData import MeshData
+
+
+class MeshCache:
+    """Keeps the meshes of model files that were read before, so that opening
+    such a file again doesn't need to parse it.
+
+    The cache is content addressed: every mesh is kept in a file named after
+    the hash of the model file and the reader that read it. A changed model
+    file or a new version of the reader therefore never finds an old mesh.
+
+    A mesh file is a header, a JSON table of the arrays of the mesh and then
+    the arrays themselves. The arrays are memory-mapped when the mesh is
+    loaded, so a hit takes about as long for a large mesh as for a small one.
+    When the files together get larger than the maximum size, the least
+    recently used ones are removed.
+    """
+
+    # Counted up whenever the mesh files change form.
+    header = b"Uranium mesh cache 1\n"
+
+    # The arrays of MeshData that are kept, by the name of their argument of
+    # MeshData's constructor.
+    array_names = ("vertices", "normals", "indices", "colors", "uvs")
+
+    # Arrays start at a multiple of this many bytes in the mesh files.
+    _alignment = 64
+
+    def __init__(self, path: str, max_size: int = 2 * 1024 ** 3) -> None:
+        """Creates a cache that keeps its meshes in a directory.
+
+        :param path: The directory to keep the meshes in. It does not need to
+        exist.
+        :param max_size: The number of bytes the meshes may take together.
+        """
+
+        self._path = path
+        self._max_size = max_size
+        self._hit_count = 0
+        self._miss_count = 0
+        # The hashes of the model files that were hashed before, with the size
+        # and modification time they had then.
+        self._file_hashes = {}  # type: Dict[str, Tuple[int, int, str]]
+        self._lock = threading.Lock()
+
+    def getPath(self) -> str:
+        return self._path
+
+    def getMaxSize(self) -> int:
+        return self._max_size
+
+    def setMaxSize(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._evict()
+
+    def getHitCount(self) -> int:
+        return self._hit_count
+
+    def getMissCount(self) -> int:
+        return self._miss_count
+
+    def get(self, file_name: str, reader: Any) -> Optional[MeshData]:
+        """The mesh that was read from a model file before.
+
+        :param file_name: The model file.
+        :param reader: The reader that is to read it.
+        :return: The mesh, with read-only arrays, or None if the cache has no
+        mesh of this version of the file.
+        """
+
+        try:
+            entry = self._entryPath(file_name, reader)
+            arrays = self._load(entry)
+            os.utime(entry)  # Now it's the most recently used one.
+        except (OSError, ValueError, struct.error):
+            with self._lock:
+                self._miss_count += 1
+            return None
+
+        with self._lock:
+            self._hit_count += 1
+        return MeshData(file_name = file_name, **arrays)
+
+    def put(self, file_name: str, reader: Any, mesh_data: MeshData) -> None:
+        """Keeps the mesh that was read from a model file.
+
+        :param file_name: The model file.
+        :param reader: The reader that read it.
+        :param mesh_data: The mesh that the reader made of it.
+        """
+
+        arrays = {
+            "vertices": mesh_data.getVertices(),
+            "normals": mesh_data.getNormals(),
+            "indices": mesh_data.getIndices(),
+            "colors": mesh_data.getColors(),
+            "uvs": mesh_data.getUVCoordinates()
+        }
+        try:
+            entry = self._entryPath(file_name, reader)
+            os.makedirs(self._path, exist_ok = True)
+            self._save(entry, {name: array for name, array in arrays.items() if array is not None})
+        except OSError as e:
+            Logger.log("w", "Unable to keep the mesh of %s in the mesh cache: %s", file_name, str(e))
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes all meshes."""
+
+        for name, _, _ in self._entries():
+            try:
+                os.remove(os.path.join(self._path, name))
+            except OSError:
+                pass  # In use, on Windows.
+
+    def key(self, file_name: str, reader: Any) -> str:
+        """The key of the mesh that a reader reads from a file.
+
+        :raise OSError: When the file can't be read.
+        """
+
+        hasher = hashlib.sha256(self.header)
+        hasher.update(self._fileHash(file_name).encode())
+        hasher.update(type(reader).__module__.encode() + b"." + type(reader).__qualname__.encode())
+        try:
+            hasher.update("{0} {1}".format(reader.getPluginId(), reader.getVersion()).encode())
+        except (AttributeError, ValueError):
+            pass  # Not loaded as a plug-in, so only its class tells it apart.
+        return hasher.hexdigest()
+
+    def _fileHash(self, file_name: str) -> str:
+        stat = os.stat(file_name)
+        with self._lock:
+            known = self._file_hashes.get(file_name)
+        if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            return known[2]
+
+        hasher = hashlib.sha256()
+        with open(file_name, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._lock:
+            self._file_hashes[file_name] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def _entryPath(self, file_name: str, reader: Any) -> str:
+        return os.path.join(self._path, self.key(file_name, reader) + ".mesh")
+
+    def _save(self, path: str, arrays: Dict[str, numpy.ndarray]) -> None:
+        table = {}  # type: Dict[str, Dict[str, Any]]
+        offset = 0
+        for name, array in arrays.items():
+            table[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += -(-array.nbytes // self._alignment) * self._alignment
+        table_data = json.dumps(table).encode()
+        data_start = len(self.header) + 4 + len(table_data)
+        data_start = -(-data_start // self._alignment) * self._alignment
+
+        temporary_path = "{0}.{1}.tmp".format(path, threading.get_ident())
+        with open(temporary_path, "wb") as f:
+            f.write(self.header)
+            f.write(struct.pack("<I", len(table_data)))
+            f.write(table_data)
+            for name, array in arrays.items():
+                f.seek(data_start + table[name]["offset"])
+                f.write(numpy.ascontiguousarray(array).tobytes())
+        os.replace(temporary_path, path)
+
+    def _load(self, path: str) -> Dict[str, numpy.ndarray]:
+        """Maps the arrays of a mesh file.
+
+        :raise ValueError: When the file is not a mesh file of this version.
+        """
+
+        with open(path, "rb") as f:
+            if f.read(len(self.header)) != self.header:
+                raise ValueError("Not a mesh cache file of this version: " + path)
+            table_size = struct.unpack("<I", f.read(4))[0]
+            table = json.loads(f.read(table_size).decode())
+            data_start = -(-(len(self.header) + 4 + table_size) // self._alignment) * self._alignment
+            data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+        arrays = {}
+        try:
+            for name, entry in table.items():
+                if name not in self.array_names:
+                    raise ValueError("Unknown array in mesh cache file: " + name)
+                dtype = numpy.dtype(entry["dtype"])
+                shape = tuple(entry["shape"])
+                # The arrays keep the memory map open; they are read-only.
+                arrays[name] = numpy.frombuffer(data, dtype, int(numpy.prod(shape)), data_start + entry["offset"]).reshape(shape)
+        except (KeyError, TypeError):
+            raise ValueError("Broken mesh cache file: " + path)
+        return arrays
+
+    def _entries(self):
+        """The names, sizes and last use times of all mesh files."""
+
+        try:
+            with os.scandir(self._path) as entries:
+                return [(entry.name, entry.stat().st_size, entry.stat().st_mtime) for entry in entries if entry.name.endswith(".mesh")]
+        except OSError:
+            return []
+
+    def _evict(self) -> None:
+        """Removes the least recently used meshes until the rest fits in the maximum size."""
+
+        entries = sorted(self._entries(), key = lambda entry: entry[2])
+        total_size = sum(size for _, size, _ in entries)
+        for name, size, _ in entries:
+            if total_size <= self._max_size:
+                break
+            try:
+                os.remove(os.path.join(self._path, name))
+            except OSError:
+                continue  # In use, on Windows.
+            total_size -= size
@@ -7,6 +7,7 @@ from UM.Logger import Logger
 from UM.Math import NumPyUtil
 from UM.Math.Matrix import Matrix
 
+from collections import OrderedDict
 from enum import Enum
 from typing import List, Optional, Tuple, Dict, Any
 
@@ -20,6 +21,8 @@ from time import time
 numpy.seterr(all="ignore") # Ignore warnings (dev by zero)
 
 MAXIMUM_HULL_VERTICES_COUNT = 1024   # Maximum number of vertices to have in the convex hull.
+MAXIMUM_CACHED_HULLS_COUNT = 256  # Maximum number of convex hulls to keep in the ConvexHullCache.
+MAXIMUM_CACHED_EXTENTS_COUNT = 16  # Maximum number of extents for different transformations to keep per mesh.
 
 
 class MeshType(Enum):
@@ -45,6 +48,8 @@ class MeshData:
     faces and the three columns being the indices that refer to the individual vertices.
 
     attributes: a dict with {"value", "opengl_type", "opengl_name"} type in vector2f, vector3f, uniforms, ...
+
+    The arrays are read-only, so copies of a mesh and meshes made with set() share the arrays they don't change.
     """
 
     def __init__(self, vertices=None, normals=None, indices=None, colors=None, uvs=None, file_name=None,
@@ -69,7 +74,15 @@ class MeshData:
             self._zero_position = Vector(0, 0, 0)
         self._convex_hull = None    # type: Optional[scipy.spatial.ConvexHull]
         self._convex_hull_vertices = None  # type: Optional[numpy.ndarray]
+        # The vertices of the convex hull of the mesh this one was transformed from, transformed the same way.
+        self._transformed_convex_hull_vertices = None  # type: Optional[numpy.ndarray]
         self._convex_hull_lock = threading.Lock()
+        self._hash = None  # type: Optional[str]
+        # The extents that were asked for last, by the bytes of the transformation matrix.
+        self._extents = OrderedDict()  # type: OrderedDict[Optional[bytes], Optional[AxisAlignedBox]]
+        self._extents_lock = threading.Lock()
+        # Simplified versions of this mesh for drawing it small, from the finest to the coarsest.
+        self._levels_of_detail = None  # type: Optional[List[MeshData]]
 
         self._attributes = {}  # type: Dict[str, Any]
         if attributes is not None:
@@ -109,13 +122,38 @@ class MeshData:
         zero_position = zero_position if zero_position is not Reuse else self._zero_position
         attributes = attributes if attributes is not Reuse else self._attributes
 
-        return MeshData(vertices=vertices, normals=normals, indices=indices, colors=colors, uvs=uvs,
-                        file_name=file_name, center_position=center_position, zero_position=zero_position, attributes=attributes)
+        result = MeshData(vertices=vertices, normals=normals, indices=indices, colors=colors, uvs=uvs,
+                          file_name=file_name, center_position=center_position, zero_position=zero_position, type=self._type, attributes=attributes)
+        if result._vertices is self._vertices:
+            self._shareVertexCaches(result)
+        return result
+
+    def __copy__(self) -> "MeshData":
+        result = self.set()
+        result._levels_of_detail = self._levels_of_detail
+        return result
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "MeshData":
+        # The arrays are read-only, so the copy can share them.
+        return self.__copy__()
+
+    def _shareVertexCaches(self, other: "MeshData") -> None:
+        """Give another mesh with the same vertices what was computed from the vertices of this one."""
+
+        other._hash = self._hash
+        with self._convex_hull_lock:
+            other._convex_hull = self._convex_hull
+            other._convex_hull_vertices = self._convex_hull_vertices
+            other._transformed_convex_hull_vertices = self._transformed_convex_hull_vertices
+        with self._extents_lock:
+            other._extents = OrderedDict(self._extents)
 
     def getHash(self):
-        m = hashlib.sha256()
-        m.update(self.getVerticesAsByteArray())
-        return m.hexdigest()
+        if self._hash is None:  # The vertices can't change, so neither can their hash.
+            m = hashlib.sha256()
+            m.update(self.getVerticesAsByteArray())
+            self._hash = m.hexdigest()
+        return self._hash
 
     def getCenterPosition(self) -> Vector:
         return self._center_position
@@ -181,9 +219,23 @@ class MeshData:
     def hasUVCoordinates(self) -> bool:
         return self._uvs is not None
 
+    def getUVCoordinates(self) -> Optional[numpy.ndarray]:
+        return self._uvs
+
     def getFileName(self) -> Optional[str]:
         return self._file_name
 
+    def getLevelsOfDetail(self) -> Optional[List["MeshData"]]:
+        """Get the simplified versions of this mesh for drawing it small, from the finest to the coarsest.
+
+        :return: The levels of detail, or None if nobody made them; see UM.Mesh.MeshDecimation.
+        """
+
+        return self._levels_of_detail
+
+    def setLevelsOfDetail(self, levels: Optional[List["MeshData"]]) -> None:
+        self._levels_of_detail = levels
+
     def getTransformed(self, transformation: Matrix) -> "MeshData":
         """Transform the meshdata, center and zero position by given Matrix
 
@@ -191,8 +243,14 @@ class MeshData:
         """
 
         if self._vertices is not None:
+            transformation_data = transformation.getData()
+            if numpy.array_equal(transformation_data, numpy.identity(4)):
+                return self.set()  # Nothing changes, so everything can be shared.
             transformed_vertices = transformVertices(self._vertices, transformation)
-            transformed_normals = transformNormals(self._normals, transformation) if self._normals is not None else None
+            if self._normals is not None and numpy.array_equal(transformation_data[0:3, 0:3], numpy.identity(3)):
+                transformed_normals = self._normals  # Only moved, which doesn't turn the normals.
+            else:
+                transformed_normals = transformNormals(self._normals, transformation) if self._normals is not None else None
 
             transformation_matrix = transformation.getTransposed()
             if self._center_position is not None:
@@ -201,31 +259,49 @@ class MeshData:
                 center_position = Reuse
             zero_position = self._zero_position.multiply(transformation_matrix)
 
-            return self.set(vertices=transformed_vertices, normals=transformed_normals, center_position=center_position, zero_position=zero_position)
+            transformed = self.set(vertices=transformed_vertices, normals=transformed_normals, center_position=center_position, zero_position=zero_position)
+            if self._convex_hull is not None:
+                # The convex hull of the transformed vertices is the transformed convex hull.
+                transformed._transformed_convex_hull_vertices = self.getConvexHullTransformedVertices(transformation)
+            return transformed
         else:
             return MeshData(vertices = self._vertices)
 
     def getExtents(self, matrix: Optional[Matrix] = None) -> Optional[AxisAlignedBox]:
         """Get the extents of this mesh.
 
+        The extents are computed from the convex hull, and the last few of them are remembered per transformation.
+
         :param matrix: The transformation matrix from model to world coordinates.
         """
 
         if self._vertices is None:
             return None
 
+        # The vertices are transformed by the float32 data of the matrix, so that is what the extents depend on.
+        key = matrix.getData().tobytes() if matrix is not None else None
+        with self._extents_lock:
+            if key in self._extents:
+                self._extents.move_to_end(key)
+                return self._extents[key]
+
         if matrix is not None:
             data = self.getConvexHullTransformedVertices(matrix)
         else:
             data = self.getConvexHullVertices()
 
         if data is None:
-            return None
-
-        min = data.min(axis=0)
-        max = data.max(axis=0)
+            extents = None
+        else:
+            min = data.min(axis=0)
+            max = data.max(axis=0)
+            extents = AxisAlignedBox(minimum=Vector(min[0], min[1], min[2]), maximum=Vector(max[0], max[1], max[2]))
 
-        return AxisAlignedBox(minimum=Vector(min[0], min[1], min[2]), maximum=Vector(max[0], max[1], max[2]))
+        with self._extents_lock:
+            self._extents[key] = extents
+            while len(self._extents) > MAXIMUM_CACHED_EXTENTS_COUNT:
+                self._extents.popitem(last = False)
+        return extents
 
     def getVerticesAsByteArray(self) -> Optional[bytes]:
         """Get all vertices of this mesh as a bytearray
@@ -268,12 +344,25 @@ class MeshData:
         return self._uvs.tobytes()
 
     def _computeConvexHull(self) -> None:
-        """Convex hull handling"""
+        """Convex hull handling
 
+        Meshes with the same vertices share their convex hull through the ConvexHullCache. The hull keeps only its
+        own vertices, so that neither the mesh nor the cache keeps a copy of all vertices in it.
+        """
+
+        if self._transformed_convex_hull_vertices is not None:
+            self._convex_hull = approximateConvexHull(self._transformed_convex_hull_vertices, MAXIMUM_HULL_VERTICES_COUNT)
+            return
         points = self.getVertices()
         if points is None:
             return
-        self._convex_hull = approximateConvexHull(points, MAXIMUM_HULL_VERTICES_COUNT)
+        cache = ConvexHullCache.getInstance()
+        self._convex_hull = cache.get(self.getHash())
+        if self._convex_hull is None:
+            self._convex_hull = approximateConvexHull(points, MAXIMUM_HULL_VERTICES_COUNT)
+            if self._convex_hull is not None:
+                self._convex_hull = compactConvexHull(self._convex_hull)
+                cache.put(self.getHash(), self._convex_hull)
 
     def getConvexHull(self) -> Optional[scipy.spatial.ConvexHull]:
         """Gets the Convex Hull of this mesh
@@ -362,6 +451,12 @@ class MeshData:
         return result
 
     def invertNormals(self) -> None:
+        """Turn the mesh inside out.
+
+        This replaces the arrays of this mesh, rather than changing them, so copies of the mesh are not affected.
+        """
+
+        self._hash = None
         if self._normals is not None:
             mirror = Matrix()
             mirror.setToIdentity()
@@ -388,6 +483,48 @@ class MeshData:
                str(self._attributes.keys()) + ") "
 
 
+class ConvexHullCache:
+    """Keeps the convex hulls of the meshes that were computed last, by the hash of their vertices.
+
+    Meshes with the same vertices, like those of a model that was loaded more than once, then compute their convex
+    hull once. When the cache is full, the convex hull that was used least recently is forgotten.
+    """
+
+    __instance = None  # type: Optional[ConvexHullCache]
+
+    @classmethod
+    def getInstance(cls) -> "ConvexHullCache":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self, max_count: int = MAXIMUM_CACHED_HULLS_COUNT) -> None:
+        self._max_count = max_count
+        self._hulls = OrderedDict()  # type: OrderedDict[str, scipy.spatial.ConvexHull]
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[scipy.spatial.ConvexHull]:
+        with self._lock:
+            hull = self._hulls.get(key)
+            if hull is not None:
+                self._hulls.move_to_end(key)
+            return hull
+
+    def put(self, key: str, hull: scipy.spatial.ConvexHull) -> None:
+        with self._lock:
+            self._hulls[key] = hull
+            self._hulls.move_to_end(key)
+            while len(self._hulls) > self._max_count:
+                self._hulls.popitem(last = False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hulls.clear()
+
+    def __len__(self) -> int:
+        return len(self._hulls)
+
+
 def transformVertices(vertices: numpy.ndarray, transformation: Matrix) -> numpy.ndarray:
     """Transform an array of vertices using a matrix
 
@@ -462,6 +599,60 @@ def uniqueVertices(vertices: numpy.ndarray) -> numpy.ndarray:
     return vertices[idx]  # Select the unique rows by index.
 
 
+def weldVertices(vertices: numpy.ndarray, indices: Optional[numpy.ndarray] = None, attributes: Optional[List[numpy.ndarray]] = None, tolerance: float = 0) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Find the vertices of a mesh of triangles that are the same, so that they can be stored once
+
+    Vertices are the same if they are at the same position and have the same values of the attributes.
+
+    :param vertices: :type{numpy.ndarray} the vertices of the mesh
+    :param indices: :type{numpy.ndarray} the vertex indices of the triangles, or None if every three vertices are a triangle
+    :param attributes: :type{Optional[List[numpy.ndarray]]} other arrays with a row per vertex, like colors, that must be the
+    same too, or None if there are none
+    :param tolerance: :type{float} if more than 0, vertices are the same if they round off to the same multiple of this
+    :return: :type{Tuple[numpy.ndarray, numpy.ndarray]} which vertices to keep, in the order in which the triangles
+    first use them, and the indices of the triangles into the kept vertices. Triangles of which two corners became the
+    same vertex are left out, as are vertices that are in no triangle.
+    """
+
+    attributes = [] if attributes is None else list(attributes)
+    positions = roundVertexArray(vertices, tolerance) if tolerance > 0 else vertices
+    columns = [numpy.asarray(positions, dtype = numpy.float32).reshape((len(vertices), -1))]
+    columns += [numpy.asarray(attribute, dtype = numpy.float32).reshape((len(vertices), -1)) for attribute in attributes]
+    keys = numpy.hstack(columns) + numpy.float32(0)  # Adding 0 makes -0 the same as 0.
+    if keys.shape[1] % 2 == 1:
+        keys = numpy.hstack((keys, numpy.zeros((len(keys), 1), dtype = numpy.float32)))
+
+    # Sort the vertices by the bits of their values, two values in a 64 bit number at a time: a few stable sorts of
+    # numbers are a lot faster than sorting the rows at once. Stable sorting keeps the first use of every vertex first.
+    bits = keys.view(numpy.uint32)
+    packed = (bits[:, 0::2].astype(numpy.uint64) << numpy.uint64(32)) | bits[:, 1::2]
+    order = numpy.argsort(packed[:, -1], kind = "stable")
+    for column in range(packed.shape[1] - 2, -1, -1):
+        order = order[numpy.argsort(packed[order, column], kind = "stable")]
+    sorted_keys = packed[order]
+    is_first = numpy.ones(len(order), dtype = bool)
+    is_first[1:] = numpy.any(sorted_keys[1:] != sorted_keys[:-1], axis = 1)
+    del sorted_keys
+    groups = numpy.empty(len(order), dtype = numpy.intp)
+    groups[order] = numpy.cumsum(is_first) - 1
+    first_use = order[is_first]
+
+    if indices is None:
+        indices = numpy.arange(len(vertices) - len(vertices) % 3, dtype = numpy.int32).reshape((-1, 3))
+    triangles = groups[indices]
+    degenerate = (triangles[:, 0] == triangles[:, 1]) | (triangles[:, 1] == triangles[:, 2]) | (triangles[:, 0] == triangles[:, 2])
+    corners = triangles[~degenerate].ravel()
+
+    # Keep the vertices that are used, in the order in which they are first used.
+    first_corner = numpy.full(len(first_use), len(corners), dtype = numpy.intp)
+    first_corner[corners[::-1]] = numpy.arange(len(corners) - 1, -1, -1)  # The last assignment wins: the first corner.
+    used = numpy.flatnonzero(first_corner < len(corners))
+    used = used[numpy.argsort(first_corner[used])]
+    renumbering = numpy.empty(len(first_use), dtype = numpy.int32)
+    renumbering[used] = numpy.arange(len(used), dtype = numpy.int32)
+    return first_use[used], renumbering[corners].reshape((-1, 3))
+
+
 def approximateConvexHull(vertex_data: numpy.ndarray, target_count: int) -> Optional[scipy.spatial.ConvexHull]:
     """Compute an approximation of the convex hull of an array of vertices
 
@@ -507,6 +698,20 @@ def approximateConvexHull(vertex_data: numpy.ndarray, target_count: int) -> Opti
     return hull_result
 
 
+def compactConvexHull(hull: scipy.spatial.ConvexHull) -> scipy.spatial.ConvexHull:
+    """The same convex hull, with only its vertices in its points
+
+    A convex hull keeps a copy of all points it was computed from, which can be all vertices of a mesh.
+
+    :param hull: :type{scipy.spatial.ConvexHull} the convex hull
+    :return: :type{scipy.spatial.ConvexHull} the hull itself if it has no other points, otherwise a new one
+    """
+
+    if len(hull.vertices) == len(hull.points):
+        return hull
+    return createConvexHull(numpy.take(hull.points, hull.vertices, axis=0))
+
+
 def createConvexHull(vertex_data: numpy.ndarray) -> scipy.spatial.ConvexHull:
     try:
         hull_result = scipy.spatial.ConvexHull(vertex_data)
@@ -565,6 +770,8 @@ def calculateNormalsFromVertices(vertices: numpy.ndarray, vertex_count: int) ->
 def calculateNormalsFromIndexedVertices(vertices: numpy.ndarray, indices: numpy.ndarray, face_count: int) -> numpy.ndarray:
     """Calculate the normals of this mesh of triagles using indexes.
 
+    A vertex that is shared by several triangles gets the mean of their normals, weighted by their area.
+
     :param vertices: :type{narray} list of vertices as a 1D list of float triples
     :param indices: :type{narray} list of indices as a 1D list of integers
     :param face_count: :type{integer} the number of triangles defined by the indices array
@@ -572,16 +779,16 @@ def calculateNormalsFromIndexedVertices(vertices: numpy.ndarray, indices: numpy.
     """
 
     start_time = time()
-    # Numpy magic!
-    # First, reset the normals
-    normals = numpy.zeros((face_count*3, 3), dtype=numpy.float32)
-
-    for face in indices[0:face_count]:
-        normals[face[0]] = numpy.cross(vertices[face[0]] - vertices[face[1]], vertices[face[0]] - vertices[face[2]])
-        length = numpy.linalg.norm(normals[face[0]])
-        normals[face[0]] /= length
-        normals[face[1]] = normals[face[0]]
-        normals[face[2]] = normals[face[0]]
+    faces = indices[0:face_count]
+    # The cross product of two sides of every triangle, which is as long as twice its area.
+    face_normals = numpy.cross(vertices[faces[:, 0]] - vertices[faces[:, 1]], vertices[faces[:, 0]] - vertices[faces[:, 2]])
+    # Sum them for every vertex, one axis at a time.
+    normals = numpy.zeros((len(vertices), 3), dtype = numpy.float32)
+    for axis in range(3):
+        normals[:, axis] = numpy.bincount(faces.ravel(), numpy.repeat(face_normals[:, axis], 3), len(vertices))
+    length = numpy.linalg.norm(normals, axis = 1)
+    length[length == 0] = 1  # Vertices that are in no triangle, or only in triangles of no area.
+    normals /= length[:, numpy.newaxis]
     end_time = time()
     Logger.log("d", "Calculating normals took %s seconds", end_time - start_time)
     return normals
@@ -0,0 +1,166 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from time import time
+from typing import List
+
+import numpy
+
+from UM.Job import Job
+from UM.JobQueue import JobQueue
+from UM.Logger import Logger
+from UM.Mesh.MeshData import MeshData, MeshType, calculateNormalsFromIndexedVertices
+
+MINIMUM_DECIMATED_FACE_COUNT = 100000  # Meshes with fewer faces are always drawn whole.
+MINIMUM_LEVEL_FACE_COUNT = 5000  # The coarsest level of detail has at least this many faces.
+MAXIMUM_LEVEL_COUNT = 4  # The number of levels of detail of a mesh, each with a quarter of the faces of the one before.
+FACES_PER_PIXEL = 1.0  # How many faces a level of detail needs per pixel of the square that the mesh covers on screen.
+
+
+def decimateMesh(mesh_data: MeshData, target_face_count: int) -> MeshData:
+    """Simplify a mesh of triangles to about a number of faces, for drawing it when it is small on the screen.
+
+    The vertices are clustered in a grid, and every cluster becomes a single vertex. The vertex is placed where it is
+    closest to the planes of the triangles around it, which keeps edges and corners sharp; the quadric error metric
+    of Lindstrom's out-of-core simplification, which unlike edge collapse can be done for all vertices at once.
+    Triangles of which two corners end up in the same cluster disappear. The grid is made finer or coarser until the
+    number of faces is at most the target.
+
+    Normals are calculated anew. Colors are averaged per cluster. Texture coordinates and other attributes are left out.
+
+    :param mesh_data: :type{MeshData} the mesh to simplify. It is not changed.
+    :param target_face_count: :type{int} the maximum number of faces of the result.
+    :return: :type{MeshData} the simplified mesh, with indices.
+    """
+
+    start_time = time()
+    vertices = mesh_data.getVertices()
+    if vertices is None or len(vertices) == 0 or mesh_data.getType() != MeshType.faces:
+        return mesh_data
+    if mesh_data.hasIndices():
+        faces = mesh_data.getIndices()[0:mesh_data.getFaceCount()]
+    else:
+        faces = numpy.arange(len(vertices) - len(vertices) % 3, dtype = numpy.int32).reshape((-1, 3))
+    if len(faces) <= target_face_count:
+        return mesh_data
+
+    minimum = vertices.min(axis = 0).astype(numpy.float64)
+    size = numpy.maximum(vertices.max(axis = 0).astype(numpy.float64) - minimum, 1e-6)
+    # A surface that is cut into cells of this size has about target_face_count faces if it fills the bounding box
+    # with a few layers; the grid is corrected below when the guess is off.
+    cell_size = float(numpy.sqrt(2 * (size[0] * size[1] + size[1] * size[2] + size[0] * size[2]) / max(target_face_count, 1)))
+    for _ in range(20):
+        cells = numpy.floor((vertices - minimum) / cell_size).astype(numpy.int64)
+        cell_keys = numpy.ravel_multi_index(cells.T, (size // cell_size).astype(numpy.int64) + 1)
+        new_faces = cell_keys[faces]
+        keep = (new_faces[:, 0] != new_faces[:, 1]) & (new_faces[:, 1] != new_faces[:, 2]) & (new_faces[:, 0] != new_faces[:, 2])
+        face_count = int(keep.sum())
+        if face_count <= target_face_count:
+            break
+        cell_size *= max(numpy.sqrt(face_count / target_face_count), 1.05)
+    _, first_vertices, clusters = numpy.unique(cell_keys, return_index = True, return_inverse = True)
+    clusters = clusters.ravel().astype(numpy.int32)
+    new_faces = clusters[faces]
+    cluster_count = int(clusters.max()) + 1
+
+    # The quadric of every triangle: its plane, weighted by its area, summed per cluster of each of its corners.
+    corners = vertices[faces].astype(numpy.float64)
+    face_normals = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = numpy.linalg.norm(face_normals, axis = 1)
+    unit_normals = face_normals / numpy.maximum(areas, 1e-12)[:, numpy.newaxis]
+    distances = -numpy.sum(unit_normals * corners[:, 0], axis = 1)
+    corner_clusters = clusters[faces].ravel()
+    quadrics = numpy.zeros((cluster_count, 3, 3))
+    offsets = numpy.zeros((cluster_count, 3))
+    for row in range(3):
+        offsets[:, row] = numpy.bincount(corner_clusters, numpy.repeat(areas * distances * unit_normals[:, row], 3), cluster_count)
+        for column in range(row, 3):
+            quadrics[:, row, column] = numpy.bincount(corner_clusters, numpy.repeat(areas * unit_normals[:, row] * unit_normals[:, column], 3), cluster_count)
+            quadrics[:, column, row] = quadrics[:, row, column]
+
+    # Start at the mean of the vertices of a cluster and move to the least error along the directions that the
+    # planes fix, leaving out those that are barely fixed, like the directions along a flat area.
+    vertex_counts = numpy.maximum(numpy.bincount(clusters, minlength = cluster_count), 1)
+    means = numpy.stack([numpy.bincount(clusters, vertices[:, axis], cluster_count) for axis in range(3)], axis = 1) / vertex_counts[:, numpy.newaxis]
+    left, singular_values, right = numpy.linalg.svd(quadrics)
+    inverse_values = numpy.where(singular_values > singular_values[:, 0:1] * 1e-3, 1 / numpy.maximum(singular_values, 1e-30), 0)
+    residual = -offsets - numpy.einsum("cij,cj->ci", quadrics, means)
+    steps = numpy.einsum("cij,ci,cki,ck->cj", right, inverse_values, left, residual)
+    new_vertices = means + steps
+    # Stay within the cell of the cluster, so that a badly fixed vertex can't shoot off.
+    cell_minimum = minimum + cells[first_vertices] * cell_size
+    new_vertices = numpy.clip(new_vertices, cell_minimum, cell_minimum + cell_size).astype(numpy.float32)
+
+    new_faces = new_faces[keep]
+    used = numpy.zeros(cluster_count, dtype = bool)
+    used[new_faces.ravel()] = True
+    renumbering = numpy.cumsum(used, dtype = numpy.int32) - 1
+    new_faces = renumbering[new_faces]
+    new_vertices = new_vertices[used]
+    colors = None
+    if mesh_data.hasColors():
+        colors = numpy.stack([numpy.bincount(clusters, mesh_data.getColors()[:, channel], cluster_count) for channel in range(4)], axis = 1) / vertex_counts[:, numpy.newaxis]
+        colors = colors[used].astype(numpy.float32)
+    normals = calculateNormalsFromIndexedVertices(new_vertices, new_faces, len(new_faces))
+
+    Logger.log("d", "Decimated a mesh of %s faces to %s faces in %s seconds", len(faces), len(new_faces), time() - start_time)
+    return MeshData(vertices = new_vertices, normals = normals, indices = new_faces, colors = colors,
+                    center_position = mesh_data.getCenterPosition(), zero_position = mesh_data.getZeroPosition())
+
+
+def getLevelOfDetail(mesh_data: MeshData, pixel_size: float) -> MeshData:
+    """Get the level of detail of a mesh to draw it at a size on the screen.
+
+    The levels of detail of a large mesh are made on the JobQueue the first time it is asked for one. Until they are
+    ready, the mesh itself is used.
+
+    :param mesh_data: :type{MeshData} the mesh to draw.
+    :param pixel_size: :type{float} the number of pixels that the mesh spans on the screen.
+    :return: :type{MeshData} the coarsest level of detail with enough faces for that size, or the mesh itself.
+    """
+
+    if _faceCount(mesh_data) < MINIMUM_DECIMATED_FACE_COUNT:
+        return mesh_data
+    levels = mesh_data.getLevelsOfDetail()
+    if levels is None:
+        if JobQueue.getInstance() is not None:
+            mesh_data.setLevelsOfDetail([])  # So that they are only made once.
+            LevelOfDetailJob(mesh_data).start()
+        return mesh_data
+
+    needed_face_count = FACES_PER_PIXEL * pixel_size * pixel_size
+    for level in reversed(levels):  # From the coarsest one up.
+        if level.getFaceCount() >= needed_face_count:
+            return level
+    return mesh_data
+
+
+class LevelOfDetailJob(Job):
+    """Makes the levels of detail of a mesh in the background; see getLevelOfDetail()."""
+
+    def __init__(self, mesh_data: MeshData) -> None:
+        super().__init__()
+        self._mesh_data = mesh_data
+
+    def run(self) -> None:
+        levels = []  # type: List[MeshData]
+        face_count = _faceCount(self._mesh_data)
+        source = self._mesh_data
+        while len(levels) < MAXIMUM_LEVEL_COUNT and face_count // 4 >= MINIMUM_LEVEL_FACE_COUNT:
+            face_count //= 4
+            try:
+                source = decimateMesh(source, face_count)
+            except (ValueError, MemoryError, numpy.linalg.LinAlgError):
+                Logger.logException("w", "Unable to make a level of detail of %s faces.", face_count)
+                break
+            face_count = source.getFaceCount()
+            levels.append(source)
+            Job.yieldThread()
+        self._mesh_data.setLevelsOfDetail(levels)
+        self.setResult(levels)
+
+
+def _faceCount(mesh_data: MeshData) -> int:
+    """The number of faces of a mesh, also if every three vertices are a face."""
+
+    return mesh_data.getFaceCount() if mesh_data.hasIndices() else mesh_data.getVertexCount() // 3
@@ -7,8 +7,14 @@ from PyQt6.QtCore import QObject, QUrl  # For typing.
 from UM.Logger import Logger
 from UM.Math.Matrix import Matrix
 from UM.Math.Vector import Vector
-from UM.FileHandler.FileHandler import FileHandler
-from typing import TYPE_CHECKING
+from UM.FileHandler.FileHandler import FileHandler, resolveAnySymlink
+from UM.Mesh.MeshCache import MeshCache
+from UM.Mesh.MeshData import MeshData
+from UM.Mesh.MeshReaderPool import MeshReaderPool
+from UM.MimeTypeDatabase import MimeTypeDatabase, MimeTypeNotFoundError
+from UM.Resources import Resources
+from UM.Scene.SceneNode import SceneNode
+from typing import Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from UM.Qt.QtApplication import QtApplication
 
@@ -21,6 +27,40 @@ class MeshFileHandler(FileHandler):
 
     def __init__(self, application: "QtApplication", writer_type: str = "mesh_writer", reader_type: str = "mesh_reader", parent: QObject = None) -> None:
         super().__init__(application, writer_type, reader_type, parent)
+        self._mesh_cache = None  # type: Optional[MeshCache]
+        self._use_mesh_cache = True
+        self._mesh_reader_pool = None  # type: Optional[MeshReaderPool]
+
+    def getMeshCache(self) -> Optional[MeshCache]:
+        """The cache of the meshes of files that were read before, or None if
+        meshes are not cached."""
+
+        if self._mesh_cache is None and self._use_mesh_cache:
+            self._mesh_cache = MeshCache(os.path.join(Resources.getCacheStoragePath(), "meshes"))
+        return self._mesh_cache
+
+    def setUseMeshCache(self, use_mesh_cache: bool) -> None:
+        self._use_mesh_cache = use_mesh_cache
+        if not use_mesh_cache:
+            self._mesh_cache = None
+
+    def getReadInProcesses(self) -> bool:
+        return self._mesh_reader_pool is not None
+
+    def setReadInProcesses(self, read_in_processes: bool) -> None:
+        """Sets whether meshes are read in worker processes, by the readers that
+        can do so.
+
+        Files are read one per ReadMeshJob, and the jobs wait for the workers,
+        so importing many files at once uses as many cores as the job queue has
+        threads.
+        """
+
+        if read_in_processes and self._mesh_reader_pool is None:
+            self._mesh_reader_pool = MeshReaderPool()
+        elif not read_in_processes and self._mesh_reader_pool is not None:
+            self._mesh_reader_pool.shutdown()
+            self._mesh_reader_pool = None
 
     def readerRead(self, reader, file_name, **kwargs):
         """Try to read the mesh_data from a file using a specified MeshReader.
@@ -33,7 +73,10 @@ class MeshFileHandler(FileHandler):
         """
 
         try:
-            results = reader.read(file_name)
+            results = self._readFromMeshCache(reader, file_name)
+            if results is None:
+                results = self._readInProcess(reader, file_name)
+                self._putInMeshCache(reader, file_name, results)
             if results is not None:
                 if type(results) is not list:
                     results = [results]
@@ -62,6 +105,70 @@ class MeshFileHandler(FileHandler):
         Logger.log("w", "Unable to read file %s", file_name)
         return None  # unable to read
 
+    def _readFromMeshCache(self, reader, file_name: str) -> Optional[SceneNode]:
+        """The node of a file that was read before, made from the mesh that the
+        mesh cache kept of it, or None if the cache has no mesh of the file."""
+
+        mesh_cache = self.getMeshCache()
+        if mesh_cache is None or not reader.canCacheMesh():
+            return None
+        file_name = resolveAnySymlink(file_name)
+        mesh_data = mesh_cache.get(file_name, reader)
+        if mesh_data is None:
+            return None
+        Logger.log("d", "Took the mesh of %s from the mesh cache (%s hits, %s misses).", file_name, mesh_cache.getHitCount(), mesh_cache.getMissCount())
+        return self._createNode(mesh_data, file_name)
+
+    def _readInProcess(self, reader, file_name: str):
+        """Reads a file in a worker process if the reader can, or else with the
+        reader itself."""
+
+        if self._mesh_reader_pool is None or not reader.canReadInProcess():
+            return reader.read(file_name)
+        file_name = resolveAnySymlink(file_name)
+        try:
+            mesh_data = self._mesh_reader_pool.read(reader, file_name)
+        except OSError:
+            raise
+        except Exception:
+            Logger.logException("w", "Reading %s in a worker process failed, reading it here instead.", file_name)
+            return reader.read(file_name)
+        if mesh_data is None:
+            return None
+        return self._createNode(mesh_data, file_name)
+
+    def _createNode(self, mesh_data: MeshData, file_name: str) -> SceneNode:
+        """The node of a mesh that was read without MeshReader.read, set up like
+        MeshReader.read would have."""
+
+        node = SceneNode()
+        node.setMeshData(mesh_data)
+        try:
+            node.source_mime_type = MimeTypeDatabase.getMimeTypeForFile(file_name)
+        except MimeTypeNotFoundError:
+            pass
+        self._application.getController().getScene().addWatchedFile(file_name)
+        return node
+
+    def _putInMeshCache(self, reader, file_name: str, results) -> None:
+        """Keeps the mesh of a file in the mesh cache.
+
+        Only the results of readers that allow it, and that are just a mesh, are
+        kept. Those of files that are a scene, like 3MF, have transformations,
+        settings or metadata that are not part of the mesh.
+        """
+
+        mesh_cache = self.getMeshCache()
+        if mesh_cache is None or not reader.canCacheMesh():
+            return
+        if isinstance(results, list):
+            if len(results) != 1:
+                return
+            results = results[0]
+        if type(results) is not SceneNode or results.getChildren() or results.getDecorators() or results.getMeshData() is None:
+            return
+        mesh_cache.put(file_name, reader, results.getMeshData())
+
     def _readLocalFile(self, file: QUrl, add_to_recent_files_hint: bool = True):
         # We need to prevent circular dependency, so do some just in time importing.
         from UM.Mesh.ReadMeshJob import ReadMeshJob
@@ -42,5 +42,24 @@ class MeshReader(FileReader):
 
         return result
 
+    def canCacheMesh(self) -> bool:
+        """Whether the mesh cache may keep what this reader reads.
+
+        Only readers whose result is a single node with a mesh, that depends on
+        nothing but the contents of the file, should allow it.
+        """
+
+        return False
+
+    def canReadInProcess(self) -> bool:
+        """Whether this reader can read in a worker process of MeshReaderPool.
+
+        The worker creates its own instance of the reader, so only readers whose
+        result is a single node with a mesh, that depends on nothing but the
+        contents of the file, should allow it.
+        """
+
+        return False
+
     def _read(self, file_name: str) -> Union[SceneNode, List[SceneNode]]:
         raise NotImplementedError("MeshReader plugin was not correctly implemented, no read was specified")
@@ -0,0 +1,145 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import importlib
+import importlib.util
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, List, Optional, Tuple
+
+import numpy
+
+from UM.Mesh.MeshData import MeshData
+
+
+class MeshReaderPool:
+    """Reads meshes in worker processes, so that reading several files at once
+    is not limited to one core by the GIL.
+
+    A worker creates its own instance of the reader and lets it read the file.
+    The arrays of the mesh are handed back in a block of shared memory, of
+    which the mesh that is returned takes a copy; the scene node is made by
+    the caller.
+
+    Only readers that allow it with MeshReader.canReadInProcess() can be used:
+    the worker only sees the file and the reader's module, not the state of
+    the application.
+    """
+
+    # The alignment of the arrays in the shared memory.
+    _alignment = 64
+
+    def __init__(self, processes: Optional[int] = None) -> None:
+        """Creates a pool.
+
+        :param processes: The number of worker processes, or None for one per
+        processor. They are started when the first file is read.
+        """
+
+        self._processes = processes
+        self._executor = None  # type: Optional[ProcessPoolExecutor]
+
+    def read(self, reader: Any, file_name: str) -> Optional[MeshData]:
+        """Reads a file with a reader in a worker process and waits for it.
+
+        :return: The mesh, with read-only arrays, or None if the reader didn't
+        read anything.
+        :raise Exception: Whatever the reader raised.
+        """
+
+        if self._executor is None:
+            # Workers are started fresh instead of forked, so they do not
+            # inherit the threads and open files of the application.
+            self._executor = ProcessPoolExecutor(self._processes, mp_context = multiprocessing.get_context("spawn"))
+        shared = self._executor.submit(_readMesh, _readerLocation(reader), file_name).result()
+        if shared is None:
+            return None
+
+        memory_name, table = shared
+        memory = SharedMemory(memory_name)
+        try:
+            arrays = {}
+            for name, dtype, shape, offset in table:
+                array = numpy.ndarray(shape, dtype, memory.buf, offset).copy()
+                array.flags.writeable = False  # So that MeshData takes it as it is.
+                arrays[name] = array
+        finally:
+            memory.close()
+            memory.unlink()
+        return MeshData(file_name = file_name, **arrays)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def _readerLocation(reader: Any) -> Tuple[str, Optional[str], Optional[List[str]], str, str]:
+    """Where a worker finds the class of a reader.
+
+    Plug-ins are loaded from their folder rather than from the module path, so
+    the file of the top level package or module is passed along.
+
+    :return: The name of the top level package or module, its file and its
+    search locations, the name of the module of the class and its name.
+    """
+
+    module_name = type(reader).__module__
+    top_level_name = module_name.split(".")[0]
+    spec = getattr(sys.modules.get(top_level_name), "__spec__", None)
+    origin = spec.origin if spec is not None else None
+    search_locations = list(spec.submodule_search_locations) if spec is not None and spec.submodule_search_locations is not None else None
+    return top_level_name, origin, search_locations, module_name, type(reader).__qualname__
+
+
+def _readMesh(location: Tuple[str, Optional[str], Optional[List[str]], str, str], file_name: str) -> Optional[Tuple[str, List[Tuple[str, str, Tuple[int, ...], int]]]]:
+    """Reads a file in a worker process.
+
+    :return: The name of the shared memory with the arrays of the mesh and the
+    name, dtype, shape and offset of every array, or None if the reader
+    didn't read a mesh.
+    """
+
+    top_level_name, origin, search_locations, module_name, class_name = location
+    if top_level_name not in sys.modules and origin is not None:
+        spec = importlib.util.spec_from_file_location(top_level_name, origin, submodule_search_locations = search_locations)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[top_level_name] = module
+        spec.loader.exec_module(module)
+    reader_class = importlib.import_module(module_name)
+    for name in class_name.split("."):
+        reader_class = getattr(reader_class, name)
+
+    result = reader_class()._read(file_name)
+    if isinstance(result, list):
+        result = result[0] if len(result) == 1 else None
+    mesh_data = result.getMeshData() if result is not None else None
+    if mesh_data is None:
+        return None
+
+    arrays = [(name, array) for name, array in (
+        ("vertices", mesh_data.getVertices()),
+        ("normals", mesh_data.getNormals()),
+        ("indices", mesh_data.getIndices()),
+        ("colors", mesh_data.getColors()),
+        ("uvs", mesh_data.getUVCoordinates())
+    ) if array is not None]
+    table = []  # type: List[Tuple[str, str, Tuple[int, ...], int]]
+    size = 0
+    for name, array in arrays:
+        table.append((name, array.dtype.str, array.shape, size))
+        size += -(-array.nbytes // MeshReaderPool._alignment) * MeshReaderPool._alignment
+    memory = SharedMemory(create = True, size = max(size, 1))
+    try:
+        for (name, array), (_, dtype, shape, offset) in zip(arrays, table):
+            numpy.ndarray(shape, dtype, memory.buf, offset)[...] = array
+    except:
+        memory.close()
+        memory.unlink()
+        raise
+    memory.close()  # The reading side unlinks it.
+    return memory.name, table
@@ -822,6 +822,8 @@ class SceneNode:
         for child in self._children:
             child.invertNormals()
         if self._mesh_data:
+            # Copies of this node share the mesh data, so invert a copy of it.
+            self._mesh_data = self._mesh_data.set()
             self._mesh_data.invertNormals()
 
     def _transformChanged(self) -> None:
@@ -3,11 +3,14 @@
 
 from typing import List, Dict, Union, Optional, Any
 
+import numpy
+
 from UM.Logger import Logger
 from UM.Math.Matrix import Matrix
 
 from UM.Math.Vector import Vector
 from UM.Mesh.MeshData import MeshData
+from UM.Mesh.MeshDecimation import getLevelOfDetail
 from UM.Scene.Camera import Camera
 
 from UM.View.GL.OpenGL import OpenGL
@@ -79,6 +82,8 @@ class RenderBatch:
         This can be used to do additional alterations to the state that can not be done otherwise.
         The callback is passed the OpenGL bindings object as first and only parameter.
         - state_teardown_callback: A callback similar to state_setup_callback, but called after everything was rendered, to handle cleaning up state changes made in state_setup_callback.
+        - level_of_detail: Whether to draw large meshes simplified when they are small on the screen, see UM.Mesh.MeshDecimation. Defaults to False.
+        Batches with a range always draw the whole mesh.
         """
         self._shader = shader
         self._render_type = kwargs.get("type", self.RenderType.Solid)  # type: int
@@ -91,10 +96,13 @@ class RenderBatch:
             self._blend_mode = self.BlendMode.NoBlending if self._render_type == self.RenderType.Solid else self.BlendMode.Normal
         self._state_setup_callback = kwargs.get("state_setup_callback", None)
         self._state_teardown_callback = kwargs.get("state_teardown_callback", None)
+        self._level_of_detail = kwargs.get("level_of_detail", False) and self._render_range is None  # type: bool
         self._items = []  # type: List[Dict[str, Union[MeshData, Matrix, Dict[str, Any], None]]]
 
         self._view_matrix = None  # type: Optional[Matrix]
         self._projection_matrix = None  # type: Optional[Matrix]
+        self._view_projection_data = None  # type: Optional[numpy.ndarray]
+        self._viewport_height = 0
 
         self._gl = OpenGL.getInstance().getBindingsObject()
 
@@ -209,6 +217,10 @@ class RenderBatch:
 
         self._projection_matrix = camera.getProjectionMatrix()
 
+        if self._level_of_detail:
+            self._view_projection_data = self._projection_matrix.multiply(self._view_matrix, copy = True).getData()
+            self._viewport_height = camera.getViewportHeight()
+
         self._shader.updateBindings(
             view_matrix = self._view_matrix,
             projection_matrix = self._projection_matrix,
@@ -235,6 +247,21 @@ class RenderBatch:
 
         self._shader.release()
 
+    def _getLevelOfDetail(self, mesh: MeshData, transformation: Matrix) -> MeshData:
+        """Get the level of detail of a mesh for the number of pixels its bounding box spans on the screen."""
+
+        extents = mesh.getExtents(transformation)  # The same as the bounding box of the node, so usually cached.
+        if extents is None or self._view_projection_data is None:
+            return mesh
+        center = extents.center
+        clip_position = self._view_projection_data.dot([center.x, center.y, center.z, 1.0])
+        if clip_position[3] <= 0:
+            return mesh  # Its center is behind the camera.
+        diameter = (extents.maximum - extents.minimum).length()
+        # The projection scales vertical sizes by its [1, 1], to the range of -1 to 1 over the height of the viewport.
+        pixel_size = diameter * abs(self._projection_matrix.getData()[1, 1]) / clip_position[3] * self._viewport_height / 2
+        return getLevelOfDetail(mesh, pixel_size)
+
     def _renderItem(self, item: Dict[str, Any]):
         transformation = item["transformation"]
         mesh = item["mesh"]
@@ -243,6 +270,9 @@ class RenderBatch:
         if mesh.getVertexCount() == 0:
             return
 
+        if self._level_of_detail:
+            mesh = self._getLevelOfDetail(mesh, transformation)
+
         normal_matrix = item["normal_transformation"]
         if mesh.hasNormals() and normal_matrix is None:
             normal_matrix = Matrix(transformation.getData())
@@ -93,7 +93,7 @@ class SelectionPass(RenderPass):
     def _renderObjectsMode(self):
         self._selection_map = self._toolhandle_selection_map.copy()
 
-        batch = RenderBatch(self._shader)
+        batch = RenderBatch(self._shader, level_of_detail = True)  # Picking objects doesn't need every face.
         tool_handle = RenderBatch(self._tool_handle_shader, type = RenderBatch.RenderType.Overlay)
         selectable_objects = False
         for node in DepthFirstIterator(self._scene.getRoot()):
@@ -3,118 +3,219 @@
 # Uranium is released under the terms of the LGPLv3 or higher.
 
 import os
+import re
+
+import numpy
 
 from UM.Job import Job
 from UM.Logger import Logger
+from UM.Mesh.MeshData import MeshData, calculateNormalsFromIndexedVertices
 from UM.Mesh.MeshReader import MeshReader
-from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Scene.SceneNode import SceneNode
 
 
 class OBJReader(MeshReader):
+    # The lines that are read, with their keyword and the rest of the line. A
+    # backslash at the end of a line continues it on the next line.
+    _continued_line = re.compile(r"(?:(?<=\s)|^)\\[ \t]*\n", re.MULTILINE)
+    _data_line = re.compile(r"^[ \t]*(v|vn|vt|f)[ \t]+([^\n#]*)", re.MULTILINE)
+
     def __init__(self) -> None:
         super().__init__()
         self._supported_extensions = [".obj"]
 
     def _toAbsoluteIndex(self, max, data):
-        """ Handle negative indices (those are relative to the position, so -2 is the second one before the face). """
-        return [index if index > 0 else 1 + max + index for index in data]
+        """ Handle negative indices (those are relative to the position, so -2 is the second one before the face).
+
+        :param max: The number of elements before the face, per index.
+        :param data: The indices, counted from 1, as a NumPy array.
+        """
+        return numpy.where(data > 0, data, 1 + max + data)
+
+    def canCacheMesh(self) -> bool:
+        return True
+
+    def canReadInProcess(self) -> bool:
+        return True
 
     def _read(self, file_name):
         scene_node = None
 
         extension = os.path.splitext(file_name)[1]
         if extension.lower() in self._supported_extensions:
-            vertex_list = []
-            normal_list = []
-            uv_list = []
-            face_list = []
-            scene_node = SceneNode()
-
-            mesh_builder = MeshBuilder()
-            mesh_builder.setFileName(file_name)
-            previous_line_parts = []
-            f = open(file_name, "rt", encoding = "utf-8", errors='ignore')
-            for line in f:
-                parts = previous_line_parts + line.split()
-                previous_line_parts = []
-                if len(parts) < 1:
-                    continue
-                if parts[-1] == "\\":
-                    del parts[-1]
-                    previous_line_parts = parts
-                    continue
-                if parts[0] == "f":
-                    parts = [i for i in map(lambda p: p.split("/"), parts)]
-                    for idx in range(1, len(parts) - 2):
-                        data = self._toAbsoluteIndex(len(vertex_list), [int(parts[1][0]), int(parts[idx + 1][0]), int(parts[idx + 2][0])])
-
-                        if len(parts[1]) > 1 and parts[1][1] and parts[idx + 1][1] and parts[idx + 2][1]:
-                            data += self._toAbsoluteIndex(len(normal_list), [int(parts[1][1]), int(parts[idx + 1][1]), int(parts[idx + 2][1])])
-                        else:
-                            data += [0, 0, 0]
-
-                        if len(parts[1]) > 2:
-                            data += self._toAbsoluteIndex(len(uv_list), [int(parts[1][2]), int(parts[idx + 1][2]), int(parts[idx + 2][2])])
-                        else:
-                            data += [0, 0, 0]
-
-                        face_list.append(data)
-                elif parts[0] == "v":
-                    vertex_list.append([float(parts[1]), float(parts[3]), -float(parts[2])])
-                elif parts[0] == "vn":
-                    normal_list.append([float(parts[1]), float(parts[3]), -float(parts[2])])
-                elif parts[0] == "vt":
-                    uv_list.append([float(parts[1]), float(parts[2])])
-                Job.yieldThread()
-            f.close()
-
-            mesh_builder.reserveVertexCount(3 * len(face_list))
-            num_vertices = len(vertex_list)
-
-            for face in face_list:
-                # Substract 1 from index, as obj starts counting at 1 instead of 0
-                i = face[0] - 1
-                j = face[1] - 1
-                k = face[2] - 1
-
-                ui = face[3] - 1
-                uj = face[4] - 1
-                uk = face[5] - 1
-
-                ni = face[6] - 1
-                nj = face[7] - 1
-                nk = face[8] - 1
-
-                if i < 0 or i >= num_vertices:
-                    i = 0
-                if j < 0 or j >= num_vertices:
-                    j = 0
-                if k < 0 or k >= num_vertices:
-                    k = 0
-                if ni != -1 and nj != -1 and nk != -1:
-                    mesh_builder.addFaceWithNormals(vertex_list[i][0], vertex_list[i][1], vertex_list[i][2], normal_list[ni][0], normal_list[ni][1], normal_list[ni][2], vertex_list[j][0], vertex_list[j][1], vertex_list[j][2], normal_list[nj][0], normal_list[nj][1], normal_list[nj][2], vertex_list[k][0], vertex_list[k][1], vertex_list[k][2],normal_list[nk][0], normal_list[nk][1], normal_list[nk][2])
-                else:
-                    mesh_builder.addFaceByPoints(vertex_list[i][0], vertex_list[i][1], vertex_list[i][2], vertex_list[j][0], vertex_list[j][1], vertex_list[j][2], vertex_list[k][0], vertex_list[k][1], vertex_list[k][2])
-
-                if ui != -1 and len(uv_list) > ui:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 3, uv_list[ui][0], uv_list[ui][1])
-
-                if uj != -1 and len(uv_list) > uj:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 2, uv_list[uj][0], uv_list[uj][1])
-
-                if uk != -1 and len(uv_list) > uk:
-                    mesh_builder.setVertexUVCoordinates(mesh_builder.getVertexCount() - 1, uv_list[uk][0], uv_list[uk][1])
-
-                Job.yieldThread()
-            if not mesh_builder.hasNormals():
-                mesh_builder.calculateNormals(fast = True)
-
-            # make sure that the mesh data is not empty
-            if mesh_builder.getVertexCount() == 0:
+            with open(file_name, "rt", encoding = "utf-8", errors = "ignore") as f:
+                text = f.read()
+            if "\\" in text:
+                text = self._continued_line.sub(" ", text)
+            lines = self._data_line.findall(text)
+            del text
+            Job.yieldThread()
+            if not lines:
+                Logger.log("d", "File did not contain valid data, unable to read.")
+                return None
+            keywords, data = zip(*lines)
+            del lines
+            keywords = numpy.array(keywords)
+            data = numpy.array(data, dtype = object)
+
+            # First pass: the numbers on all lines of a kind at once.
+            vertex_list = self._parseFloats(data[keywords == "v"], 3)
+            normal_list = self._parseFloats(data[keywords == "vn"], 3)
+            uv_list = self._parseFloats(data[keywords == "vt"], 2)
+            is_face = keywords == "f"
+            corners, corner_counts = self._parseCorners(data[is_face])
+            Job.yieldThread()
+
+            # Negative indices are relative to the number of elements before the face. Indices that are not given
+            # are 0, and must stay invalid rather than become relative to the elements that come after the face.
+            counts = numpy.stack([numpy.cumsum(keywords == keyword)[is_face] for keyword in ("v", "vt", "vn")], axis = 1)
+            not_given = corners == 0
+            corners = self._toAbsoluteIndex(numpy.repeat(counts, corner_counts, axis = 0), corners)
+            corners[not_given] = 0
+            corners -= 1  # OBJ starts counting at 1.
+            vertex_indices = corners[:, 0]
+            vertex_indices[(vertex_indices < 0) | (vertex_indices >= len(vertex_list))] = 0
+            # Texture coordinates and normals are optional; those that are missing or wrong are -1.
+            for column, element_count in ((1, len(uv_list)), (2, len(normal_list))):
+                column_indices = corners[:, column]
+                column_indices[(column_indices < 0) | (column_indices >= element_count)] = -1
+
+            # Second pass: split the polygons into fans of triangles and make a
+            # mesh vertex of every distinct combination of vertex, texture
+            # coordinates, normal and, for corners without a normal, polygon.
+            triangles = self._triangulate(corner_counts)
+            if len(vertex_list) == 0 or len(triangles) == 0:
                 Logger.log("d", "File did not contain valid data, unable to read.")
                 return None  # We didn't load anything.
+            triangle_corners = corners[triangles.ravel()]
+            # Like addFaceWithNormals, a triangle only gets the normals of the file if all its corners have one.
+            without_normals = numpy.repeat(numpy.any(triangle_corners[:, 2].reshape((-1, 3)) < 0, axis = 1), 3)
+            triangle_corners[without_normals, 2] = -1
+            # Polygons without normals are flat, like addFaceByPoints makes them, so they don't share their vertices
+            # with other polygons.
+            polygons = numpy.repeat(numpy.arange(len(corner_counts)), corner_counts)[triangles.ravel()]
+            triangle_corners = numpy.column_stack((triangle_corners, numpy.where(without_normals, polygons, -1)))
+            # Sorting numbers is a lot faster than sorting rows, so number the
+            # combinations if they fit in 64 bits.
+            sizes = [len(vertex_list), len(uv_list) + 1, len(normal_list) + 1, len(corner_counts) + 1]
+            if sizes[0] * sizes[1] * sizes[2] * sizes[3] < 2 ** 63:
+                keys = numpy.ravel_multi_index((triangle_corners + [0, 1, 1, 1]).T, sizes)
+                _, first_use, indices = numpy.unique(keys, return_index = True, return_inverse = True)
+                used_corners = triangle_corners[first_use]
+            else:
+                used_corners, first_use, indices = numpy.unique(triangle_corners, axis = 0, return_index = True, return_inverse = True)
+            # Keep the vertices in the order in which they are first used.
+            order = numpy.argsort(first_use)
+            renumbering = numpy.empty(len(order), dtype = numpy.int32)
+            renumbering[order] = numpy.arange(len(order), dtype = numpy.int32)
+            used_corners = used_corners[order]
+            indices = renumbering[indices.ravel()].reshape((-1, 3))
+
+            vertices = vertex_list[used_corners[:, 0]]
+            has_normal = used_corners[:, 2] >= 0
+            if numpy.all(has_normal):
+                normals = normal_list[used_corners[:, 2]]
+            else:
+                # The vertices without a normal are only used by the triangles of one polygon without normals, so
+                # they get the normal of that polygon.
+                normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
+                normals[has_normal] = normal_list[used_corners[has_normal, 2]]
+            uvs = None
+            if numpy.any(used_corners[:, 1] >= 0):
+                uvs = numpy.zeros((len(used_corners), 2), dtype = numpy.float32)
+                has_uv = used_corners[:, 1] >= 0
+                uvs[has_uv] = uv_list[used_corners[has_uv, 1]]
 
-            scene_node.setMeshData(mesh_builder.build())
+            scene_node = SceneNode()
+            scene_node.setMeshData(MeshData(vertices = vertices, normals = normals, indices = indices, uvs = uvs, file_name = file_name))
 
         return scene_node
+
+    @staticmethod
+    def _parseFloats(lines, width):
+        """Reads the first numbers of lines of floats, like those of vertices.
+
+        :param lines: The lines, without their keyword.
+        :param width: The number of numbers to read of every line. Lines with
+        fewer numbers are padded with zeros.
+        :return: A float32 array of a row per line. Vertices and normals are
+        in our coordinate system (Y and Z swapped and Z inverted).
+        """
+
+        text = "\n".join(lines).encode()
+        counts = _tokenCounts(text, len(lines))[0]
+        numbers = numpy.fromstring(text, dtype = numpy.float64, sep = " ")
+        if len(numbers) != counts.sum():
+            raise ValueError("Not all numbers in the OBJ file could be read.")
+        result = numpy.zeros((len(lines), width), dtype = numpy.float32)
+        starts = numpy.cumsum(counts) - counts
+        for column in range(width):
+            has_column = counts > column
+            result[has_column, column] = numbers[starts[has_column] + column]
+        if width == 3:
+            result[:, [1, 2]] = result[:, [2, 1]]
+            result[:, 2] *= -1
+        return result
+
+    @staticmethod
+    def _parseCorners(lines):
+        """Reads the corners of the polygons of face lines.
+
+        :param lines: The lines, without their keyword.
+        :return: The vertex, texture coordinate and normal index of every corner
+        of all polygons, with 0 for the indices that are not given, and the
+        number of corners of every polygon.
+        """
+
+        # Fill in missing texture coordinates, so that all indices that are
+        # given are separated by exactly one slash.
+        text = "\n".join(lines).encode().replace(b"//", b"/0/")
+        corner_counts, slash_counts = _tokenCounts(text, len(lines), b"/")
+        numbers = numpy.fromstring(text.replace(b"/", b" "), dtype = numpy.int64, sep = " ")
+        index_counts = slash_counts + 1
+        if len(numbers) != index_counts.sum() or numpy.any(index_counts > 3):
+            raise ValueError("Not all faces in the OBJ file could be read.")
+        corners = numpy.zeros((len(slash_counts), 3), dtype = numpy.int64)
+        corner_of_number = numpy.repeat(numpy.arange(len(slash_counts)), index_counts)
+        column_of_number = numpy.arange(len(numbers)) - numpy.repeat(numpy.cumsum(index_counts) - index_counts, index_counts)
+        corners[corner_of_number, column_of_number] = numbers
+        return corners, corner_counts
+
+    @staticmethod
+    def _triangulate(corner_counts):
+        """Splits polygons into fans of triangles around their first corner.
+
+        :param corner_counts: The number of corners of every polygon, where the
+        corners of all polygons are numbered one after the other.
+        :return: The corner numbers of every triangle.
+        """
+
+        triangle_counts = numpy.maximum(corner_counts - 2, 0)
+        first_corners = numpy.repeat(numpy.cumsum(corner_counts) - corner_counts, triangle_counts)
+        # The number of the triangle within its polygon.
+        fan_index = numpy.arange(len(first_corners)) - numpy.repeat(numpy.cumsum(triangle_counts) - triangle_counts, triangle_counts)
+        return numpy.stack([first_corners, first_corners + fan_index + 1, first_corners + fan_index + 2], axis = 1)
+
+
+def _tokenCounts(text, line_count, separator = None):
+    """Counts the whitespace separated tokens on every line of a text.
+
+    :param text: The lines, as bytes separated by newlines.
+    :param line_count: The number of lines.
+    :param separator: A character of which to count the occurrences in every
+    token as well.
+    :return: The number of tokens of every line, and if a separator is given,
+    the number of separators in every token.
+    """
+
+    characters = numpy.frombuffer(text, dtype = numpy.uint8)
+    is_space = (characters == ord(" ")) | (characters == ord("\t")) | (characters == ord("\r")) | (characters == ord("\n"))
+    is_token_start = ~is_space
+    is_token_start[1:] &= is_space[:-1]
+    line_of_character = numpy.cumsum(characters == ord("\n"))
+    token_counts = numpy.bincount(line_of_character[is_token_start], minlength = line_count)
+    if separator is None:
+        return token_counts, None
+    token_of_character = numpy.cumsum(is_token_start) - 1
+    separator_counts = numpy.bincount(token_of_character[characters == ord(separator)], minlength = int(is_token_start.sum()))
+    return token_counts, separator_counts
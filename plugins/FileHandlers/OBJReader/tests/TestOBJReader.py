@@ -2,6 +2,7 @@ import os.path
 
 import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy
 import pytest
 from unittest.mock import patch
 
@@ -18,20 +19,20 @@ def test_readOBJ():
 
     assert result  # It must return a node
     assert result.getMeshData()  # It should have mesh data
-    assert result.getMeshData().getVertexCount() == 3840
+    assert result.getMeshData().getVertexCount() == 642  # The faces share their vertices.
     assert result.getMeshData().getFaceCount() == 1280
     assert result.getMeshData().hasNormals()  # It should have normals.
 
-@pytest.mark.parametrize("filename", [
-    "vertex_duplicated.obj",
-    "vertex_indexed.obj",
-    "vertex_normal_indexed.obj",
-    "vertex_texture_indexed.obj",
-    "vertex_texture_normal_indexed.obj",
-    "negative_indexed.obj",
-    "negative_interweaved.obj"
+@pytest.mark.parametrize("filename, vertex_count", [
+    ("vertex_duplicated.obj", 36),
+    ("vertex_indexed.obj", 24),  # Sides without normals are flat, so they don't share their corners.
+    ("vertex_normal_indexed.obj", 24),  # Every corner has a normal per side.
+    ("vertex_texture_indexed.obj", 24),
+    ("vertex_texture_normal_indexed.obj", 24),
+    ("negative_indexed.obj", 24),
+    ("negative_interweaved.obj", 36)
 ])
-def test_cubes(filename):
+def test_cubes(filename, vertex_count):
     """
     Tests reading cubes in various formats. All of them render the same cube in the end.
     """
@@ -42,7 +43,8 @@ def test_cubes(filename):
 
     mesh = result.getMeshData()
     assert mesh.getFaceCount() == 6 * 2
-    assert mesh.getVertexCount() == mesh.getFaceCount() * 3  # We need to serialise them as separate triangles, not sharing indices.
+    assert mesh.getVertexCount() == vertex_count  # Faces share the vertices that have the same vertex, texture coordinates and normal.
+    assert mesh.hasNormals()
 
     # All of these triangles must be present in the mesh.
     assert isTriangleInMesh([[0, 0, 0], [0, 10, 0], [0, 0, -10]], mesh)  # Small X.
@@ -58,6 +60,20 @@ def test_cubes(filename):
     assert isTriangleInMesh([[10, 0, -10], [0, 0, -10], [0, 10, -10]], mesh)  # Large Z.
     assert isTriangleInMesh([[10, 0, -10], [0, 10, -10], [10, 10, -10]], mesh)
 
+@pytest.mark.parametrize("filename", ["vertex_duplicated.obj", "vertex_indexed.obj", "vertex_texture_indexed.obj", "negative_indexed.obj", "negative_interweaved.obj"])
+def test_cubesWithoutNormals(filename):
+    """
+    Tests that the sides of cubes without normals get the normal of the side, as before faces shared their vertices.
+    """
+    reader = OBJReader.OBJReader()
+    with patch("UM.Application.Application.getInstance"):
+        mesh = reader.read(os.path.join(test_path, filename)).getMeshData()
+
+    # The normals of the corners of every triangle, by side.
+    side_normals = [[0, 0, -1], [0, 1, 0], [-1, 0, 0], [0, 0, 1], [1, 0, 0], [0, -1, 0]]
+    normals = mesh.getNormals()[mesh.getIndices().ravel()]
+    assert numpy.allclose(normals, numpy.repeat(side_normals, 6, axis = 0))
+
 def isTriangleInMesh(triangle, mesh_data):
     """
     Tests if a triangle is present in mesh data.
@@ -70,4 +86,65 @@ def isTriangleInMesh(triangle, mesh_data):
         for rotation in (0, 1, 2):  # Doesn't matter where the triangle starts. Try all 3 rotations.
             if list(vertices[face[0]]) == triangle[(0 + rotation) % 3] and list(vertices[face[1]]) == triangle[(1 + rotation) % 3] and list(vertices[face[2]]) == triangle[(2 + rotation) % 3]:
                 return True
-    return False  # Not found.
\ No newline at end of file
+    return False  # Not found.
+
+def test_readPolygons(tmp_path):
+    """
+    Tests reading a file with continued lines, comments, faces of several formats and polygons of more than three corners.
+    """
+    path = str(tmp_path / "polygons.obj")
+    with open(path, "w") as f:
+        f.write("# A pentagon and a triangle.\n"
+                "v 0 0 0\nv 10 0 0 # A comment.\nv 10 10 0\nv 5 15 0\nv 0 10 0\n"
+                "vt 0 0\nvt 1 1\nvn 0 0 1\n"
+                "f 1/1 2/2 3/1 \\\n 4/1 5/1\n"
+                "f -5//1 2 -3/-1/-1\n")
+    reader = OBJReader.OBJReader()
+
+    mesh = reader._read(path).getMeshData()
+
+    assert mesh.getFaceCount() == 3 + 1
+    assert isTriangleInMesh([[0, 0, 0], [10, 0, 0], [10, 0, -10]], mesh)
+    assert isTriangleInMesh([[0, 0, 0], [10, 0, -10], [5, 0, -15]], mesh)
+    assert isTriangleInMesh([[0, 0, 0], [5, 0, -15], [0, 0, -10]], mesh)
+    vertices = mesh.getVertices().tolist()
+    uvs = mesh.getUVCoordinatesAsByteArray()
+    assert uvs is not None
+    assert numpy.frombuffer(uvs, dtype = numpy.float32).reshape((-1, 2))[vertices.index([10, 0, 0])].tolist() == [1, 1]
+
+
+def test_readEmpty(tmp_path):
+    path = str(tmp_path / "empty.obj")
+    with open(path, "w") as f:
+        f.write("# Only vertices.\nv 0 0 0\nv 1 0 0\n")
+
+    assert OBJReader.OBJReader()._read(path) is None
+
+
+def test_readObjectsWithoutTextureOrNormals(tmp_path):
+    """
+    Tests that faces without texture coordinates or normals don't take those of objects further on in the file.
+    """
+    path = str(tmp_path / "objects.obj")
+    with open(path, "w") as f:
+        f.write("o a\nv 0 0 0\nv 0 1 0\nv 0 0 1\nf 1 2 3\n"
+                "o b\nv 5 0 0\nv 6 0 0\nv 6 1 0\nvt 0.25 0.75\nvt 0.5 0.5\nf 4/1 5/2 6/1\n"
+                "o c\nv 10 0 0\nv 11 0 0\nv 10 1 0\nvn 0 1 0\nf 7//1 8//1 9//1\n"
+                "o d\nv 20 0 0\nv 20 1 0\nv 20 0 1\nf 10//1 11 12\n")
+    reader = OBJReader.OBJReader()
+
+    mesh = reader._read(path).getMeshData()
+
+    assert mesh.getFaceCount() == 4
+    vertices = mesh.getVertices().tolist()
+    normals = mesh.getNormals()
+    uvs = numpy.frombuffer(mesh.getUVCoordinatesAsByteArray(), dtype = numpy.float32).reshape((-1, 2))
+    for vertex in ([0, 0, 0], [0, 0, -1], [0, 1, 0]):  # Object a: no texture coordinates, normals of its own.
+        assert uvs[vertices.index(vertex)].tolist() == [0, 0]
+        assert numpy.allclose(numpy.abs(normals[vertices.index(vertex)]), [1, 0, 0])
+    assert uvs[vertices.index([5, 0, 0])].tolist() == [0.25, 0.75]  # Object b.
+    assert uvs[vertices.index([6, 0, 0])].tolist() == [0.5, 0.5]
+    for vertex in ([10, 0, 0], [11, 0, 0], [10, 0, -1]):  # Object c: the normals of the file.
+        assert numpy.allclose(normals[vertices.index(vertex)], [0, 0, -1])
+    for vertex in ([20, 0, 0], [20, 0, -1], [20, 1, 0]):  # Object d: not all corners have a normal.
+        assert numpy.allclose(numpy.abs(normals[vertices.index(vertex)]), [1, 0, 0])
@@ -2,6 +2,11 @@
 # Copyright (c) 2013 David Braam
 # Uranium is released under the terms of the LGPLv3 or higher.
 
+import mmap
+import os
+import struct
+from typing import Optional
+
 import numpy
 
 from UM.Logger import Logger
@@ -15,6 +20,12 @@ import stl.mesh
 stl.stl.MAX_COUNT = 100000000
 
 class STLReader(MeshReader):
+    # A binary STL file is an 80 byte header, the number of faces and then a
+    # record of 50 bytes per face: its normal, its three vertices and an
+    # attribute that nothing uses.
+    _binary_header_size = 84
+    _binary_face = numpy.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -29,13 +40,23 @@ class STLReader(MeshReader):
 
     def load_file(self, file_name, mesh_builder):
         try:
-            self._loadWithNumpySTL(file_name, mesh_builder)
+            vertices = self._loadBinary(file_name)
+            if vertices is not None:
+                mesh_builder.setVertices(vertices)
+            else:
+                self._loadWithNumpySTL(file_name, mesh_builder)
         except:
             Logger.logException("e", "Reading stl file failed.")
 
         mesh_builder.calculateNormals(fast = True)
         mesh_builder.setFileName(file_name)
 
+    def canCacheMesh(self) -> bool:
+        return True
+
+    def canReadInProcess(self) -> bool:
+        return True
+
     def _read(self, file_name):
         """Decide if we need to use ascii or binary in order to read file"""
 
@@ -47,18 +68,8 @@ class STLReader(MeshReader):
         mesh = mesh_builder.build()
 
         verts = mesh.getVertices()
-        # In some cases numpy stl reads incorrectly and the result is that the Z values are all 0
-        # Add new error cases if you find them.
-        if numpy.amin(verts[:, 1]) == numpy.amax(verts[:, 1]):
-            # Something may have gone wrong in numpy stl, start over without numpy stl
-            Logger.log("w", "All Z coordinates are the same using numpystl, trying again without numpy stl.")
-            mesh_builder = MeshBuilder()
-            self.load_file(file_name, mesh_builder)
-            mesh = mesh_builder.build()
-            verts = mesh.getVertices()
-
-            if numpy.amin(verts[:, 1]) == numpy.amax(verts[:, 1]):
-                Logger.log("e", "All Z coordinates are still the same without numpy stl... let's hope for the best")
+        if len(verts) > 0 and numpy.amin(verts[:, 1]) == numpy.amax(verts[:, 1]):
+            Logger.log("w", "All Z coordinates of %s are the same, the model is flat.", file_name)
 
         if mesh_builder.getVertexCount() == 0:
             Logger.log("d", "File did not contain valid data, unable to read.")
@@ -72,6 +83,39 @@ class STLReader(MeshReader):
     def _swapColumns(self, array, frm, to):
         array[:, [frm, to]] = array[:, [to, frm]]
 
+    def _loadBinary(self, file_name: str) -> Optional[numpy.ndarray]:
+        """Reads the vertices of a binary STL file from the memory-mapped file.
+
+        The faces are mapped as records of _binary_face, and their vertices are
+        copied once, straight into our coordinate system (Y and Z swapped and Z
+        inverted). The array is made read-only, so that MeshData can take it
+        without copying it again.
+
+        :return: The vertices, three for every face, or None if the file is not
+        binary STL (its size does not match the number of faces in it).
+        """
+
+        with open(file_name, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size < self._binary_header_size:
+                return None
+            f.seek(self._binary_header_size - 4)
+            face_count = struct.unpack("<I", f.read(4))[0]
+            if file_size != self._binary_header_size + face_count * self._binary_face.itemsize:
+                return None
+
+            vertices = numpy.empty((face_count * 3, 3), dtype = numpy.float32)
+            if face_count > 0:
+                faces = vertices.reshape((face_count, 3, 3))
+                with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                    loaded = numpy.frombuffer(data, self._binary_face, face_count, self._binary_header_size)["vertices"]
+                    faces[:, :, 0] = loaded[:, :, 0]
+                    faces[:, :, 1] = loaded[:, :, 2]
+                    numpy.negative(loaded[:, :, 1], out = faces[:, :, 2])
+                    del loaded  # The memory map can't be closed while an array refers to it.
+        vertices.flags.writeable = False
+        return vertices
+
     def _loadWithNumpySTL(self, file_name, mesh_builder):
         for loaded_data in stl.mesh.Mesh.from_multi_file(file_name, mode=stl.stl.Mode.AUTOMATIC):
             vertices = numpy.resize(loaded_data.points.flatten(), (int(loaded_data.points.size / 3), 3))
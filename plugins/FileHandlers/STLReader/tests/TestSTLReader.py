@@ -0,0 +1,96 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os.path
+import struct
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy
+from unittest.mock import patch
+
+import STLReader
+from UM.Mesh.MeshBuilder import MeshBuilder
+
+# Two faces of a tetrahedron, in the coordinates of the STL file.
+faces = [
+    [[0, 0, 0], [10, 0, 0], [0, 20, 0]],
+    [[0, 0, 0], [0, 20, 0], [0, 0, 30]],
+]
+
+
+def _writeBinary(path, faces):
+    with open(path, "wb") as f:
+        f.write(b"\0" * 80)
+        f.write(struct.pack("<I", len(faces)))
+        for face in faces:
+            f.write(struct.pack("<12fH", 0, 0, 0, *[coordinate for vertex in face for coordinate in vertex], 0))
+
+
+def _writeAscii(path, faces):
+    with open(path, "w") as f:
+        f.write("solid test\n")
+        for face in faces:
+            f.write("facet normal 0 0 0\n  outer loop\n")
+            for vertex in face:
+                f.write("    vertex {0} {1} {2}\n".format(*vertex))
+            f.write("  endloop\nendfacet\n")
+        f.write("endsolid test\n")
+
+
+def _read(path):
+    reader = STLReader.STLReader()
+    with patch("UM.Application.Application.getInstance"):
+        return reader.read(path)
+
+
+def test_readBinary(tmp_path):
+    path = str(tmp_path / "binary.stl")
+    _writeBinary(path, faces)
+
+    mesh = _read(path).getMeshData()
+
+    # Y and Z are swapped, and Z is inverted.
+    assert mesh.getVertices().tolist() == [[x, z, -y] for face in faces for x, y, z in face]
+    assert mesh.hasNormals()
+    assert mesh.getVertices().dtype == numpy.float32
+
+
+def test_readBinaryWithoutCopies(tmp_path):
+    path = str(tmp_path / "binary.stl")
+    _writeBinary(path, faces)
+    reader = STLReader.STLReader()
+    builder = MeshBuilder()
+
+    reader.load_file(path, builder)
+    vertices = builder.getVertices()
+
+    assert not vertices.flags.writeable
+    assert numpy.shares_memory(builder.build().getVertices(), vertices)
+
+
+def test_readBinaryLikeNumpySTL(tmp_path):
+    path = str(tmp_path / "binary.stl")
+    _writeBinary(path, numpy.random.default_rng(0).uniform(-100, 100, (50, 3, 3)).tolist())
+    reader = STLReader.STLReader()
+    builder = MeshBuilder()
+
+    reader._loadWithNumpySTL(path, builder)
+
+    assert numpy.array_equal(reader._loadBinary(path), builder.getVertices())
+
+
+def test_readAscii(tmp_path):
+    path = str(tmp_path / "ascii.stl")
+    _writeAscii(path, faces)
+
+    assert STLReader.STLReader()._loadBinary(path) is None
+    mesh = _read(path).getMeshData()
+    assert mesh.getVertices().tolist() == [[x, z, -y] for face in faces for x, y, z in face]
+
+
+def test_readEmptyBinary(tmp_path):
+    path = str(tmp_path / "empty.stl")
+    _writeBinary(path, [])
+
+    assert STLReader.STLReader()._read(path) is None
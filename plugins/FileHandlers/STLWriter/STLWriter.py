@@ -5,6 +5,8 @@
 import struct
 import time
 
+import numpy
+
 from UM.Logger import Logger
 from UM.Mesh.MeshWriter import MeshWriter
 from UM.i18n import i18nCatalog
@@ -12,6 +14,16 @@ from UM.i18n import i18nCatalog
 catalog = i18nCatalog("uranium")
 
 class STLWriter(MeshWriter):
+    # The records of the faces in binary STL: the normal, the three vertices
+    # and an attribute that nothing uses.
+    _binary_face = numpy.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+
+    # A face in ASCII STL. The vertices are written with 9 significant digits,
+    # which is enough to read back the same 32-bit floats.
+    _ascii_facet = "facet normal 0.0 0.0 0.0\n  outer loop\n" + "    vertex %.9g %.9g %.9g\n" * 3 + "  endloop\nendfacet\n"
+    # The number of faces formatted at once.
+    _ascii_chunk_size = 65536
+
     def write(self, stream, nodes, mode = MeshWriter.OutputMode.TextMode):
         """Write the specified sequence of nodes to a stream in the STL format.
 
@@ -46,77 +58,56 @@ class STLWriter(MeshWriter):
 
         for node in nodes:
             mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
-            verts = mesh_data.getVertices()
-            if verts is None:
+            if mesh_data.getVertices() is None:
                 continue  # No mesh data, nothing to do.
 
-            if mesh_data.hasIndices():
-                for face in mesh_data.getIndices():
-                    stream.write("facet normal 0.0 0.0 0.0\n")
-                    stream.write("  outer loop\n")
-
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write("    vertex {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                    stream.write("  endloop\n")
-                    stream.write("endfacet\n")
-            else:
-                num_verts = mesh_data.getVertexCount()
-                for index in range(0, num_verts - 2, 3):
-                    stream.write("facet normal 0.0 0.0 0.0\n")
-                    stream.write("  outer loop\n")
-                    v1 = verts[index]
-                    v2 = verts[index + 1]
-                    v3 = verts[index + 2]
-                    stream.write("    vertex {0} {1} {2}\n".format(v1[0], -v1[2], v1[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v2[0], -v2[2], v2[1]))
-                    stream.write("    vertex {0} {1} {2}\n".format(v3[0], -v3[2], v3[1]))
-
-                    stream.write("  endloop\n")
-                    stream.write("endfacet\n")
+            face_count = self._faceCount(mesh_data)
+            for start in range(0, face_count, self._ascii_chunk_size):
+                end = min(start + self._ascii_chunk_size, face_count)
+                faces = numpy.empty((end - start, 3, 3), dtype = numpy.float32)
+                self._getFaces(mesh_data, start, end, faces)
+                stream.write((self._ascii_facet * (end - start)) % tuple(faces.ravel().tolist()))
 
         stream.write("endsolid {0}\n".format(name))
 
     def _writeBinary(self, stream, nodes):
         stream.write("Uranium STLWriter {0}".format(time.strftime("%a %d %b %Y %H:%M:%S")).encode().ljust(80, b"\000"))
 
-        face_count = 0
-        nodes = list(nodes)
-        for node in nodes:
-            if node.getMeshData().hasIndices():
-                face_count += node.getMeshData().getFaceCount()
-            else:
-                face_count += node.getMeshData().getVertexCount() / 3
-
-        stream.write(struct.pack("<I", int(face_count))) #Write number of faces to STL
-
-        for node in nodes:
-            mesh_data = node.getMeshData().getTransformed(node.getWorldTransformation())
+        meshes = [node.getMeshData().getTransformed(node.getWorldTransformation()) for node in nodes]
+        face_counts = [self._faceCount(mesh_data) for mesh_data in meshes]
+        stream.write(struct.pack("<I", sum(face_counts)))  # Write number of faces to STL
+
+        # The normals and attributes are left zero.
+        faces = numpy.zeros(sum(face_counts), dtype = self._binary_face)
+        start = 0
+        for mesh_data, face_count in zip(meshes, face_counts):
+            if face_count == 0:
+                continue
+            self._getFaces(mesh_data, 0, face_count, faces["vertices"][start:start + face_count])
+            start += face_count
+        stream.write(faces.tobytes())
+
+    @staticmethod
+    def _faceCount(mesh_data):
+        if mesh_data.getVertices() is None:
+            return 0
+        if mesh_data.hasIndices():
+            return mesh_data.getFaceCount()
+        return mesh_data.getVertexCount() // 3
+
+    @staticmethod
+    def _getFaces(mesh_data, start, end, out):
+        """Puts the vertices of a range of faces of a mesh in an array, in the
+        coordinate system of STL (Y and Z swapped and Y inverted).
+
+        :param out: An array of (end - start, 3, 3) to put them in.
+        """
 
-            if mesh_data.hasIndices():
-                verts = mesh_data.getVertices()
-                for face in mesh_data.getIndices():
-                    v1 = verts[face[0]]
-                    v2 = verts[face[1]]
-                    v3 = verts[face[2]]
-                    stream.write(struct.pack("<fff", 0.0, 0.0, 0.0))
-                    stream.write(struct.pack("<fff", v1[0], -v1[2], v1[1]))
-                    stream.write(struct.pack("<fff", v2[0], -v2[2], v2[1]))
-                    stream.write(struct.pack("<fff", v3[0], -v3[2], v3[1]))
-                    stream.write(struct.pack("<H", 0))
-            else:
-                num_verts = mesh_data.getVertexCount()
-                verts = mesh_data.getVertices()
-                for index in range(0, num_verts - 1, 3):
-                    v1 = verts[index]
-                    v2 = verts[index + 1]
-                    v3 = verts[index + 2]
-                    stream.write(struct.pack("<fff", 0.0, 0.0, 0.0))
-                    stream.write(struct.pack("<fff", v1[0], -v1[2], v1[1]))
-                    stream.write(struct.pack("<fff", v2[0], -v2[2], v2[1]))
-                    stream.write(struct.pack("<fff", v3[0], -v3[2], v3[1]))
-                    stream.write(struct.pack("<H", 0))
\ No newline at end of file
+        verts = mesh_data.getVertices()
+        if mesh_data.hasIndices():
+            faces = verts[mesh_data.getIndices()[start:end]]
+        else:
+            faces = verts[start * 3:end * 3].reshape((end - start, 3, 3))
+        out[:, :, 0] = faces[:, :, 0]
+        numpy.negative(faces[:, :, 2], out = out[:, :, 1])
+        out[:, :, 2] = faces[:, :, 1]
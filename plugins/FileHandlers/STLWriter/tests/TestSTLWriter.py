@@ -0,0 +1,85 @@
+import io
+import os.path
+import struct
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy
+import pytest
+
+import STLWriter
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshWriter import MeshWriter
+from UM.Scene.SceneNode import SceneNode
+
+vertices = numpy.array([[0, 0, 0], [10, 0, 0], [0, 20, 0], [0, 0, 30]], dtype = numpy.float32)
+indices = numpy.array([[0, 1, 2], [0, 2, 3], [1, 3, 2]], dtype = numpy.int32)
+
+
+def _createNodes():
+    indexed = MeshBuilder()
+    indexed.setVertices(vertices)
+    indexed.setIndices(indices)
+    unindexed = MeshBuilder()
+    unindexed.setVertices(vertices[indices].reshape((-1, 3)))
+
+    nodes = []
+    for builder, position in ((indexed, Vector(0, 0, 0)), (unindexed, Vector(5, 6, 7))):
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        node.setPosition(position)
+        node.setSelectable(True)
+        nodes.append(node)
+    return nodes
+
+
+def _expectedFaces():
+    faces = []
+    for offset in ((0, 0, 0), (5, 6, 7)):
+        for x, y, z in (vertices + offset)[indices].reshape((-1, 3)):
+            faces.append([x, -z, y])  # Y and Z are swapped, and Y inverted.
+    return numpy.array(faces, dtype = numpy.float32).reshape((-1, 3, 3))
+
+
+def test_writeBinary():
+    stream = io.BytesIO()
+
+    assert STLWriter.STLWriter().write(stream, _createNodes(), MeshWriter.OutputMode.BinaryMode)
+
+    data = stream.getvalue()
+    face_count = struct.unpack("<I", data[80:84])[0]
+    assert face_count == 6
+    assert len(data) == 84 + 50 * face_count
+    faces = numpy.frombuffer(data, STLWriter.STLWriter._binary_face, face_count, 84)
+    assert numpy.array_equal(faces["vertices"], _expectedFaces())
+    assert not faces["normal"].any() and not faces["attribute"].any()
+
+
+@pytest.mark.parametrize("chunk_size", [2, 65536])
+def test_writeAscii(chunk_size):
+    stream = io.StringIO()
+    writer = STLWriter.STLWriter()
+    writer._ascii_chunk_size = chunk_size
+
+    assert writer.write(stream, _createNodes(), MeshWriter.OutputMode.TextMode)
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("solid ") and lines[-1].startswith("endsolid ")
+    assert lines.count("facet normal 0.0 0.0 0.0") == lines.count("endfacet") == 6
+    written = [[float(coordinate) for coordinate in line.split()[1:]] for line in lines if line.startswith("    vertex ")]
+    assert numpy.array_equal(numpy.array(written, dtype = numpy.float32).reshape((-1, 3, 3)), _expectedFaces())
+
+
+def test_writeAsciiExactly():
+    builder = MeshBuilder()
+    builder.setVertices(numpy.random.default_rng(0).uniform(-100, 100, (300, 3)).astype(numpy.float32))
+    node = SceneNode()
+    node.setMeshData(builder.build())
+    node.setSelectable(True)
+    stream = io.StringIO()
+
+    STLWriter.STLWriter().write(stream, [node], MeshWriter.OutputMode.TextMode)
+
+    written = [[float(coordinate) for coordinate in line.split()[1:]] for line in stream.getvalue().splitlines() if line.startswith("    vertex ")]
+    assert numpy.array_equal(numpy.array(written, dtype = numpy.float32), builder.getVertices()[:, [0, 2, 1]] * [1, -1, 1])
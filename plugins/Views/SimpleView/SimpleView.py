@@ -25,7 +25,7 @@ class SimpleView(View):
         for node in DepthFirstIterator(scene.getRoot()):
             if not node.render(renderer):
                 if node.getMeshData() and node.isVisible():
-                    renderer.queueNode(node, shader = self._shader)
+                    renderer.queueNode(node, shader = self._shader, level_of_detail = True)
 
     def endRendering(self):
         pass
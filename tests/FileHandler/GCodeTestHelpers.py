@@ -0,0 +1,30 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import io
+import os
+from typing import Optional
+
+from UM.FileHandler.gcode import TransformGCode
+from UM.FileHandler.gcodecache import LayerCache
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+
+
+def readTestFile(name: str) -> str:
+    """The text of one of the G-code files next to the tests."""
+
+    with open(os.path.join(test_path, name)) as f:
+        return f.read()
+
+
+def transformText(source: str, cache_path: Optional[str] = None) -> str:
+    """Transforms G-code text with a new transform, with a layer cache at
+    cache_path if it is given."""
+
+    transform = TransformGCode()
+    if cache_path is not None:
+        transform.setLayerCache(LayerCache(cache_path))
+    output = io.StringIO()
+    transform.transform(io.StringIO(source), output)
+    return output.getvalue()
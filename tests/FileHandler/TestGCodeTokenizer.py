@@ -0,0 +1,43 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from UM.FileHandler.gcodetokenizer import tokenize, tokenizeLine
+
+tokenize_line_data = [
+    ("G1 X10.5 Y3 E0.2 ;outer wall\n", "G1", {"X": "10.5", "Y": "3", "E": "0.2"}, "G1 X10.5 Y3 E0.2", "outer wall"),
+    ("  G0 F7200 X1 Y2  \n", "G0", {"F": "7200", "X": "1", "Y": "2"}, "G0 F7200 X1 Y2", None),
+    ("G28 ;Home", "G28", {}, "G28", "Home"),
+    (";LAYER:3", "", {}, "", "LAYER:3"),
+    (";", "", {}, "", ""),
+    ("", "", {}, "", None),
+    ("G1  X1", "G1", {"X": "1"}, "G1  X1", None),
+]
+
+
+@pytest.mark.parametrize("line, command, words, code, comment", tokenize_line_data)
+def test_tokenizeLine(line, command, words, code, comment):
+    tokens = tokenizeLine(line)
+
+    assert tokens.command == command
+    assert tokens.words == words
+    assert tokens.code == code
+    assert tokens.comment == comment
+
+
+def test_tags():
+    tokens = tokenizeLine(";TYPE:WALL-INNER")
+    assert tokens.hasTag("TYPE:")
+    assert not tokens.hasTag("LAYER:")
+    assert tokens.getTagValue("TYPE:") == "WALL-INNER"
+
+    tokens = tokenizeLine(";Layer height: 0.2")
+    assert tokens.getTagValue("Layer height:") == "0.2"
+
+    assert not tokenizeLine("G1 X1").hasTag("TYPE:")
+    assert tokenizeLine("G1 X1 ;note;LAYER:4").getTagValue("LAYER:") == "4"
+
+
+def test_tokenize():
+    assert [tokens.command for tokens in tokenize(["G0 X1", ";comment", "M107"])] == ["G0", "", "M107"]
@@ -0,0 +1,125 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import math
+import os
+import pickle
+
+import numpy
+import pytest
+
+from UM.FileHandler.gcodetoolpath import MoveFollower, SliceType, Toolpath, parseToolpath
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_append():
+    toolpath = Toolpath()
+    toolpath.chunkSize = 3
+    for i in range(10):
+        toolpath.append(i, 2 * i, moveType = SliceType.FILL.value, layer = i // 5)
+
+    assert len(toolpath) == 10
+    assert toolpath.x.tolist() == list(range(10))
+    assert toolpath.y.tolist() == list(range(0, 20, 2))
+    assert math.isnan(toolpath.e[0]) and toolpath.lineOffset[0] == -1
+    assert toolpath.nbytes == 10 * 45
+    assert toolpath.getLayer(1).x.tolist() == [5, 6, 7, 8, 9]
+
+    toolpath.clear()
+    assert len(toolpath) == 0
+
+
+def test_pickle():
+    toolpath = Toolpath()
+    toolpath.append(1.5, 2.5, 0.2, 3.0, 1200, SliceType.SKIN.value, 4, 100)
+    toolpath.append(2.5, 3.5)
+
+    loaded = pickle.loads(pickle.dumps(toolpath))
+
+    assert loaded.moves.tobytes() == toolpath.moves.tobytes()
+
+
+def test_parseToolpath():
+    source = b";LAYER:0\n;TYPE:WALL-OUTER\nG0 F3000 X1 Y2 Z0.2\nG1 X3 E1\n;comment\n;TYPE:FILL\nG92 E0\nG91\nG1 X1 Y1 E0.5\nG28\n;LAYER:1\n;TYPE:SUPPORT\nG1 X0 Y0\n"
+
+    toolpath = parseToolpath(source)
+
+    assert toolpath.x.tolist() == [1, 3, 4, 4]
+    assert toolpath.y.tolist() == [2, 2, 3, 3]
+    assert toolpath.z.tolist() == numpy.float32([0.2, 0.2, 0.2, 0.2]).tolist()
+    assert toolpath.e.tolist() == [0, 1, 1.5, 1.5]
+    assert toolpath.feedrate.tolist() == [3000] * 4
+    assert toolpath.moveType.tolist() == [SliceType.OUTER.value, SliceType.OUTER.value, SliceType.FILL.value, SliceType.NONE.value]
+    assert toolpath.layer.tolist() == [0, 0, 0, 1]
+    assert toolpath.lineOffset.tolist() == [source.index(b"G0 F3000"), source.index(b"G1 X3"), source.index(b"G1 X1"), source.index(b"G1 X0")]
+
+
+def test_parseToolpathFile():
+    with open(os.path.join(test_path, "layers.gcode"), "rb") as f:
+        source = f.read()
+
+    toolpath = parseToolpath(source)
+
+    moves = [line for line in source.splitlines() if line.startswith((b"G0 ", b"G1 "))]
+    assert len(toolpath) == len(moves)
+    assert set(toolpath.layer.tolist()) == set(range(-1, toolpath.layer.max() + 1))  # -1 for the moves before the first layer.
+
+
+def test_parseToolpathWithWordsThatAreNotNumbers():
+    toolpath = parseToolpath(b"G1 X1 Y2 E1\nG1 X3 Y4 E1.2.3\n")
+
+    assert toolpath.x.tolist() == [1, 3]
+    assert toolpath.e.tolist() == [1, 1]
+
+
+commands = [
+    ("G1", {"X": "10", "Y": "10", "Z": "0.2", "F": "1200", "E": "3"}),
+    ("G1", {"X": "12", "E": "4"}),
+    ("G92", {"E": "0"}),
+    ("G1", {"Y": "12", "E": "0.5"}),
+    ("G1", {"Z": "0.4"}),
+    ("M83", {}),
+    ("G1", {"X": "14", "E": "0.5", "F": "600"}),
+    ("G91", {}),
+    ("G1", {"X": "1", "Y": "-1", "E": "0.2"}),
+    ("G90", {}),
+    ("G1", {"X": "3", "Y": "4", "E": "6"}),
+    ("G1", {"X": "5", "E": "7"})
+]
+
+
+def _follow(follower, commands):
+    for command, words in commands:
+        if command == "G1":
+            follower.move(words, SliceType.FILL.value, 4)
+        else:
+            follower.command(command, words)
+
+
+@pytest.mark.parametrize("split", range(len(commands)))
+def test_moveFollowerStartingWithin(split):
+    whole = MoveFollower(Toolpath())
+    _follow(whole, commands)
+    before = MoveFollower(Toolpath())
+    _follow(before, commands[:split])
+    within = MoveFollower(Toolpath(), known = False, relative = before.relative, relativeE = before.relativeE)
+    _follow(within, commands[split:])
+
+    moves = within.toolpath.moves
+    within.locate(moves, before)
+    expected = whole.toolpath.moves[len(before.toolpath):]
+    for column in ("x", "y", "z", "e", "feedrate"):
+        assert moves[column].tolist() == pytest.approx(expected[column].tolist())
+    before.continueFrom(within)
+    assert (before.x, before.y, before.z, before.e, before.eOffset, before.feedrate) == pytest.approx((whole.x, whole.y, whole.z, whole.e, whole.eOffset, whole.feedrate))
+    assert (before.relative, before.relativeE) == (whole.relative, whole.relativeE)
+
+
+def test_moveFollowerState():
+    follower = MoveFollower(Toolpath(), known = False)
+    _follow(follower, commands[3:6])
+    restored = MoveFollower(Toolpath())
+    restored.setState(follower.getState())
+
+    assert restored.getState() == follower.getState()
@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import io
+import json
+import os
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from UM.FileHandler.gcode import TransformGCode
+from UM.FileHandler.gcodecache import LayerCache
+from UM.FileHandler.gcodestatistics import analyzeToolpath
+from UM.FileHandler.gcodetoolpath import parseToolpath
+
+from .GCodeTestHelpers import readTestFile, transformText
+
+
+def test_transformWithCache(tmp_path):
+    cache_path = str(tmp_path / "layers.cache")
+    expected = readTestFile("layers_transformed.gcode")
+
+    assert transformText(readTestFile("layers.gcode"), cache_path) == expected
+    with patch("UM.FileHandler.gcode._transformLayerRangeLines") as transform_layer:
+        assert transformText(readTestFile("layers.gcode"), cache_path) == expected
+    transform_layer.assert_not_called()  # Every cached layer came from the cache.
+
+
+def test_analyzeToolpathWithCache(tmp_path):
+    cache_path = str(tmp_path / "layers.cache")
+    source = readTestFile("layers.gcode")
+    expected = analyzeToolpath(parseToolpath(source.encode()))
+
+    for cached in (False, True):
+        transform = TransformGCode()
+        transform.setLayerCache(LayerCache(cache_path))
+        transform.setAnalyzeToolpath(True)
+        transform.transform(io.StringIO(source), io.StringIO())
+        assert any(layer.cached for layer in transform.getMetrics()) == cached
+
+        # Cached layers bring the statistics of their moves along.
+        statistics = transform.getToolpathStatistics()
+        for name in ("travelDistance", "extrusionLength", "filament", "seconds", "layerSeconds"):
+            assert getattr(statistics, name) == pytest.approx(getattr(expected, name)), name
+        assert statistics.turnHistogram == expected.turnHistogram
+
+
+def test_transformWithCacheAfterChange(tmp_path):
+    cache_path = str(tmp_path / "layers.cache")
+    source = readTestFile("layers.gcode")
+    transformText(source, cache_path)
+
+    # An extra move shifts the line numbers of all layers after it.
+    move = source.index("G1 X", source.index(";LAYER:5\n"))
+    changed = source[:move] + "G1 X1.5 Y2.5 E0.1\n" + source[move:]
+
+    assert transformText(changed, cache_path) == transformText(changed)
+
+
+def test_transformWithUnreadableCache(tmp_path):
+    cache_path = tmp_path / "layers.cache"
+    cache_path.write_bytes(b"not a cache")
+
+    assert transformText(readTestFile("layers.gcode"), str(cache_path)) == transformText(readTestFile("layers.gcode"))
+
+
+def test_transformWithDamagedRecords(tmp_path):
+    cache_path = str(tmp_path / "layers.cache")
+    transformText(readTestFile("layers.gcode"), cache_path)
+    # A cache of which the records were overwritten, but not the index.
+    with open(cache_path, "r+b") as f:
+        f.seek(-8, os.SEEK_END)
+        index_offset = struct.unpack("<Q", f.read(8))[0]
+        f.seek(index_offset)
+        index = json.loads(f.read()[:-8])
+        for offset, length in index.values():
+            f.seek(offset)
+            f.write(b"x" * length)
+
+    assert transformText(readTestFile("layers.gcode"), cache_path) == transformText(readTestFile("layers.gcode"))
+
+
+def test_transformFailureKeepsCache(tmp_path):
+    cache_path = str(tmp_path / "layers.cache")
+    transformText(readTestFile("layers.gcode"), cache_path)
+    with open(cache_path, "rb") as f:
+        cached = f.read()
+
+    def failingSource():
+        yield from readTestFile("layers.gcode").splitlines(True)[:200]
+        raise OSError("The disk was removed")
+
+    transform = TransformGCode()
+    transform.setLayerCache(LayerCache(cache_path))
+    with pytest.raises(OSError):
+        transform.transform(failingSource(), io.StringIO())
+
+    assert os.listdir(str(tmp_path)) == ["layers.cache"]
+    with open(cache_path, "rb") as f:
+        assert f.read() == cached
+
+
+def test_abort(tmp_path):
+    cache_path = str(tmp_path / "layers.cache")
+    cache = LayerCache(cache_path)
+    cache.begin()
+    cache.put("key", b"record")
+    cache.abort()
+
+    assert os.listdir(str(tmp_path)) == []
+    cache.abort()  # Does nothing the second time.
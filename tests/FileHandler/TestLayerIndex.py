@@ -0,0 +1,92 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from UM.FileHandler.gcode import TransformGCode
+from UM.FileHandler.gcodeindex import LayerIndex, LineOffsets, findLineStarts
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+
+
+def _transformWithIndex(tmp_path, processes = 1):
+    source = str(tmp_path / "layers.gcode")
+    shutil.copy(os.path.join(test_path, "layers.gcode"), source)
+    transform = TransformGCode()
+    transform.layerRangeSize = 1
+    transform.setLayerIndexFile(str(tmp_path / "layers.index"))
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"):
+        transform.updateGcode(source, str(tmp_path / "layers_transformed.gcode"), processes)
+    return transform, source, str(tmp_path / "layers_transformed.gcode")
+
+
+def test_layerIndex(tmp_path):
+    transform, source, output = _transformWithIndex(tmp_path)
+
+    index = LayerIndex.load(str(tmp_path / "layers.index"))
+    with open(source, "rb") as f:
+        source_lines = f.read().splitlines(True)
+    with open(output, "rb") as f:
+        output_lines = f.read().splitlines(True)
+    assert [entry.layer for entry in index.entries] == list(range(12))
+    for entry, metrics in zip(index.entries, transform.getMetrics()[1:]):
+        assert index.readSource(source, entry.layer) == b"".join(source_lines[entry.sourceFirstLine:entry.sourceFirstLine + entry.sourceLineCount])
+        assert index.readOutput(output, entry.layer) == b"".join(output_lines[entry.outputFirstLine:entry.outputFirstLine + entry.outputLineCount])
+        assert (entry.sourceLineCount, entry.outputLineCount) == (metrics.linesIn, metrics.linesOut)
+    assert index.entries[-1].sourceEnd == os.path.getsize(source)
+    assert index.entries[-1].outputEnd == os.path.getsize(output)
+
+
+def test_layerIndexOfLayerRanges(tmp_path):
+    _transformWithIndex(tmp_path)
+    with open(str(tmp_path / "layers.index"), "rb") as f:
+        serial = f.read()
+
+    _transformWithIndex(tmp_path, processes = 2)
+
+    with open(str(tmp_path / "layers.index"), "rb") as f:
+        assert f.read() == serial
+
+
+def test_transformLayer(tmp_path):
+    transform, source, _ = _transformWithIndex(tmp_path)
+    index = LayerIndex.load(str(tmp_path / "layers.index"))
+
+    layer = TransformGCode().transformLayer(source, index, 7)
+
+    assert [entry["layer"] for entry in layer.preview] == [7]
+    assert layer.getMetrics()[0].moves == transform.getMetrics()[8].moves
+
+
+def test_layerIndexOfChangedFile(tmp_path):
+    _, source, _ = _transformWithIndex(tmp_path)
+    index = LayerIndex.load(str(tmp_path / "layers.index"))
+    with open(source, "a") as f:
+        f.write("G1 X1 Y1\n")
+
+    with pytest.raises(ValueError):
+        index.readSource(source, 3)
+
+
+def test_findLineStarts():
+    data = b"a\nbb\n\nccc\r\nd"
+
+    assert findLineStarts(data, [0, 1, 2, 3, 4, 5], chunkSize = 3) == [0, 2, 5, 6, 11, 12]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_lineOffsets(newline):
+    pieces = ["a\nbé", "\n\nccc\n", "d"]
+    offsets = LineOffsets("utf-8", newline)
+    offsets.add(pieces[0], [(0, 0), (1, 2)])
+    offsets.add(pieces[1], [(3, 2), (4, 6)])  # Line 4 starts at the end of the text.
+    offsets.add(pieces[2])
+
+    data = "".join(pieces).replace("\n", newline).encode("utf-8")
+    assert offsets.starts == dict(zip([0, 1, 3, 4], findLineStarts(data, [0, 1, 3, 4])))
+    assert offsets.size == len(data)
+    assert offsets.lines == 4
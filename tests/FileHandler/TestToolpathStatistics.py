@@ -0,0 +1,65 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from UM.FileHandler.gcodestatistics import ToolpathAnalyzer, ToolpathStatistics, analyzeToolpath
+from UM.FileHandler.gcodetoolpath import SliceType, parseToolpath
+
+source = b"""G0 F6000 X0 Y0 Z0.2
+;LAYER:0
+;TYPE:WALL-OUTER
+G1 F1200 X10 Y0 E1
+G1 X10 Y10 E2
+G1 X0 Y10 E3
+G1 E2
+;TYPE:FILL
+G0 F6000 X0 Y0
+G1 F1200 X10 Y10 E4
+;LAYER:1
+G0 X10 Y10 Z0.4
+"""
+
+
+def test_analyzeToolpath():
+    statistics = analyzeToolpath(parseToolpath(source))
+
+    assert statistics.extrusionLength[SliceType.OUTER] == pytest.approx(30)
+    assert statistics.travelDistance[SliceType.OUTER] == 0
+    assert statistics.filament[SliceType.OUTER] == pytest.approx(3)
+    assert statistics.travelDistance[SliceType.FILL] == pytest.approx(10 + 0.2)
+    assert statistics.extrusionLength[SliceType.FILL] == pytest.approx(200 ** 0.5)
+    assert statistics.filament[SliceType.FILL] == pytest.approx(2)
+    # 30 mm and 1 mm of retraction at 20 mm/s, 10 mm at 100 mm/s and the diagonal at 20 mm/s.
+    assert statistics.seconds[SliceType.OUTER] == pytest.approx(31 / 20)
+    assert statistics.seconds[SliceType.FILL] == pytest.approx(10 / 100 + 200 ** 0.5 / 20 + 0.2 / 20)
+    assert statistics.layerSeconds[0] == pytest.approx(31 / 20 + 10 / 100 + 200 ** 0.5 / 20)
+    assert statistics.totalSeconds == pytest.approx(sum(statistics.layerSeconds.values()))
+
+    # Two turns of 90 degrees in the wall, then 90 degrees back to X0 Y0 and 135 degrees towards X10 Y10.
+    assert statistics.turnHistogram[SliceType.OUTER] == [0] * 9 + [2] + [0] * 8
+    assert statistics.turnHistogram[SliceType.FILL] == [0] * 9 + [1] + [0] * 3 + [1] + [0] * 4
+
+
+def test_analyzeEmptyToolpath():
+    statistics = analyzeToolpath(parseToolpath(b";LAYER:0\n"))
+
+    assert statistics.totalSeconds == 0
+    assert statistics.turnHistogram == {}
+
+
+@pytest.mark.parametrize("split", [1, 2, 4, 6])
+def test_analyzeInParts(split):
+    toolpath = parseToolpath(source)
+    whole = analyzeToolpath(toolpath)
+    analyzer = ToolpathAnalyzer()
+    analyzer.add(toolpath.moves[:split])
+    analyzer.add(toolpath.moves[split:split])
+    part = ToolpathAnalyzer(analyzer.lastMove, analyzer.lastHeading)
+    part.add(toolpath.moves[split:])
+    analyzer.statistics.add(ToolpathStatistics.fromDict(part.statistics.toDict()))
+
+    statistics = analyzer.statistics
+    for name in ("travelDistance", "extrusionLength", "filament", "seconds", "layerSeconds"):
+        assert getattr(statistics, name) == pytest.approx(getattr(whole, name))
+    assert statistics.turnHistogram == whole.turnHistogram
@@ -0,0 +1,251 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import io
+import json
+import os
+
+import numpy
+import pytest
+
+from UM.FileHandler.gcode import TransformGCode, TransformGCodeStream
+from UM.FileHandler.gcodestatistics import analyzeToolpath
+from UM.FileHandler.gcodetoolpath import parseToolpath
+
+from .GCodeTestHelpers import readTestFile, test_path, transformText
+
+
+def test_transformMatchesReference():
+    source = readTestFile("layers.gcode")
+    expected = readTestFile("layers_transformed.gcode")
+
+    assert transformText(source) == expected
+
+
+def test_transformStreamsFromFile():
+    output = io.StringIO()
+    with open(os.path.join(test_path, "layers.gcode")) as f:
+        TransformGCode().transform(f, output)
+    with open(os.path.join(test_path, "layers_transformed.gcode")) as f:
+        assert output.getvalue() == f.read()
+
+
+def test_transformIsRepeatable():
+    source = readTestFile("layers.gcode")
+
+    # Running a second transform must not pick up the last point of the first one.
+    assert transformText(source) == transformText(source)
+
+
+def test_transformPendingLinesAtEnd():
+    source = ";TYPE:FILL\nG1 X1 Y1 E1\nG1 X2 Y3 E2\n;TYPE:WALL-INNER\nG1 F100 E1\nG1 Z5\n"
+    expected = "N2 G1 X1 Y1 A1\nN4 C63.43495\nN1 M2\nN3 G1 X2 Y3 A2\nN6 G1 F100 A1\nN5 M3\nN6 G1\n"
+
+    assert transformText(source) == expected
+
+
+def test_processLine():
+    output = io.StringIO()
+    transform = TransformGCode()
+    transform.begin(output)
+    for line in ["G28 ;Home", "G1 X0 Y0", "G1 X0 Y10 E1"]:
+        transform.processLine(line)
+    transform.end()
+
+    assert output.getvalue() == "N1 G28\nN2 G1 X0 Y0\nN4 C90.00000\nN3 G1 X0 Y10 A1\n"
+
+
+def test_transformGCodeStream():
+    source = readTestFile("layers.gcode")
+    expected = readTestFile("layers_transformed.gcode")
+
+    written = io.StringIO()
+    transformed = io.StringIO()
+    stream = TransformGCodeStream(written, TransformGCode(), transformed)
+    for start in range(0, len(source), 1000):
+        stream.write(source[start:start + 1000])
+    stream.finish()
+
+    assert written.getvalue() == source
+    assert transformed.getvalue() == expected
+
+
+def test_calculateTurns():
+    x = numpy.array([0.0, 10.0, 10.0, 0.0, 5.0])
+    y = numpy.array([0.0, 10.0, 20.0, 20.0, 10.0])
+
+    assert TransformGCode.calculateTurns(x, y) == ["45.00000", "90.00000", "-0.00000", "243.43495"]
+
+
+def test_calculateTurnsMatchesCalculateTurn():
+    transform = TransformGCode()
+    x = numpy.random.default_rng(1).uniform(-100, 100, 1000).round(3)
+    y = numpy.random.default_rng(2).uniform(-100, 100, 1000).round(3)
+    expected = []
+    for index in range(1, len(x)):
+        transform.store = [[x[index - 1], y[index - 1]], [x[index], y[index]]]
+        angle = transform.calculateTurn()
+        expected.append(format(180 - angle if angle < 0 else angle, ".5f"))
+
+    assert TransformGCode.calculateTurns(x, y) == expected
+
+
+def test_transformFileInLayerRanges():
+    transform = TransformGCode()
+    transform.layerRangeSize = 1  # Every layer that can be transformed separately is.
+    output = io.StringIO()
+    transform.transformFile(os.path.join(test_path, "layers.gcode"), output, processes = 2)
+
+    with open(os.path.join(test_path, "layers_transformed.gcode")) as f:
+        assert output.getvalue() == f.read()
+
+
+def test_transformFileInLayerRangesWithPendingLines(tmp_path):
+    # Layers without moves leave their lines and markers pending for the next range.
+    layers = [";Layer height: 0.3", ";secondary_z_axis: 1", "G28 ;Home"]
+    for layer in range(12):
+        layers.append(";LAYER:" + str(layer))
+        if layer % 4 == 1:
+            layers.extend([";TYPE:FILL", "G1 F1500 E" + str(layer)])
+        elif layer % 4 == 2:
+            layers.append(";TYPE:WALL-OUTER")
+        else:
+            layers.extend([";TYPE:SKIN", "G1 X{0} Y{1} E1".format(layer, layer % 3), "G1 X{0} Y2 E2".format(layer + 1)])
+    source = "\n".join(layers) + "\n"
+    path = tmp_path / "pending.gcode"
+    path.write_text(source)
+
+    transform = TransformGCode()
+    transform.layerRangeSize = 1
+    output = io.StringIO()
+    transform.transformFile(str(path), output, processes = 2)
+    serial = TransformGCode()
+    serial_output = io.StringIO()
+    serial.transformFile(str(path), serial_output)
+
+    assert output.getvalue() == serial_output.getvalue()
+    counts = lambda metrics: [(layer.layer, layer.linesIn, layer.linesOut, layer.moves, layer.cLines, layer.m1Lines, layer.m2Lines, layer.m3Lines) for layer in metrics]
+    assert counts(transform.getMetrics()) == counts(serial.getMetrics())
+
+
+def test_keepToolpath():
+    with open(os.path.join(test_path, "layers.gcode"), "rb") as f:
+        source = f.read()
+    transform = TransformGCode()
+    transform.setKeepToolpath(True)
+    output = io.StringIO()
+    transform.transform(io.StringIO(source.decode()), output)
+
+    # The same moves as a parse of the file finds, including those that only extrude and the relative ones at the end.
+    moves = transform.getToolpath().moves
+    expected = parseToolpath(source).moves
+    for column in ("x", "y", "z", "e", "feedrate", "moveType", "layer"):
+        assert numpy.array_equal(moves[column], expected[column], equal_nan = True), column
+    assert output.getvalue() == transformText(source.decode())
+
+
+def test_keepToolpathInLayerRanges():
+    transform = TransformGCode()
+    transform.setKeepToolpath(True)
+    transform.layerRangeSize = 1
+    transform.transformFile(os.path.join(test_path, "layers.gcode"), io.StringIO(), processes = 2)
+
+    # The moves of all layers are followed in order, instead of in ranges.
+    assert set(transform.getToolpath().layer.tolist()) == set(range(-1, 12))
+    assert not numpy.isnan(transform.getToolpath().e).any()
+
+
+def test_analyzeToolpathInLayerRanges():
+    with open(os.path.join(test_path, "layers.gcode"), "rb") as f:
+        source = f.read()
+    transform = TransformGCode()
+    transform.setAnalyzeToolpath(True)
+    transform.layerRangeSize = 1
+    output = io.StringIO()
+    transform.transformFile(os.path.join(test_path, "layers.gcode"), output, processes = 2)
+
+    statistics = transform.getToolpathStatistics()
+    expected = analyzeToolpath(parseToolpath(source))
+    for name in ("travelDistance", "extrusionLength", "filament", "seconds", "layerSeconds"):
+        assert getattr(statistics, name) == pytest.approx(getattr(expected, name)), name
+    assert statistics.turnHistogram == expected.turnHistogram
+    # Only the moves of the last layers are held.
+    assert len(transform.getToolpath()) < len(parseToolpath(source))
+    assert output.getvalue() == transformText(source.decode())
+
+
+def test_transformFile():
+    output = io.StringIO()
+    TransformGCode().transformFile(os.path.join(test_path, "layers.gcode"), output)
+
+    with open(os.path.join(test_path, "layers_transformed.gcode")) as f:
+        assert output.getvalue() == f.read()
+
+
+def test_transformFileDoesNotDecodeSkippedLines(tmp_path):
+    path = tmp_path / "latin1.gcode"
+    path.write_bytes(";Generated for caf\xe9 \xab\xbb\nG28 ;Home\nM117 Caf\xe9\nG1 X0 Y0\nG1 X0 Y10 E1\n".encode("latin-1"))
+    output = io.StringIO()
+    TransformGCode().transformFile(str(path), output)
+
+    assert output.getvalue() == transformText("G28 ;Home\nG1 X0 Y0\nG1 X0 Y10 E1\n")
+
+
+def test_transformFileWithOtherLineEnds(tmp_path):
+    source = readTestFile("layers.gcode")
+    for line_end in ["\r\n", "\r"]:
+        path = tmp_path / "line_ends.gcode"
+        path.write_bytes(source.replace("\n", line_end).encode())
+        output = io.StringIO()
+        TransformGCode().transformFile(str(path), output)
+
+        assert output.getvalue() == transformText(source)
+
+
+def test_preview():
+    transform = TransformGCode()
+    transform.transform(io.StringIO(";LAYER:0\n;TYPE:SKIN\nG1 X1 Y2\nG1 X3 Y4\nG1 X5.5 Y6\n;TYPE:WALL-INNER\nG0 X7 Y8\nG1 X9 Y9\n"), io.StringIO())
+
+    assert transform.preview == [{"layer": 0, "paths": [{"type": "SKIN", "x": [1.0, 3.0, 5.5], "y": [2.0, 4.0, 6.0]},
+                                                        {"type": "INNER", "x": [7.0, 9.0], "y": [8.0, 9.0]}]}]
+    assert json.loads(transform.getPreviewJSON()) == transform.preview
+    assert " " not in transform.getPreviewJSON()
+    assert transform.getPreviewJSON() in transform.getPreviewHTML()
+
+
+def test_previewLayers():
+    transform = TransformGCode()
+    with open(os.path.join(test_path, "layers.gcode")) as f:
+        transform.transform(f, io.StringIO())
+
+    # Only the first three layers and the last one are previewed.
+    assert [layer["layer"] for layer in transform.preview] == [0, 1, 2, 11]
+
+
+def test_previewPointStep():
+    source = ";LAYER:0\n;TYPE:FILL\n" + "".join("G1 X{0} Y{0}\n".format(index) for index in range(10)) + ";TYPE:SKIN\nG1 X0 Y0\n"
+    transform = TransformGCode()
+    transform.previewPointStep = {TransformGCode.SliceType.FILL: 4}
+    transform.transform(io.StringIO(source), io.StringIO())
+
+    assert transform.preview[0]["paths"][0]["x"] == [0.0, 4.0, 8.0]
+
+
+def test_previewPointStepPerInstance():
+    transform = TransformGCode()
+    transform.previewPointStep[TransformGCode.SliceType.FILL] = 4
+
+    assert TransformGCode().previewPointStep == {}
+
+
+def test_metrics():
+    transform = TransformGCode()
+    output = io.StringIO()
+    transform.transform(io.StringIO(";LAYER:0\n;TYPE:FILL\nG1 X1 Y1 E1\nG1 X2 Y3 E2\n;TYPE:WALL-INNER\nG1 F100 E1\n;LAYER:1\nG1 X3 Y3\n"), output)
+
+    before, layer0, layer1 = transform.getMetrics()
+    assert (before.layer, before.linesIn, before.linesOut) == (None, 0, 0)
+    assert (layer0.layer, layer0.linesIn, layer0.linesOut, layer0.moves, layer0.cLines) == (0, 6, 3, 2, 1)
+    assert (layer1.layer, layer1.linesIn, layer1.linesOut, layer1.moves, layer1.cLines) == (1, 2, 5, 1, 1)
+    assert (layer0.m2Lines, layer1.m1Lines, layer1.m3Lines) == (1, 0, 1)
+    assert sum(layer.linesOut for layer in transform.getMetrics()) == output.getvalue().count("\n")
@@ -0,0 +1,40 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from UM.FileHandler import transform
+
+source = ";LAYER:0\nG28 ;Home\nM104 S200\nG1 X1 Y2 E0.5\n\nG1 X3 Y4 E1\n"
+expected = "N1 G28\nN2 M104\nN3 G1 X1 Y2 Z0.5\nN4 G1 X3 Y4 Z1\n"
+
+
+def test_transformFile(tmp_path):
+    (tmp_path / "part.gcode").write_text(source)
+
+    assert transform.transformFile(str(tmp_path / "part.gcode"), str(tmp_path / "out.gcode")) == 4
+    assert (tmp_path / "out.gcode").read_text() == expected
+
+
+def test_transformBatchSkipsUnchangedFiles(tmp_path):
+    (tmp_path / "archive" / "left").mkdir(parents = True)
+    (tmp_path / "archive" / "left" / "part.gcode").write_text(source)
+    (tmp_path / "archive" / "right.gcode").write_text(source)
+    destination = str(tmp_path / "transformed")
+    reports = []
+
+    assert transform.transformBatch(str(tmp_path / "archive"), destination, processes = 1, report = reports.append) == (2, 0)
+    assert (tmp_path / "transformed" / "left" / "part.gcode").read_text() == expected
+    assert (tmp_path / "transformed" / "right.gcode").read_text() == expected
+    assert all("lines/s" in report for report in reports)
+
+    (tmp_path / "archive" / "right.gcode").write_text(source + "G1 X5 Y6\n")
+    assert transform.transformBatch(str(tmp_path / "archive"), destination, processes = 1, report = reports.append) == (1, 1)
+    assert (tmp_path / "transformed" / "right.gcode").read_text() == expected + "N5 G1 X5 Y6\n"
+
+
+def test_transformBatchGlob(tmp_path):
+    for name in ["a.gcode", "b.gcode", "c.txt"]:
+        (tmp_path / name).write_text(source)
+    destination = tmp_path / "transformed"
+
+    assert transform.transformBatch(str(tmp_path / "*.gcode"), str(destination), processes = 1, report = lambda text: None) == (2, 0)
+    assert sorted(path.name for path in destination.iterdir()) == [transform.hashesFileName, "a.gcode", "b.gcode"]
@@ -0,0 +1,141 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import io
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.FileHandler.FileWriter import FileWriter
+from UM.FileHandler.WriteFileJob import WriteFileJob
+from UM.FileHandler.gcode import TransformGCode
+from UM.FileHandler.gcodeindex import LayerIndex
+from UM.FileHandler.gcodestatistics import analyzeToolpath
+from UM.FileHandler.gcodetoolpath import parseToolpath
+
+from .GCodeTestHelpers import readTestFile
+
+
+class ChunkedGCodeWriter(FileWriter):
+    """Writes the test G-code in small pieces that do not line up with the lines."""
+
+    def write(self, stream, data, mode = FileWriter.OutputMode.TextMode):
+        for start in range(0, len(data), 37):
+            stream.write(data[start:start + 37])
+        return True
+
+
+def test_getTransformedFileName():
+    job = WriteFileJob(MagicMock(), io.StringIO(), None, FileWriter.OutputMode.TextMode)
+    job.setFileName(os.path.join("some", "folder", "part.gcode"))
+
+    assert job.getTransformedFileName() == os.path.join("some", "folder", "part_transformed.gcode")
+
+
+def test_runTransformsWhileWriting(tmp_path):
+    source = readTestFile("layers.gcode")
+    expected = readTestFile("layers_transformed.gcode")
+
+    stream = io.StringIO()
+    job = WriteFileJob(ChunkedGCodeWriter(), stream, source, FileWriter.OutputMode.TextMode)
+    job.setFileName(str(tmp_path / "layers.gcode"))
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach") as open_in_coach:
+        job.run()
+
+    assert job.getResult()
+    assert stream.getvalue() == source
+    with open(job.getTransformedFileName()) as f:
+        assert f.read() == expected
+    open_in_coach.assert_called_once_with(job.getTransformedFileName())
+
+
+def test_runReusesLayerCache(tmp_path):
+    source = readTestFile("layers.gcode")
+    expected = readTestFile("layers_transformed.gcode")
+
+    for _ in range(2):
+        job = WriteFileJob(ChunkedGCodeWriter(), io.StringIO(), source, FileWriter.OutputMode.TextMode)
+        job.setFileName(str(tmp_path / "layers.gcode"))
+        job.setUseLayerCache(True)
+        with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"):
+            job.run()
+
+        assert os.path.exists(job.getLayerCacheFileName())
+        with open(job.getTransformedFileName()) as f:
+            assert f.read() == expected
+
+
+def test_runWithoutLayerCache(tmp_path):
+    source = readTestFile("layers.gcode")
+
+    job = WriteFileJob(ChunkedGCodeWriter(), io.StringIO(), source, FileWriter.OutputMode.TextMode)
+    job.setFileName(str(tmp_path / "layers.gcode"))
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"):
+        job.run()
+
+    assert not job.getUseLayerCache()
+    assert not os.path.exists(job.getLayerCacheFileName())
+
+
+def test_runKeepsTransformMetrics(tmp_path):
+    source = readTestFile("layers.gcode")
+
+    job = WriteFileJob(ChunkedGCodeWriter(), io.StringIO(), source, FileWriter.OutputMode.TextMode)
+    job.setFileName(str(tmp_path / "layers.gcode"))
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"):
+        job.run()
+
+    metrics = job.getTransformMetrics()
+    assert [layer.layer for layer in metrics] == [None] + list(range(12))
+    assert sum(layer.linesIn for layer in metrics) == source.count("\n")
+    with open(job.getTransformedFileName()) as f:
+        assert sum(layer.linesOut for layer in metrics) == f.read().count("\n")
+
+
+@pytest.mark.parametrize("use_layer_cache", [False, True])
+def test_runWritesLayerIndex(tmp_path, use_layer_cache):
+    source = readTestFile("layers.gcode")
+
+    # The second time, layers come from the layer cache.
+    for _ in range(2 if use_layer_cache else 1):
+        with open(str(tmp_path / "layers.gcode"), "w") as stream:
+            job = WriteFileJob(ChunkedGCodeWriter(), stream, source, FileWriter.OutputMode.TextMode)
+            job.setFileName(str(tmp_path / "layers.gcode"))
+            job.setWriteLayerIndex(True)
+            job.setUseLayerCache(use_layer_cache)
+            # The index is made while the files are written, without reading them back.
+            with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"), patch("UM.FileHandler.gcode._scanLayerStarts") as scan:
+                job.run()
+            scan.assert_not_called()
+    assert any(layer.cached for layer in job.getTransformMetrics()) == use_layer_cache
+
+    index = LayerIndex.load(job.getLayerIndexFileName())
+    assert [entry.layer for entry in index.entries] == list(range(12))
+    assert index.readSource(job.getFileName(), 4).startswith(b";LAYER:4\n")
+    # The same index as one made from the files.
+    transform = TransformGCode()
+    transform.setLayerIndexFile(str(tmp_path / "files.index"))
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"):
+        transform.updateGcode(job.getFileName(), str(tmp_path / "files_transformed.gcode"))
+    assert LayerIndex.load(str(tmp_path / "files.index")).entries == index.entries
+
+
+def test_runAnalyzesToolpath(tmp_path):
+    source = readTestFile("layers.gcode")
+
+    # The written G-code only goes to the stream, so the statistics can't come from reading the file.
+    job = WriteFileJob(ChunkedGCodeWriter(), io.StringIO(), source, FileWriter.OutputMode.TextMode)
+    job.setFileName(str(tmp_path / "layers.gcode"))
+    job.setAnalyzeToolpath(True)
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"):
+        job.run()
+
+    statistics = job.getToolpathStatistics()
+    expected = analyzeToolpath(parseToolpath(source.encode()))
+    assert statistics.totalSeconds > 0
+    assert statistics.totalSeconds == pytest.approx(expected.totalSeconds)
+    assert statistics.filament == pytest.approx(expected.filament)
+    assert statistics.turnHistogram == expected.turnHistogram
+    assert sorted(statistics.layerSeconds) == [-1] + list(range(12))
+    assert not os.path.exists(job.getFileName())
@@ -0,0 +1,388 @@
+;FLAVOR:Marlin
+;TIME:1234
+;Filament used: 1.2m
+;Layer height: 0.2
+;secondary_z_axis: 2
+;MINX:0
+;Generated with Cura_SteamEngine 5.0
+M140 S60
+M105
+M190 S60
+M104 S200
+M109 S200
+M82 ;absolute extrusion mode
+G28 ;Home
+G92 E0
+G1 Z15.0 F6000 ;Move the platform down 15mm
+G1 F200 E3
+G92 E0
+G4 S1
+;LAYER_COUNT:12
+;LAYER:0
+M107
+;TYPE:SKIRT
+G1 X101.509 Y95.724 E0.18919
+G0 F7200 X101.509 Y95.798
+G1 X97.208 Y91.705 E0.60435
+G1 X94.44 Y91.705 E1.07872
+G0 F7200 X93.407 Y96.468
+G0 F7200 X91.303 Y92.911
+;TYPE:WALL-INNER
+G1 X88.11 Y93.727 E1.27120
+G1 X83.738 Y89.323 E1.27120 ;comment
+G1 X83.014 Y87.464 E1.50326
+G1 X85.958 E1.50326
+G1 X86.21 Y93.205 E1.65435
+G1 X82.391 Y92.386 E1.73882
+;TYPE:WALL-OUTER
+G1 X82.391 Y94.068 E2.02960
+G1 X80.528 Y96.021 E2.32375
+G1 X83.928 Y100.468 E2.65919
+G1 X83.928 Y102.483 E3.15580
+G1 X81.774 Y101.341 E3.17686
+G0 F7200 X78.454 Y97.512
+;TYPE:SKIN
+G1 X75.93 Y97.512 E3.61386
+G1 X75.93 Y97.004 E4.05671
+G1 X79.57 Y94.788 E4.24251
+G1 F2700 E-0.75749
+G1 X81.48 Y91.147 E4.38126
+G1 X81.48 Y90.336 E4.66876
+;TIME_ELAPSED:0.0
+;LAYER:1
+;TYPE:WALL-INNER
+G0 F3000 Z0.4
+G0 F7200 X82.656 Y92.098
+G1 X85.456 Y95.843 E4.87103
+G0 F7200 X81.491 Y97.186
+G1 F2700 E-0.12897
+G1 F2700 E-0.12897
+G0 F7200 X75.653 Y89.276
+;TYPE:SKIN
+G1 X73.176 Y89.276 E5.05947
+G1 X76.665 Y89.276 E5.29780
+G1 X72.524 Y85.298 E5.43754
+G1 X69.138 Y80.529 E5.70638
+G0 F7200 X69.57 Y80.529
+G1 X74.355 Y84.162 E5.84433
+;TYPE:FILL
+G1 X77.074 Y84.488 E6.01586
+G1 X80.189 Y89.337 E6.42084
+G1 X82.588 Y86.604 E6.60507
+G92 E0
+G1 X84.513 Y86.448 E7.07421
+G1 X89.063 Y85.094 E7.07421 ;comment
+;TIME_ELAPSED:1.0
+;LAYER:2
+;TYPE:WALL-INNER
+G0 F3000 Z0.6
+G1 X86.107 Y86.335 E7.49602
+G0 F7200 X87.637 Y89.331
+G1 X91.735 Y92.154 E7.74026
+G1 X94.626 Y90.479 E8.22637
+G1 X93.64 Y94.947 E8.31967
+G1 X90.152 Y94.947 E8.72486
+;TYPE:WALL-OUTER
+G1 X94.955 Y96.52 E9.00370
+G1 X90.097 Y96.52 E9.33204
+G1 X94.433 Y95.858 E9.74686
+G1 X91.951 E9.74686
+G0 F7200 X89.545 Y92.978
+G1 X88.083 Y92.56 E10.19996
+;TYPE:SKIN
+G1 X88.099 Y92.878 E10.21913
+G1 X84.93 Y87.917 E10.31358
+G1 X87.182 Y88.482 E10.57757
+G1 X90.025 Y84.543 E10.70933
+G1 X92.748 Y84.62 E11.09173
+G1 X92.18 Y85.745 E11.35269
+;TYPE:FILL
+G1 X92.513 Y85.525 E11.70530
+G1 X96.935 Y83.121 E12.17751
+G1 X93.306 Y79.337 E12.22305
+G1 X89.037 Y81.032 E12.67260
+G0 F7200 X91.198 Y82.635
+G1 X95.873 Y79.831 E12.87774
+;TIME_ELAPSED:2.0
+;LAYER:3
+M107
+;TYPE:WALL-INNER
+G0 F3000 Z0.8
+G1 X99.197 Y76.446 E13.14039
+G1 X96.154 Y74.631 E13.15993
+G1 X95.559 Y69.812 E13.47566
+G1 X91.202 Y74.663 E13.96179
+G0 F7200 X88.858 Y74.663
+G1 X86.562 Y70.959 E14.41838
+;TYPE:SKIN
+G1 X90.754 Y70.959 E14.77159
+G1 X90.754 Y66.534 E14.98999
+G1 X90.754 Y70.917 E15.39279
+G0 F7200 X90.754 Y74.479
+G1 X90.292 Y72.871 E15.85686
+G1 X86.584 E15.85686
+;TYPE:FILL
+G1 X82.088 Y70.158 E16.01631
+G1 F2700 E11.01631
+G0 F7200 X75.17 Y67.663
+G1 X75.68 Y64.558 E16.48429
+G1 X78.869 Y64.558 E16.73684
+G1 X77.8 Y64.625 E17.22823
+;TIME_ELAPSED:3.0
+;LAYER:4
+;TYPE:WALL-INNER
+G0 F3000 Z1.0
+G1 X79.867 Y65.985 E17.40853
+G0 F7200 X79.867 Y62.283
+G0 F7200 X77.423 Y58.915
+
+G1 F2700 E12.40853
+G1 X76.691 Y64.833 E17.68660
+;TYPE:WALL-OUTER
+G0 F7200 X74.786 Y63.399
+G1 X74.532 Y63.427 E17.68660 ;comment
+G0 F7200 X69.582 Y61.069
+G1 X64.999 Y56.294 E17.81068
+G1 X65.291 Y58.799 E18.17151
+G1 X64.186 Y57.06 E18.25475
+;TYPE:SKIN
+G1 X59.624 Y60.413 E18.57214
+G1 X62.746 Y56.806 E18.82928
+G1 X65.793 Y60.07 E19.27677
+G0 F7200 X67.726 Y57.369
+G0 F7200 X66.333 Y57.369
+G1 X66.918 Y58.647 E19.62030
+;TYPE:FILL
+G1 X66.918 Y61.624 E19.87675
+G1 X68.511 Y57.285 E20.01033
+G1 X68.511 Y54.941 E20.12088
+G1 X73.268 Y54.88 E20.36560
+G1 X75.938 Y56.05 E20.41356
+G1 X73.477 Y56.05 E20.57272
+;TIME_ELAPSED:4.0
+;LAYER:5
+;TYPE:WALL-INNER
+G0 F3000 Z1.2
+;MESH:NONMESH
+G1 X75.399 Y53.414 E20.83583
+G1 X75.062 Y49.599 E20.94346
+G1 X79.425 Y44.774 E21.35521
+G1 X78.92 Y42.461 E21.35521 ;comment
+G0 F7200 X76.027 Y43.276
+;TYPE:WALL-OUTER
+G1 X72.353 Y46.478 E21.79977
+G1 X69.667 Y50.455 E21.82194
+G1 X69.667 Y50.372 E21.97990
+G1 X68.107 Y50.372 E22.40161
+G1 X68.107 Y52.879 E22.47043
+
+;TYPE:SKIN
+G1 X75.225 Y57.787 E22.69018
+G1 X70.708 Y53.804 E22.84013
+G1 X68.201 Y51.461 E22.94316
+G1 X72.763 Y55.304 E23.26230
+G1 X77.17 Y55.796 E23.29654
+G1 X76.679 Y58.323 E23.44678
+;TYPE:FILL
+G1 X72.952 Y58.045 E23.60269
+G1 X77.715 Y55.647 E23.76010
+G1 F2700 E18.76010
+G1 X80.719 Y52.291 E23.76010 ;comment
+G0 F7200 X85.684 Y51.791
+G0 F7200 X81.591 Y50.211
+;TIME_ELAPSED:5.0
+;LAYER:6
+M107
+;TYPE:WALL-INNER
+G0 F3000 Z1.4
+G1 X82.287 Y54.084 E23.97236
+G1 X82.529 Y52.853 E24.01277
+G1 X87.206 Y49.112 E24.33129
+G1 X84.366 E24.33129
+G1 X83.825 Y51.361 E24.76901
+G1 X83.825 Y46.683 E25.21790
+;TYPE:WALL-OUTER
+G1 X78.827 Y45.598 E25.63244
+G0 F7200 X83.549 Y43.083
+G1 X83.773 Y44.904 E25.99609
+G1 X86.421 Y44.477 E26.02546
+G1 X83.747 Y48.676 E26.18432
+G1 X81.265 Y48.676 E26.53662
+;TYPE:SKIN
+G1 X81.265 Y48.92 E26.73678
+G1 X82.276 Y44.025 E26.97252
+G1 X83.722 Y47.863 E27.09756
+G1 X88.328 Y49.91 E27.11823
+G0 X90.073 Y49.11 Z1.4
+G0 F7200 X94.325 Y46.378
+;TYPE:FILL
+G1 X96.151 Y43.359 E27.49041
+G1 X93.203 Y48.058 E27.90221
+G1 X90.417 Y50.663 E28.37865
+G1 X87.29 Y47.896 E28.71465
+G1 X83.754 Y46.831 E28.71465 ;comment
+G0 F7200 X80.173 Y42.349
+;TIME_ELAPSED:6.0
+;LAYER:7
+;TYPE:WALL-INNER
+G0 F3000 Z1.6
+G1 X84.009 Y44.676 E29.18113
+G1 X80.864 Y49.035 E29.20676
+G1 X79.65 Y47.774 E29.29969
+G1 X79.65 Y45.572 E29.77790
+G1 X84.293 Y45.572 E29.77790 ;comment
+G1 X87.509 Y48.792 E29.81203
+;TYPE:WALL-OUTER
+G1 X91.704 Y45.722 E30.26156
+G1 X91.704 Y44.83 E30.64723
+G0 F7200 X91.704 Y40.179
+G1 X89.274 Y42.652 E30.82337
+;MESH:NONMESH
+G0 F7200 X92.016 Y41.578
+;TYPE:SKIN
+G0 F7200 X93.356 Y46.011
+G1 X93.108 Y50.579 E31.02276
+G1 X92.407 Y50.514 E31.12240
+G1 X94.792 Y53.742 E31.42996
+G1 X92.987 Y52.361 E31.47867
+G0 F7200 X95.516 Y49.834
+;TYPE:FILL
+G1 X93.774 Y54.637 E31.97271
+G1 X89.615 Y50.601 E32.33050
+G1 X86.957 Y49.769 E32.67081
+G0 F7200 X90.427 Y51.413
+G1 X88.365 Y52.082 E33.04246
+G1 F2700 E28.04246
+;TIME_ELAPSED:7.0
+;LAYER:8
+;TYPE:WALL-INNER
+G0 F3000 Z1.8
+G1 X84.102 Y48.496 E33.30105
+G1 X87.186 Y50.029 E33.36119
+G1 X90.377 Y53.435 E33.39097
+G1 X86.569 Y50.331 E33.68674
+G1 X85.291 Y53.992 E33.82411
+G1 X89.748 Y50.05 E34.13789
+;TYPE:WALL-OUTER
+G0 X86.162 Y47.09 Z1.8
+G0 F7200 X87.678 Y44.124
+G1 X89.461 Y40.975 E34.24756
+G0 F7200 X89.941 Y36.608
+G0 F7200 X90.442 Y38.0
+
+;TYPE:SKIN
+G1 X90.52 Y37.763 E34.46161
+G1 F2700 E29.46161
+G1 X92.523 Y31.46 E34.67925
+G1 X91.585 Y35.288 E34.76890
+G1 X91.585 Y35.803 E35.22470
+G1 X91.585 Y37.025 E35.48189
+;TYPE:FILL
+G0 F7200 X91.797 Y41.28
+G1 F2700 E30.48189
+G1 X99.276 Y45.949 E35.72843
+G1 X99.276 Y50.211 E36.18150
+G1 X102.522 Y46.814 E36.30031
+G1 F2700 E31.30031
+;TIME_ELAPSED:8.0
+;LAYER:9
+M107
+;TYPE:WALL-INNER
+G0 F3000 Z2.0
+G0 F7200 X106.165 Y48.942
+G0 F7200 X108.414 Y52.915
+G1 X110.989 Y48.296 E36.36800
+G1 X111.49 Y49.566 E36.58384
+G1 X110.747 Y51.154 E36.80863
+G1 X110.747 Y52.343 E36.93390
+;TYPE:WALL-OUTER
+G1 X110.33 Y49.139 E36.99637
+G0 F7200 X109.636 Y49.139
+G1 X109.738 Y44.547 E37.04667
+G0 F7200 X112.514 Y44.662
+G0 F7200 X111.293 Y49.171
+G1 X116.254 Y51.492 E37.15158
+;TYPE:FILL
+G1 X120.414 Y48.143 E37.61757
+G1 X120.414 Y46.652 E37.70537
+G0 F7200 X118.164 Y49.808
+;MESH:NONMESH
+G1 F2700 E32.70537
+G1 X124.918 Y44.056 E37.79805
+;TIME_ELAPSED:9.0
+;LAYER:10
+;TYPE:WALL-INNER
+G0 F3000 Z2.2
+G1 X125.225 Y44.056 E37.98434
+G1 X125.777 Y44.856 E38.04560
+G1 X127.075 Y43.799 E38.18533
+G1 X127.849 Y42.402 E38.41205
+G1 X130.285 Y37.885 E38.54634
+G1 X135.126 Y38.744 E38.70953
+;TYPE:WALL-OUTER
+G1 X135.126 Y35.238 E38.93133
+G1 X139.081 Y31.558 E38.93133 ;comment
+G1 X134.304 Y26.584 E38.99345
+G1 X131.547 Y27.42 E39.10350
+G1 X131.296 Y23.767 E39.23285
+G1 X127.254 Y23.767 E39.66978
+;TYPE:SKIN
+G1 X124.896 Y18.882 E39.95533
+G1 X126.352 Y18.32 E40.32475
+G1 X130.387 Y13.76 E40.53369
+G0 F7200 X125.971 Y16.549
+G1 F2700 E35.53369
+G1 X130.449 Y14.388 E40.62926
+;TYPE:FILL
+G1 X125.934 Y18.282 E40.98981
+G1 X125.934 Y21.726 E41.22779
+G0 F7200 X125.459 Y18.985
+G1 X120.847 Y17.34 E41.57839
+G1 X122.964 Y15.0 E41.80206
+G1 X123.196 Y12.653 E42.28497
+;TIME_ELAPSED:10.0
+;LAYER:11
+;TYPE:WALL-INNER
+G0 F3000 Z2.4
+G1 X118.348 E42.28497
+G1 X122.795 Y12.719 E42.72626
+G1 X120.187 Y16.795 E43.07575
+G1 X124.977 Y16.49 E43.42758
+G1 X124.349 Y18.736 E43.58838
+G1 X125.575 Y14.514 E43.66923
+;TYPE:WALL-OUTER
+G1 X129.864 Y14.514 E43.74873
+G1 X129.864 Y9.93 E44.06933
+G1 X132.232 Y5.588 E44.25740
+G0 F7200 X135.428 Y9.501
+G0 F7200 X139.572 Y13.944
+G1 X135.692 Y9.288 E44.66529
+;TYPE:SKIN
+G0 F7200 X137.007 Y7.162
+G1 X137.007 Y9.736 E44.66529 ;comment
+G0 X136.245 Y4.945 Z2.4
+G1 X138.403 Y3.625 E45.14765
+G0 F7200 X141.917 Y4.808
+G1 X141.281 Y7.538 E45.50293
+;TYPE:FILL
+G1 X144.903 Y3.447 E45.59642
+G1 X144.903 Y0.467 E46.08557
+G1 X144.903 Y0.375 E46.48599
+G1 X144.849 Y-1.153 E46.62367
+G1 X142.686 Y-4.006 E46.87785
+G0 F7200 X144.051 Y-4.006
+;TIME_ELAPSED:11.0
+G1 F2700 E41.87785
+M140 S0
+M107
+G91
+G1 E-2 F2700
+G1 E-2 Z0.2 F2400 ;Retract and raise Z
+G1 X5 Y5 F3000
+G1 Z10
+G90
+M84
+M82
+M104 S0
+;End of Gcode
+;SETTING_3 {"global_quality": "x"}
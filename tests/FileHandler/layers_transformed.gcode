@@ -0,0 +1,580 @@
+N1 G28
+N2 G92 A0
+N3 G1 F6000
+N3 G1 F200 A3
+N3 G92 A0
+N4 G4
+N5 M2
+N6 G1 X101.509 Y95.724 A0.18919 Z0.2
+N8 C90.00000
+N7 G0 F7200 X101.509 Y95.798
+N10 C43.58052
+N9 G1 X97.208 Y91.705 A0.60435
+N12 C-0.00000
+N11 G1 X94.44 Y91.705 A1.07872
+N14 C257.76320
+N13 G0 F7200 X93.407 Y96.468
+N16 C59.39527
+N15 G0 F7200 X91.303 Y92.911
+N19 C194.33562
+N17 M3
+N18 G1 X88.11 Y93.727 A1.27120
+N21 C45.20892
+N20 G1 X83.738 Y89.323 A1.27120
+N23 C68.72124
+N22 G1 X83.014 Y87.464 A1.50326
+N24 G1 X85.958 A1.50326
+N26 C60.89543
+N25 G1 X86.21 Y93.205 A1.65435
+N28 C12.10398
+N27 G1 X82.391 Y92.386 A1.73882
+N30 C90.00000
+N29 G1 X82.391 Y94.068 A2.02960
+N32 C226.35107
+N31 G1 X80.528 Y96.021 A2.32375
+N34 C52.59990
+N33 G1 X83.928 Y100.468 A2.65919
+N36 C90.00000
+N35 G1 X83.928 Y102.483 A3.15580
+N38 C27.93148
+N37 G1 X81.774 Y101.341 A3.17686
+N40 C49.07252
+N39 G0 F7200 X78.454 Y97.512
+N43 C-0.00000
+N41 M2
+N42 G1 X75.93 Y97.512 A3.61386
+N45 C90.00000
+N44 G1 X75.93 Y97.004 A4.05671
+N47 C211.33269
+N46 G1 X79.57 Y94.788 A4.24251
+N49 C242.31934
+N48 G1 F2700 A-0.75749
+N48 G1 X81.48 Y91.147 A4.38126
+N51 C90.00000
+N50 G1 X81.48 Y90.336 A4.66876
+N54 C56.27993
+N53 G0 F3000 Z0.4
+N52 M3
+N53 G0 F7200 X82.656 Y92.098
+N56 C53.21587
+N55 G1 X85.456 Y95.843 A4.87103
+N58 C198.71195
+N57 G0 F7200 X81.491 Y97.186
+N60 C53.57070
+N59 G1 F2700 A-0.12897
+N59 G1 F2700 A-0.12897
+N59 G0 F7200 X75.653 Y89.276
+N63 C-0.00000
+N61 M2
+N62 G1 X73.176 Y89.276 A5.05947
+N65 C0.00000
+N64 G1 X76.665 Y89.276 A5.29780
+N67 C43.84986
+N66 G1 X72.524 Y85.298 A5.43754
+N69 C54.62517
+N68 G1 X69.138 Y80.529 A5.70638
+N71 C0.00000
+N70 G0 F7200 X69.57 Y80.529
+N73 C37.20750
+N72 G1 X74.355 Y84.162 A5.84433
+N77 C6.83696
+N74 M3
+N75 M2
+N76 G1 X77.074 Y84.488 A6.01586
+N79 C57.28329
+N78 G1 X80.189 Y89.337 A6.42084
+N81 C228.72366
+N80 G1 X82.588 Y86.604 A6.60507
+N82 G92 A0
+N84 C184.63307
+N83 G1 X84.513 Y86.448 A7.07421
+N86 C196.57208
+N85 G1 X89.063 Y85.094 A7.07421
+N89 C202.77384
+N88 G0 F3000 Z0.6000000000000001
+N87 M3
+N88 G1 X86.107 Y86.335 A7.49602
+N91 C62.94747
+N90 G0 F7200 X87.637 Y89.331
+N93 C34.56189
+N92 G1 X91.735 Y92.154 A7.74026
+N95 C210.08733
+N94 G1 X94.626 Y90.479 A8.22637
+N97 C257.55540
+N96 G1 X93.64 Y94.947 A8.31967
+N99 C-0.00000
+N98 G1 X90.152 Y94.947 A8.72486
+N101 C18.13381
+N100 G1 X94.955 Y96.52 A9.00370
+N103 C-0.00000
+N102 G1 X90.097 Y96.52 A9.33204
+N105 C188.68062
+N104 G1 X94.433 Y95.858 A9.74686
+N106 G1 X91.951 A9.74686
+N108 C30.50651
+N107 G0 F7200 X89.545 Y92.978
+N110 C15.95575
+N109 G1 X88.083 Y92.56 A10.19996
+N113 C87.11962
+N111 M2
+N112 G1 X88.099 Y92.878 A10.21913
+N115 C57.43027
+N114 G1 X84.93 Y87.917 A10.31358
+N117 C14.08412
+N116 G1 X87.182 Y88.482 A10.57757
+N119 C234.17988
+N118 G1 X90.025 Y84.543 A10.70933
+N121 C1.61976
+N120 G1 X92.748 Y84.62 A11.09173
+N123 C243.21130
+N122 G1 X92.18 Y85.745 A11.35269
+N127 C213.45117
+N124 M3
+N125 M2
+N126 G1 X92.513 Y85.525 A11.70530
+N129 C208.53051
+N128 G1 X96.935 Y83.121 A12.17751
+N131 C46.19784
+N130 G1 X93.306 Y79.337 A12.22305
+N133 C201.65548
+N132 G1 X89.037 Y81.032 A12.67260
+N135 C36.56751
+N134 G0 F7200 X91.198 Y82.635
+N137 C210.95474
+N136 G1 X95.873 Y79.831 A12.87774
+N140 C225.52093
+N139 G0 F3000 Z0.8
+N138 M3
+N139 G1 X99.197 Y76.446 A13.14039
+N142 C30.81400
+N141 G1 X96.154 Y74.631 A13.15993
+N144 C82.96134
+N143 G1 X95.559 Y69.812 A13.47566
+N146 C228.07092
+N145 G1 X91.202 Y74.663 A13.96179
+N148 C-0.00000
+N147 G0 F7200 X88.858 Y74.663
+N150 C58.20645
+N149 G1 X86.562 Y70.959 A14.41838
+N153 C0.00000
+N151 M2
+N152 G1 X90.754 Y70.959 A14.77159
+N155 C90.00000
+N154 G1 X90.754 Y66.534 A14.98999
+N157 C90.00000
+N156 G1 X90.754 Y70.917 A15.39279
+N159 C90.00000
+N158 G0 F7200 X90.754 Y74.479
+N161 C73.96993
+N160 G1 X90.292 Y72.871 A15.85686
+N162 G1 X86.584 A15.85686
+N166 C18.29866
+N163 M3
+N164 M2
+N165 G1 X82.088 Y70.158 A16.01631
+N168 C19.83201
+N167 G1 F2700 A11.01631
+N167 G0 F7200 X75.17 Y67.663
+N170 C260.67239
+N169 G1 X75.68 Y64.558 A16.48429
+N172 C0.00000
+N171 G1 X78.869 Y64.558 A16.73684
+N174 C183.58634
+N173 G1 X77.8 Y64.625 A17.22823
+N177 C33.34325
+N176 G0 F3000 Z1.0
+N175 M3
+N176 G1 X79.867 Y65.985 A17.40853
+N179 C90.00000
+N178 G0 F7200 X79.867 Y62.283
+N181 C54.03336
+N180 G0 F7200 X77.423 Y58.915
+N183 C262.94887
+N182 G1 F2700 A12.40853
+N182 G1 X76.691 Y64.833 A17.68660
+N185 C36.97082
+N184 G0 F7200 X74.786 Y63.399
+N187 C186.29067
+N186 G1 X74.532 Y63.427 A17.68660
+N189 C25.47143
+N188 G0 F7200 X69.582 Y61.069
+N191 C46.17538
+N190 G1 X64.999 Y56.294 A17.81068
+N193 C83.35122
+N192 G1 X65.291 Y58.799 A18.17151
+N195 C57.56720
+N194 G1 X64.186 Y57.06 A18.25475
+N198 C216.31532
+N196 M2
+N197 G1 X59.624 Y60.413 A18.57214
+N200 C229.12253
+N199 G1 X62.746 Y56.806 A18.82928
+N202 C46.96931
+N201 G1 X65.793 Y60.07 A19.27677
+N204 C234.41018
+N203 G0 F7200 X67.726 Y57.369
+N206 C-0.00000
+N205 G0 F7200 X66.333 Y57.369
+N208 C65.40423
+N207 G1 X66.918 Y58.647 A19.62030
+N212 C90.00000
+N209 M3
+N210 M2
+N211 G1 X66.918 Y61.624 A19.87675
+N214 C249.84003
+N213 G1 X68.511 Y57.285 A20.01033
+N216 C90.00000
+N215 G1 X68.511 Y54.941 A20.12088
+N218 C180.73468
+N217 G1 X73.268 Y54.88 A20.36560
+N220 C23.66314
+N219 G1 X75.938 Y56.05 A20.41356
+N222 C-0.00000
+N221 G1 X73.477 Y56.05 A20.57272
+N225 C233.90290
+N224 G0 F3000 Z1.2000000000000002
+N223 M3
+N224 G1 X75.399 Y53.414 A20.83583
+N227 C84.95185
+N226 G1 X75.062 Y49.599 A20.94346
+N229 C227.87858
+N228 G1 X79.425 Y44.774 A21.35521
+N231 C77.68382
+N230 G1 X78.92 Y42.461 A21.35521
+N233 C195.73330
+N232 G0 F7200 X76.027 Y43.276
+N235 C221.07312
+N234 G1 X72.353 Y46.478 A21.79977
+N237 C235.96556
+N236 G1 X69.667 Y50.455 A21.82194
+N239 C90.00000
+N238 G1 X69.667 Y50.372 A21.97990
+N241 C-0.00000
+N240 G1 X68.107 Y50.372 A22.40161
+N243 C90.00000
+N242 G1 X68.107 Y52.879 A22.47043
+N246 C34.58702
+N244 M2
+N245 G1 X75.225 Y57.787 A22.69018
+N248 C41.40520
+N247 G1 X70.708 Y53.804 A22.84013
+N250 C43.06331
+N249 G1 X68.201 Y51.461 A22.94316
+N252 C40.11058
+N251 G1 X72.763 Y55.304 A23.26230
+N254 C6.37016
+N253 G1 X77.17 Y55.796 A23.29654
+N256 C259.00435
+N255 G1 X76.679 Y58.323 A23.44678
+N260 C4.26584
+N257 M3
+N258 M2
+N259 G1 X72.952 Y58.045 A23.60269
+N262 C206.72362
+N261 G1 X77.715 Y55.647 A23.76010
+N264 C228.16786
+N263 G1 F2700 A18.76010
+N263 G1 X80.719 Y52.291 A23.76010
+N266 C185.75058
+N265 G0 F7200 X85.684 Y51.791
+N268 C21.10783
+N267 G0 F7200 X81.591 Y50.211
+N271 C79.81236
+N270 G0 F3000 Z1.4000000000000001
+N269 M3
+N270 G1 X82.287 Y54.084 A23.97236
+N273 C258.87816
+N272 G1 X82.529 Y52.853 A24.01277
+N275 C218.65533
+N274 G1 X87.206 Y49.112 A24.33129
+N276 G1 X84.366 A24.33129
+N278 C213.63137
+N277 G1 X83.825 Y51.361 A24.76901
+N280 C90.00000
+N279 G1 X83.825 Y46.683 A25.21790
+N282 C12.24812
+N281 G1 X78.827 Y45.598 A25.63244
+N284 C208.04036
+N283 G0 F7200 X83.549 Y43.083
+N286 C82.98731
+N285 G1 X83.773 Y44.904 A25.99609
+N288 C189.16031
+N287 G1 X86.421 Y44.477 A26.02546
+N290 C237.51027
+N289 G1 X83.747 Y48.676 A26.18432
+N292 C-0.00000
+N291 G1 X81.265 Y48.676 A26.53662
+N295 C90.00000
+N293 M2
+N294 G1 X81.265 Y48.92 A26.73678
+N297 C258.33037
+N296 G1 X82.276 Y44.025 A26.97252
+N299 C69.35566
+N298 G1 X83.722 Y47.863 A27.09756
+N301 C23.96133
+N300 G1 X88.328 Y49.91 A27.11823
+N303 C204.62922
+N302 G0 X90.073 Y49.11
+N305 C212.72160
+N304 G0 F7200 X94.325 Y46.378
+N309 C238.83294
+N306 M3
+N307 M2
+N308 G1 X96.151 Y43.359 A27.49041
+N311 C237.89718
+N310 G1 X93.203 Y48.058 A27.90221
+N313 C223.07705
+N312 G1 X90.417 Y50.663 A28.37865
+N315 C41.50477
+N314 G1 X87.29 Y47.896 A28.71465
+N317 C16.76166
+N316 G1 X83.754 Y46.831 A28.71465
+N319 C51.37607
+N318 G0 F7200 X80.173 Y42.349
+N322 C31.24190
+N321 G0 F3000 Z1.6
+N320 M3
+N321 G1 X84.009 Y44.676 A29.18113
+N324 C234.18971
+N323 G1 X80.864 Y49.035 A29.20676
+N326 C46.08791
+N325 G1 X79.65 Y47.774 A29.29969
+N328 C90.00000
+N327 G1 X79.65 Y45.572 A29.77790
+N330 C0.00000
+N329 G1 X84.293 Y45.572 A29.77790
+N332 C45.03561
+N331 G1 X87.509 Y48.792 A29.81203
+N334 C216.19755
+N333 G1 X91.704 Y45.722 A30.26156
+N336 C90.00000
+N335 G1 X91.704 Y44.83 A30.64723
+N338 C90.00000
+N337 G0 F7200 X91.704 Y40.179
+N340 C225.50248
+N339 G1 X89.274 Y42.652 A30.82337
+N342 C201.38953
+N341 G0 F7200 X92.016 Y41.578
+N345 C73.18107
+N343 M2
+N344 G0 F7200 X93.356 Y46.011
+N347 C266.89242
+N346 G1 X93.108 Y50.579 A31.02276
+N349 C5.29758
+N348 G1 X92.407 Y50.514 A31.12240
+N351 C53.54125
+N350 G1 X94.792 Y53.742 A31.42996
+N353 C37.41949
+N352 G1 X92.987 Y52.361 A31.47867
+N355 C224.97734
+N354 G0 F7200 X95.516 Y49.834
+N359 C250.06480
+N356 M3
+N357 M2
+N358 G1 X93.774 Y54.637 A31.97271
+N361 C44.14010
+N360 G1 X89.615 Y50.601 A32.33050
+N363 C17.38102
+N362 G1 X86.957 Y49.769 A32.67081
+N365 C25.35043
+N364 G0 F7200 X90.427 Y51.413
+N367 C197.97526
+N366 G1 X88.365 Y52.082 A33.04246
+N370 C40.07027
+N368 G1 F2700 A28.04246
+N369 G0 F3000 Z1.8
+N368 M3
+N369 G1 X84.102 Y48.496 A33.30105
+N372 C26.43113
+N371 G1 X87.186 Y50.029 A33.36119
+N374 C46.86664
+N373 G1 X90.377 Y53.435 A33.39097
+N376 C39.18437
+N375 G1 X86.569 Y50.331 A33.68674
+N378 C250.75667
+N377 G1 X85.291 Y53.992 A33.82411
+N380 C221.49120
+N379 G1 X89.748 Y50.05 A34.13789
+N382 C39.53736
+N381 G0 X86.162 Y47.09
+N384 C242.92724
+N383 G0 F7200 X87.678 Y44.124
+N386 C240.48096
+N385 G1 X89.461 Y40.975 A34.24756
+N388 C263.72750
+N387 G0 F7200 X89.941 Y36.608
+N390 C70.20550
+N389 G0 F7200 X90.442 Y38.0
+N393 C251.78290
+N391 M2
+N392 G1 X90.52 Y37.763 A34.46161
+N395 C252.37051
+N394 G1 F2700 A29.46161
+N394 G1 X92.523 Y31.46 A34.67925
+N397 C256.23172
+N396 G1 X91.585 Y35.288 A34.76890
+N399 C90.00000
+N398 G1 X91.585 Y35.803 A35.22470
+N401 C90.00000
+N400 G1 X91.585 Y37.025 A35.48189
+N405 C87.14767
+N402 M3
+N403 M2
+N404 G0 F7200 X91.797 Y41.28
+N407 C31.97576
+N406 G1 F2700 A30.48189
+N406 G1 X99.276 Y45.949 A35.72843
+N409 C90.00000
+N408 G1 X99.276 Y50.211 A36.18150
+N411 C226.30215
+N410 G1 X102.522 Y46.814 A36.30031
+N414 C30.29065
+N412 G1 F2700 A31.30031
+N413 G0 F3000 Z2.0
+N412 M3
+N413 G0 F7200 X106.165 Y48.942
+N416 C60.48706
+N415 G0 F7200 X108.414 Y52.915
+N418 C240.86121
+N417 G1 X110.989 Y48.296 A36.36800
+N420 C68.47135
+N419 G1 X111.49 Y49.566 A36.58384
+N422 C244.92585
+N421 G1 X110.747 Y51.154 A36.80863
+N424 C90.00000
+N423 G1 X110.747 Y52.343 A36.93390
+N426 C82.58465
+N425 G1 X110.33 Y49.139 A36.99637
+N428 C-0.00000
+N427 G0 F7200 X109.636 Y49.139
+N430 C268.72752
+N429 G1 X109.738 Y44.547 A37.04667
+N432 C2.37221
+N431 G0 F7200 X112.514 Y44.662
+N434 C254.84815
+N433 G0 F7200 X111.293 Y49.171
+N436 C25.07251
+N435 G1 X116.254 Y51.492 A37.15158
+N439 C218.83574
+N437 M2
+N438 G1 X120.414 Y48.143 A37.61757
+N441 C90.00000
+N440 G1 X120.414 Y46.652 A37.70537
+N443 C234.51387
+N442 G0 F7200 X118.164 Y49.808
+N445 C220.41916
+N444 G1 F2700 A32.70537
+N444 G1 X124.918 Y44.056 A37.79805
+N448 C0.00000
+N447 G0 F3000 Z0.2
+N446 M1
+N446 M3
+N447 G1 X125.225 Y44.056 A37.98434
+N450 C55.39432
+N449 G1 X125.777 Y44.856 A38.04560
+N452 C219.15695
+N451 G1 X127.075 Y43.799 A38.18533
+N454 C241.01160
+N453 G1 X127.849 Y42.402 A38.41205
+N456 C241.66219
+N455 G1 X130.285 Y37.885 A38.54634
+N458 C10.06199
+N457 G1 X135.126 Y38.744 A38.70953
+N460 C90.00000
+N459 G1 X135.126 Y35.238 A38.93133
+N462 C222.93719
+N461 G1 X139.081 Y31.558 A38.93133
+N464 C46.15739
+N463 G1 X134.304 Y26.584 A38.99345
+N466 C196.86878
+N465 G1 X131.547 Y27.42 A39.10350
+N468 C86.06935
+N467 G1 X131.296 Y23.767 A39.23285
+N470 C-0.00000
+N469 G1 X127.254 Y23.767 A39.66978
+N473 C64.23330
+N471 M2
+N472 G1 X124.896 Y18.882 A39.95533
+N475 C201.10604
+N474 G1 X126.352 Y18.32 A40.32475
+N477 C228.49540
+N476 G1 X130.387 Y13.76 A40.53369
+N479 C212.27516
+N478 G0 F7200 X125.971 Y16.549
+N481 C205.76110
+N480 G1 F2700 A35.53369
+N480 G1 X130.449 Y14.388 A40.62926
+N485 C220.77641
+N482 M3
+N483 M2
+N484 G1 X125.934 Y18.282 A40.98981
+N487 C90.00000
+N486 G1 X125.934 Y21.726 A41.22779
+N489 C80.16860
+N488 G0 F7200 X125.459 Y18.985
+N491 C19.63021
+N490 G1 X120.847 Y17.34 A41.57839
+N493 C227.86433
+N492 G1 X122.964 Y15.0 A41.80206
+N495 C264.35467
+N494 G1 X123.196 Y12.653 A42.28497
+N497 G0 F3000 Z0.4
+N496 M3
+N497 G1 X118.348 A42.28497
+N499 C189.34643
+N498 G1 X122.795 Y12.719 A42.72626
+N501 C237.38714
+N500 G1 X120.187 Y16.795 A43.07575
+N503 C183.64335
+N502 G1 X124.977 Y16.49 A43.42758
+N505 C254.37857
+N504 G1 X124.349 Y18.736 A43.58838
+N507 C253.80756
+N506 G1 X125.575 Y14.514 A43.66923
+N509 C0.00000
+N508 G1 X129.864 Y14.514 A43.74873
+N511 C90.00000
+N510 G1 X129.864 Y9.93 A44.06933
+N513 C241.39324
+N512 G1 X132.232 Y5.588 A44.25740
+N515 C50.75927
+N514 G0 F7200 X135.428 Y9.501
+N517 C46.99424
+N516 G0 F7200 X139.572 Y13.944
+N519 C50.19443
+N518 G1 X135.692 Y9.288 A44.66529
+N522 C238.26186
+N520 M2
+N521 G0 F7200 X137.007 Y7.162
+N524 C90.00000
+N523 G1 X137.007 Y9.736 A44.66529
+N526 C80.96290
+N525 G0 X136.245 Y4.945
+N528 C211.45319
+N527 G1 X138.403 Y3.625 A45.14765
+N530 C18.60598
+N529 G0 F7200 X141.917 Y4.808
+N532 C256.88588
+N531 G1 X141.281 Y7.538 A45.50293
+N536 C228.47967
+N533 M3
+N534 M2
+N535 G1 X144.903 Y3.447 A45.59642
+N538 C90.00000
+N537 G1 X144.903 Y0.467 A46.08557
+N540 C90.00000
+N539 G1 X144.903 Y0.375 A46.48599
+N542 C87.97599
+N541 G1 X144.849 Y-1.153 A46.62367
+N544 C52.83244
+N543 G1 X142.686 Y-4.006 A46.87785
+N546 C0.00000
+N545 G0 F7200 X144.051 Y-4.006
+N547 G1 F2700 A41.87785
+N547 G91
+N549 C183.70573
+N548 G1 A-2 F2700
+N548 G1 A-2 F2400
+N548 G1 X5 Y5 F3000
+N550 G1
+N550 G90
@@ -80,6 +80,13 @@ def test_calculateNormals():
     builder2.calculateNormals(fast = True)
     assert numpy.array_equal(builder2.getNormals(), numpy.array([[1., 0., 0], [1., 0., 0.], [1., 0., 0.]]))
 
+    # Vertices that are shared by faces get the mean of their normals, weighted by the area of the faces.
+    builder3 = MeshBuilder()
+    builder3.setVertices(numpy.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 20]], dtype = numpy.float32))
+    builder3.setIndices(numpy.array([[0, 1, 2], [0, 3, 1]], dtype = numpy.int32))
+    builder3.calculateNormals()
+    assert numpy.allclose(builder3.getNormals(), numpy.array([[0, 2, 1], [0, 2, 1], [0, 0, 1], [0, 1, 0]]) / numpy.sqrt([[5], [5], [1], [1]]))
+
 
 def test_addLine():
     builder = MeshBuilder()
@@ -195,3 +202,61 @@ def test_getSetFilename():
     builder.setFileName("HERPDERP")
 
     assert builder.getFileName() == "HERPDERP"
+
+
+def _cubeSoup():
+    """The vertices of the 12 triangles of a cube, every triangle with its own three vertices."""
+
+    builder = MeshBuilder()
+    builder.addCube(10, 10, 10)
+    return builder.getVertices()[builder.getIndices().ravel()]
+
+
+def test_weldVertices():
+    builder = MeshBuilder()
+    builder.setVertices(_cubeSoup())
+    builder.calculateNormals(fast = True)
+    builder.setWeldVertices(True)
+    mesh = builder.build()
+
+    assert mesh.getVertexCount() == 8
+    assert mesh.getFaceCount() == 12
+    assert numpy.array_equal(mesh.getVertices()[mesh.getIndices()].reshape((-1, 3)), _cubeSoup())
+    # The normals of the corners point away from the center.
+    assert numpy.allclose(numpy.linalg.norm(mesh.getNormals(), axis = 1), 1)
+    assert numpy.all(numpy.sum(mesh.getNormals() * mesh.getVertices(), axis = 1) > 0)
+    assert builder.getWeldSavedBytes() == 36 * 3 * 4 * 2 - (8 * 3 * 4 * 2 + 12 * 3 * 4)
+
+
+def test_weldVerticesOff():
+    builder = MeshBuilder()
+    builder.setVertices(_cubeSoup())
+    mesh = builder.build()
+
+    assert mesh.getVertexCount() == 36
+    assert not mesh.hasIndices()
+
+
+def test_weldVerticesWithColors():
+    builder = MeshBuilder()
+    builder.setVertices(_cubeSoup())
+    colors = numpy.zeros((36, 4), dtype = numpy.float32)
+    colors[:18] = [1, 0, 0, 1]  # The first six triangles are red.
+    builder.setColors(colors)
+    builder.setWeldVertices(True)
+    mesh = builder.build()
+
+    assert mesh.getFaceCount() == 12
+    assert 8 < mesh.getVertexCount() <= 16
+    assert numpy.array_equal(mesh.getColors()[mesh.getIndices()].reshape((-1, 4)), colors)
+
+
+def test_weldVerticesWithTolerance():
+    builder = MeshBuilder()
+    vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1.001, 0, 0], [0, 1, 0], [1, 1, 0], [0, 0, 0], [0.001, 0, 0], [0, 1, 0]], dtype = numpy.float32)
+    builder.setVertices(vertices)
+    builder.setWeldVertices(True, tolerance = 0.01)
+    mesh = builder.build()
+
+    assert mesh.getVertexCount() == 4
+    assert mesh.getFaceCount() == 2  # The last triangle has no area anymore.
@@ -0,0 +1,136 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshCache import MeshCache
+from UM.Mesh.MeshFileHandler import MeshFileHandler
+from UM.Mesh.MeshReader import MeshReader
+from UM.Scene.SceneNode import SceneNode
+
+
+class CubeReader(MeshReader):
+    """Reads every file as a cube, and counts how often it read one."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.read_count = 0
+
+    def canCacheMesh(self) -> bool:
+        return True
+
+    def _read(self, file_name):
+        self.read_count += 1
+        builder = MeshBuilder()
+        builder.addCube(10, 20, 30)
+        builder.calculateNormals()
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        return node
+
+
+class OtherCubeReader(CubeReader):
+    pass
+
+
+def _createCube():
+    builder = MeshBuilder()
+    builder.addCube(10, 20, 30)
+    builder.calculateNormals()
+    return builder.build()
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = str(tmp_path / "model.stl")
+    with open(path, "w") as f:
+        f.write("solid cube\nendsolid cube\n")
+    return path
+
+
+def test_getAndPut(tmp_path, model_file):
+    cache = MeshCache(str(tmp_path / "cache"))
+    mesh_data = _createCube()
+
+    assert cache.get(model_file, CubeReader()) is None
+    cache.put(model_file, CubeReader(), mesh_data)
+    cached = cache.get(model_file, CubeReader())
+
+    assert numpy.array_equal(cached.getVertices(), mesh_data.getVertices())
+    assert numpy.array_equal(cached.getNormals(), mesh_data.getNormals())
+    assert numpy.array_equal(cached.getIndices(), mesh_data.getIndices())
+    assert cached.getVertices().dtype == mesh_data.getVertices().dtype
+    assert not cached.getVertices().flags.writeable
+    assert cached.getFileName() == model_file
+    assert (cache.getHitCount(), cache.getMissCount()) == (1, 1)
+
+
+def test_changedFile(tmp_path, model_file):
+    cache = MeshCache(str(tmp_path / "cache"))
+    cache.put(model_file, CubeReader(), _createCube())
+
+    with open(model_file, "a") as f:
+        f.write("\n")
+
+    assert cache.get(model_file, CubeReader()) is None
+
+
+def test_otherReader(tmp_path, model_file):
+    cache = MeshCache(str(tmp_path / "cache"))
+    cache.put(model_file, CubeReader(), _createCube())
+
+    assert cache.get(model_file, OtherCubeReader()) is None
+
+
+def test_brokenFile(tmp_path, model_file):
+    cache = MeshCache(str(tmp_path / "cache"))
+    cache.put(model_file, CubeReader(), _createCube())
+    path = os.path.join(cache.getPath(), cache.key(model_file, CubeReader()) + ".mesh")
+    with open(path, "r+b") as f:
+        f.truncate(100)
+
+    assert cache.get(model_file, CubeReader()) is None
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    cache = MeshCache(str(tmp_path / "cache"))
+    mesh_data = _createCube()
+    files = []
+    for i in range(3):
+        files.append(str(tmp_path / "model{0}.stl".format(i)))
+        with open(files[-1], "w") as f:
+            f.write(str(i))
+        cache.put(files[-1], CubeReader(), mesh_data)
+        path = os.path.join(cache.getPath(), cache.key(files[-1], CubeReader()) + ".mesh")
+        os.utime(path, (i, i))
+    entry_size = os.path.getsize(path)
+
+    cache.get(files[0], CubeReader())  # Now the second one is the least recently used.
+    cache.setMaxSize(2 * entry_size)
+
+    assert cache.get(files[0], CubeReader()) is not None
+    assert cache.get(files[1], CubeReader()) is None
+    assert cache.get(files[2], CubeReader()) is not None
+
+
+def test_readerRead(tmp_path, model_file):
+    MeshFileHandler._FileHandler__instance = None
+    with patch("UM.FileHandler.FileHandler.PluginRegistry.addType"):
+        handler = MeshFileHandler(MagicMock())
+    handler._mesh_cache = MeshCache(str(tmp_path / "cache"))
+    reader = CubeReader()
+
+    with patch("UM.Application.Application.getInstance"):
+        first = handler.readerRead(reader, model_file)[0]
+        second = handler.readerRead(reader, model_file)[0]
+
+    assert reader.read_count == 1
+    assert numpy.array_equal(first.getMeshData().getVertices(), second.getMeshData().getVertices())
+    assert second.getPosition() == first.getPosition()
+    assert handler.getMeshCache().getHitCount() == 1
+    MeshFileHandler._FileHandler__instance = None
@@ -1,9 +1,12 @@
+import math
+from copy import deepcopy
+
 import numpy
 
 from UM.Math.AxisAlignedBox import AxisAlignedBox
 from UM.Math.Vector import Vector
 from UM.Mesh.MeshBuilder import MeshBuilder
-from UM.Mesh.MeshData import MeshData, MeshType
+from UM.Mesh.MeshData import ConvexHullCache, MeshData, MeshType, weldVertices
 from UM.Math.Matrix import Matrix
 
 
@@ -100,4 +103,137 @@ def test_getPositionAndType():
     mesh_data = MeshData(zero_position=Vector(0, 12, 13), center_position=Vector(10, 20, 30), type = MeshType.pointcloud)
     assert mesh_data.getZeroPosition() == Vector(0, 12, 13)
     assert mesh_data.getCenterPosition() == Vector(10, 20, 30)
-    assert mesh_data.getType() == MeshType.pointcloud
\ No newline at end of file
+    assert mesh_data.getType() == MeshType.pointcloud
+
+def test_weldVerticesIndexed():
+    # Two triangles that share an edge, but not its vertices.
+    vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [-0.0, 1, 0], [1, 0, 0], [1, 1, 0], [5, 5, 5]], dtype = numpy.float32)
+    indices = numpy.array([[0, 1, 2], [3, 4, 5]], dtype = numpy.int32)
+
+    kept, new_indices = weldVertices(vertices, indices)
+
+    assert kept.tolist() == [0, 1, 2, 5]  # The vertex that is in no triangle is left out.
+    assert new_indices.tolist() == [[0, 1, 2], [2, 1, 3]]
+
+
+def _cubeMesh():
+    builder = MeshBuilder()
+    builder.addCube(10, 20, 30)
+    builder.calculateNormals()
+    return builder.build()
+
+
+def test_convexHullShared():
+    ConvexHullCache.getInstance().clear()
+    first = _cubeMesh()
+    second = _cubeMesh()
+
+    assert first.getConvexHull() is second.getConvexHull()
+    assert len(ConvexHullCache.getInstance()) == 1
+
+
+def test_convexHullCachedWithOnlyItsVertices():
+    ConvexHullCache.getInstance().clear()
+    builder = MeshBuilder()
+    builder.addCube(10, 20, 30)
+    # Points inside the cube, which are not vertices of its convex hull.
+    builder.addVertices(numpy.random.RandomState(0).uniform(-4, 4, (100, 3)).astype(numpy.float32))
+    mesh = builder.build()
+
+    hull = mesh.getConvexHull()
+
+    assert ConvexHullCache.getInstance().get(mesh.getHash()) is hull
+    assert len(hull.points) == len(hull.vertices) == 8
+    assert numpy.allclose(numpy.sort(numpy.abs(hull.points), axis = 0), [[5, 10, 15]] * 8)
+
+
+def test_convexHullOfTransformed():
+    ConvexHullCache.getInstance().clear()
+    mesh = _cubeMesh()
+    mesh.getConvexHull()
+    transformation = Matrix()
+    transformation.setByTranslation(Vector(100, 0, 0))
+
+    transformed = mesh.getTransformed(transformation)
+
+    assert transformed._transformed_convex_hull_vertices is not None
+    hull_vertices = transformed.getConvexHullVertices()
+    assert len(hull_vertices) == 8
+    assert numpy.allclose(numpy.sort(hull_vertices[:, 0]), [95] * 4 + [105] * 4)
+    assert len(ConvexHullCache.getInstance()) == 1  # It was not computed from all of its vertices.
+
+
+def test_convexHullCacheEviction():
+    cache = ConvexHullCache(max_count = 2)
+    hulls = [object(), object(), object()]
+    cache.put("a", hulls[0])
+    cache.put("b", hulls[1])
+    cache.get("a")  # Now "b" is the least recently used.
+    cache.put("c", hulls[2])
+
+    assert cache.get("a") is hulls[0]
+    assert cache.get("b") is None
+    assert cache.get("c") is hulls[2]
+
+
+def test_getExtentsCached():
+    mesh = _cubeMesh()
+    transformation = Matrix()
+    transformation.setByTranslation(Vector(100, 0, 0))
+
+    extents = mesh.getExtents(transformation)
+    assert mesh.getExtents(transformation.copy()) is extents
+    assert extents.left == 95
+
+    transformation.setByTranslation(Vector(0, 100, 0))
+    assert mesh.getExtents(transformation).left == -5
+    assert mesh.getExtents().bottom == -10
+
+
+def test_getExtentsCacheBounded():
+    mesh = _cubeMesh()
+    transformation = Matrix()
+    for x in range(100):
+        transformation.setByTranslation(Vector(x, 0, 0))
+        assert mesh.getExtents(transformation).left == x - 5
+
+    assert len(mesh._extents) <= 16
+
+
+def test_copySharesArrays():
+    mesh = _cubeMesh()
+    mesh.getConvexHull()
+
+    copied = deepcopy(mesh)
+
+    assert copied is not mesh
+    assert copied.getVertices() is mesh.getVertices()
+    assert copied.getIndices() is mesh.getIndices()
+    assert copied.getConvexHull() is mesh.getConvexHull()
+
+
+def test_setSharesArrays():
+    mesh = _cubeMesh()
+
+    moved = mesh.set(center_position = Vector(1, 2, 3))
+    assert moved.getVertices() is mesh.getVertices()
+    assert moved.getNormals() is mesh.getNormals()
+
+    changed = mesh.set(vertices = mesh.getVertices() * 2)
+    assert changed.getIndices() is mesh.getIndices()
+    assert not changed.getVertices().flags.writeable
+
+
+def test_getTransformedSharesArrays():
+    mesh = _cubeMesh()
+
+    assert mesh.getTransformed(Matrix()).getVertices() is mesh.getVertices()
+
+    transformation = Matrix()
+    transformation.setByTranslation(Vector(10, 0, 0))
+    moved = mesh.getTransformed(transformation)
+    assert moved.getNormals() is mesh.getNormals()
+    assert numpy.array_equal(moved.getVertices(), mesh.getVertices() + [10, 0, 0])
+
+    transformation.setByRotationAxis(math.pi / 2, Vector.Unit_Y)
+    assert not numpy.array_equal(mesh.getTransformed(transformation).getNormals(), mesh.getNormals())
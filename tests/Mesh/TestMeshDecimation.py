@@ -0,0 +1,83 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import patch
+
+import numpy
+
+from UM.Mesh.MeshData import MeshData
+from UM.Mesh.MeshDecimation import decimateMesh, getLevelOfDetail
+
+
+def _createCube(divisions: int) -> MeshData:
+    """A cube of 20 by 20 by 20 around the origin, with every side split into divisions by divisions squares."""
+
+    steps = numpy.linspace(-10, 10, divisions + 1)
+    first, second = numpy.meshgrid(steps, steps)
+    sides = []
+    for axes in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        for sign in (1, -1):
+            points = numpy.zeros(first.shape + (3, ))
+            points[..., axes[0]] = first
+            points[..., axes[1]] = second
+            points[..., axes[2]] = sign * 10
+            a, b, c, d = points[:-1, :-1], points[1:, :-1], points[:-1, 1:], points[1:, 1:]
+            sides.append(numpy.stack([a, b, c], axis = 2).reshape((-1, 3)))
+            sides.append(numpy.stack([b, d, c], axis = 2).reshape((-1, 3)))
+    return MeshData(vertices = numpy.concatenate(sides).astype(numpy.float32))
+
+
+def test_decimateMesh():
+    mesh = _createCube(40)
+
+    decimated = decimateMesh(mesh, 1000)
+
+    assert 0 < decimated.getFaceCount() <= 1000
+    assert decimated.hasIndices()
+    assert decimated.getNormals().shape == decimated.getVertices().shape
+    vertices = decimated.getVertices()
+    # The vertices stay on the surface, and the corners stay sharp.
+    assert numpy.allclose(numpy.abs(vertices).max(axis = 1), 10, atol = 1e-3)
+    assert numpy.sum(numpy.all(numpy.isclose(numpy.abs(vertices), 10, atol = 1e-3), axis = 1)) == 8
+
+
+def test_decimateSmallMesh():
+    mesh = _createCube(2)
+
+    assert decimateMesh(mesh, 1000) is mesh
+
+
+def test_getLevelOfDetail():
+    mesh = _createCube(130)  # 202800 faces.
+    coarse = MeshData(indices = numpy.zeros((1000, 3), dtype = numpy.int32), vertices = numpy.zeros((3, 3), dtype = numpy.float32))
+    fine = MeshData(indices = numpy.zeros((50000, 3), dtype = numpy.int32), vertices = numpy.zeros((3, 3), dtype = numpy.float32))
+    mesh.setLevelsOfDetail([fine, coarse])
+
+    assert getLevelOfDetail(mesh, 10) is coarse
+    assert getLevelOfDetail(mesh, 100) is fine
+    assert getLevelOfDetail(mesh, 1000) is mesh
+
+
+def test_getLevelOfDetailStartsJob():
+    mesh = _createCube(130)
+
+    with patch("UM.JobQueue.JobQueue.getInstance") as get_queue:
+        assert getLevelOfDetail(mesh, 10) is mesh
+        assert getLevelOfDetail(mesh, 10) is mesh
+    assert get_queue.return_value.add.call_count == 1  # Only once.
+
+    job = get_queue.return_value.add.call_args[0][0]
+    job.run()
+    levels = mesh.getLevelsOfDetail()
+    assert len(levels) >= 2
+    assert all(coarser.getFaceCount() < finer.getFaceCount() for finer, coarser in zip(levels, levels[1:]))
+    assert getLevelOfDetail(mesh, 10) is levels[-1]
+
+
+def test_getLevelOfDetailSmallMesh():
+    mesh = _createCube(10)
+
+    with patch("UM.JobQueue.JobQueue.getInstance") as get_queue:
+        assert getLevelOfDetail(mesh, 10) is mesh
+    assert get_queue.return_value.add.call_count == 0
+    assert mesh.getLevelsOfDetail() is None
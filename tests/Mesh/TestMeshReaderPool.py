@@ -0,0 +1,107 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshFileHandler import MeshFileHandler
+from UM.Mesh.MeshReader import MeshReader
+from UM.Mesh.MeshReaderPool import MeshReaderPool
+from UM.Scene.SceneNode import SceneNode
+
+
+class CubeReader(MeshReader):
+    """Reads every file as a cube, with the size in the file."""
+
+    def canReadInProcess(self) -> bool:
+        return True
+
+    def _read(self, file_name):
+        with open(file_name) as f:
+            size = float(f.read())
+        builder = MeshBuilder()
+        builder.addCube(size, size, size)
+        builder.calculateNormals()
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        return node
+
+
+class EmptyReader(CubeReader):
+    def _read(self, file_name):
+        return None
+
+
+class PidReader(CubeReader):
+    """Reads a file as a triangle at the process ID of the reader."""
+
+    def _read(self, file_name):
+        builder = MeshBuilder()
+        builder.setVertices(numpy.array([[os.getpid(), 0, 0], [0, 1, 0], [0, 0, 1]], dtype = numpy.float32))
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        return node
+
+
+@pytest.fixture(scope = "module")
+def pool():
+    pool = MeshReaderPool(2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = str(tmp_path / "model.cube")
+    with open(path, "w") as f:
+        f.write("10")
+    return path
+
+
+def test_read(pool, model_file):
+    expected = CubeReader()._read(model_file).getMeshData()
+
+    mesh_data = pool.read(CubeReader(), model_file)
+
+    assert numpy.array_equal(mesh_data.getVertices(), expected.getVertices())
+    assert numpy.array_equal(mesh_data.getNormals(), expected.getNormals())
+    assert numpy.array_equal(mesh_data.getIndices(), expected.getIndices())
+    assert mesh_data.getVertices().dtype == expected.getVertices().dtype
+    assert not mesh_data.getVertices().flags.writeable
+    assert mesh_data.getFileName() == model_file
+
+
+def test_readInOtherProcess(pool, model_file):
+    mesh_data = pool.read(PidReader(), model_file)
+
+    assert mesh_data.getVertices()[0][0] != os.getpid()
+
+
+def test_readNothing(pool, model_file):
+    assert pool.read(EmptyReader(), model_file) is None
+
+
+def test_readError(pool, tmp_path):
+    with pytest.raises(OSError):
+        pool.read(CubeReader(), str(tmp_path / "missing.cube"))
+
+
+def test_readerRead(pool, model_file):
+    MeshFileHandler._FileHandler__instance = None
+    with patch("UM.FileHandler.FileHandler.PluginRegistry.addType"):
+        handler = MeshFileHandler(MagicMock())
+    handler.setUseMeshCache(False)
+    handler._mesh_reader_pool = pool
+    assert handler.getReadInProcesses()
+
+    with patch("UM.Application.Application.getInstance"):
+        node = handler.readerRead(PidReader(), model_file, center = False)[0]
+
+    assert isinstance(node, SceneNode)
+    assert node.getMeshData().getVertices()[0][0] != os.getpid()
+    handler._mesh_reader_pool = None
+    MeshFileHandler._FileHandler__instance = None
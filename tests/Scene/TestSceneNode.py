@@ -295,6 +295,20 @@ class SceneNodeTest(unittest.TestCase):
         # Ensure that the decorator also got copied
         assert copied_node.callDecoration("isGroup")
 
+    def test_invertNormalsOfCopy(self):
+        builder = MeshBuilder()
+        builder.addCube(10, 10, 10)
+        builder.calculateNormals()
+        node = SceneNode()
+        node.setMeshData(builder.build())
+        copied_node = deepcopy(node)
+        normals = node.getMeshData().getNormals().copy()
+
+        copied_node.invertNormals()
+
+        assert (node.getMeshData().getNormals() == normals).all()
+        assert (abs(copied_node.getMeshData().getNormals() + normals) < 1e-6).all()
+
     def test_addRemoveDouble(self):
         # Adding a child that's already a child of a node should not cause issues. Same for trying to remove one that isn't a child
 
@@ -1,9 +1,11 @@
+import math
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from UM.Math.Color import Color
 from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
 from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Mesh.MeshData import MeshData
 from UM.View.RenderBatch import RenderBatch
@@ -90,4 +92,48 @@ def test_render():
         with patch("UM.View.GL.OpenGLContext.OpenGLContext.properties"):
             render_batch.render(mocked_camera)
     assert mocked_shader.bind.call_count == 2
-    assert mocked_shader.release.call_count == 2
\ No newline at end of file
+    assert mocked_shader.release.call_count == 2
+
+def test_renderLevelOfDetail():
+    mocked_shader = MagicMock()
+    with patch("UM.View.GL.OpenGL.OpenGL.getInstance"):
+        render_batch = RenderBatch(mocked_shader, level_of_detail = True)
+    mb = MeshBuilder()
+    mb.addCube(2, 2, 2)
+    mesh_data = mb.build()
+    transformation = Matrix()
+    transformation.setByTranslation(Vector(0, 0, -100))
+    render_batch.addItem(transformation, mesh_data)
+
+    # A camera at the origin looking along -Z, 1000 pixels high.
+    projection = Matrix()
+    projection.setPerspective(30, 1, 1, 500)
+    mocked_camera = MagicMock()
+    mocked_camera.getInverseWorldTransformation = MagicMock(return_value = Matrix())
+    mocked_camera.getProjectionMatrix = MagicMock(return_value = projection)
+    mocked_camera.getViewportHeight = MagicMock(return_value = 1000)
+    with patch("UM.View.GL.OpenGL.OpenGL.getInstance"):
+        with patch("UM.View.GL.OpenGLContext.OpenGLContext.properties"):
+            with patch("UM.View.RenderBatch.getLevelOfDetail", side_effect = lambda mesh, pixel_size: mesh) as get_level_of_detail:
+                render_batch.render(mocked_camera)
+
+    # The cube's bounding box is 2 * sqrt(3) across, at a distance of 100, with a field of view of 30 degrees.
+    expected_pixel_size = 2 * math.sqrt(3) / (2 * 100 * math.tan(math.radians(15))) * 1000
+    assert get_level_of_detail.call_args[0][0] is mesh_data
+    assert get_level_of_detail.call_args[0][1] == pytest.approx(expected_pixel_size, rel = 0.02)
+
+
+def test_renderRangeWithoutLevelOfDetail():
+    mocked_shader = MagicMock()
+    with patch("UM.View.GL.OpenGL.OpenGL.getInstance"):
+        render_batch = RenderBatch(mocked_shader, level_of_detail = True, range = (0, 10))
+    mb = MeshBuilder()
+    mb.addCube(2, 2, 2)
+    render_batch.addItem(Matrix(), mb.build())
+
+    mocked_camera = MagicMock()
+    with patch("UM.View.GL.OpenGL.OpenGL.getInstance"):
+        with patch("UM.View.GL.OpenGLContext.OpenGLContext.properties"):
+            with patch("UM.View.RenderBatch.getLevelOfDetail") as get_level_of_detail:
+                render_batch.render(mocked_camera)
+    assert get_level_of_detail.call_count == 0
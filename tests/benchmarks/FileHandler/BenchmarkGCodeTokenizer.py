@@ -0,0 +1,80 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+from UM.FileHandler.gcodetokenizer import tokenizeLine
+
+# A mix of lines as they occur in the middle of a layer.
+lines = [
+    ";TYPE:WALL-INNER",
+    "G0 F7200 X105.525 Y93.49",
+    "G1 F2700 E-2.86390",
+    "G1 X107.068 Y93.401 E0.68195",
+    "G1 X107.068 Y88.655 E1.15213 ;comment",
+    "G0 X104.234 Y87.876 Z0.4",
+    "G1 X103.613 E1.15213",
+    ";MESH:NONMESH",
+    "G92 E0",
+    "M107",
+] * 10000
+
+
+def _stringMunging(line):
+    """How the transform decoded a line before the tokenizer, for comparison."""
+
+    line = line.strip()
+    if ";Layer height:" in line or ";secondary_z_axis:" in line or line.startswith("M"):
+        return None
+    if ";LAYER:" in line or ";TYPE:" in line or len(line) == 0 or line[0] == ";":
+        return None
+    if ";" in line:
+        out = line.split(";")[0].replace("E", "A").strip()
+    elif "S" in line:
+        out = line.split("S")[0].strip()
+    else:
+        out = line.replace("E", "A").strip()
+    currX = -1
+    currY = -1
+    for fld in out.split(" "):
+        if fld.startswith("X"):
+            currX = float(fld.replace("X", ""))
+        if fld.startswith("Y"):
+            currY = float(fld.replace("Y", ""))
+    if " Z" in line:
+        tempVal = line.split(" Z")[1].split(" ")[0]
+        out = out.replace(" Z" + tempVal, "")
+    return out, currX, currY
+
+
+def _tokenized(line):
+    tokens = tokenizeLine(line)
+    if tokens.comment is not None and ":" in tokens.comment:
+        if tokens.hasTag("Layer height:") or tokens.hasTag("secondary_z_axis:"):
+            return None
+        if tokens.hasTag("LAYER:") or tokens.hasTag("TYPE:"):
+            return None
+    if not tokens.code or tokens.command.startswith("M"):
+        return None
+    words = tokens.words
+    out = tokens.code.replace("E", "A")
+    if "Z" in words:
+        out = out.replace(" Z" + words["Z"], "")
+    return out, float(words.get("X", -1)), float(words.get("Y", -1))
+
+
+def _decodeAll(decode):
+    for line in lines:
+        decode(line)
+
+
+def _recordLinesPerSecond(benchmark):
+    benchmark.extra_info["lines_per_second"] = len(lines) / benchmark.stats.stats.mean
+
+
+def benchmark_stringMunging(benchmark):
+    benchmark(_decodeAll, _stringMunging)
+    _recordLinesPerSecond(benchmark)
+
+
+def benchmark_tokenizeLine(benchmark):
+    benchmark(_decodeAll, _tokenized)
+    _recordLinesPerSecond(benchmark)
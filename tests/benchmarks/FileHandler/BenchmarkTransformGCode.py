@@ -0,0 +1,220 @@
+# Copyright (c) 2026 Ultimaker B.V.
+# Uranium is released under the terms of the LGPLv3 or higher.
+
+import io
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from UM.FileHandler.gcode import TransformGCode
+from UM.FileHandler.gcodecache import LayerCache
+
+# Number of lines of the generated G-code files. The larger files take minutes
+# per round, so they are only benchmarked when URANIUM_BENCHMARK_LARGE_GCODE is set.
+sizes = [10000, 100000]
+large_sizes = [1000000, 10000000]
+if os.environ.get("URANIUM_BENCHMARK_LARGE_GCODE"):
+    sizes += large_sizes
+
+slice_types = ["SKIRT", "WALL-INNER", "WALL-OUTER", "SKIN", "FILL"]
+moves_per_type = 40
+
+transform_script = os.path.join(os.path.dirname(__file__), "..", "..", "..", "UM", "FileHandler", "transform.py")
+
+
+def _generateGCode(line_count):
+    """Lines of G-code like CuraEngine writes them, with layers of all slice types.
+
+    The moves wander around randomly, with the travels, retractions, Z hops and
+    comments that the transform treats differently from the extrusion moves.
+    """
+
+    rng = random.Random(line_count)
+    yield from [";FLAVOR:Marlin", ";TIME:123456", ";Filament used: 12.3m", ";Layer height: 0.2",
+                ";secondary_z_axis: 2", ";Generated with Cura_SteamEngine 5.0", "M140 S60", "M105",
+                "M190 S60", "M104 S200", "M109 S200", "M82 ;absolute extrusion mode", "G28 ;Home", "G92 E0",
+                "G1 Z15.0 F6000 ;Move the platform down 15mm", "G1 F200 E3", "G92 E0"]
+    count = 17
+    layer = 0
+    x = y = 100.0
+    e = 0.0
+    while count < line_count:
+        yield ";LAYER:%d" % layer
+        yield "M107"
+        count += 2
+        for slice_type in slice_types[0 if layer == 0 else 1:]:
+            yield ";TYPE:" + slice_type
+            yield "G0 F7200 X%.3f Y%.3f Z%.1f" % (x, y, (layer + 1) * 0.2)
+            count += 2
+            for _ in range(moves_per_type):
+                x = min(max(x + rng.uniform(-5, 5), 0.0), 200.0)
+                y = min(max(y + rng.uniform(-5, 5), 0.0), 200.0)
+                kind = rng.random()
+                if kind < 0.1:
+                    yield "G0 F7200 X%.3f Y%.3f" % (x, y)
+                elif kind < 0.13:
+                    yield "G1 F2700 E%.5f" % (e - 6.5)
+                elif kind < 0.15:
+                    yield "G1 X%.3f Y%.3f E%.5f ;comment" % (x, y, e)
+                elif kind < 0.16:
+                    yield ";MESH:NONMESH"
+                else:
+                    e += rng.uniform(0.01, 0.5)
+                    yield "G1 X%.3f Y%.3f E%.5f" % (x, y, e)
+                count += 1
+        yield ";TIME_ELAPSED:%.1f" % (layer * 10.0)
+        count += 1
+        layer += 1
+    yield from ["G1 F2700 E%.5f" % (e - 6.5), "M140 S0", "M107", "G91", "G1 E-2 F2700", "G90", "M84", "M104 S0", ";End of Gcode"]
+
+
+@pytest.fixture(scope = "module")
+def gcode_files(tmp_path_factory):
+    """The generated G-code files by number of lines, written once per module."""
+
+    directory = tmp_path_factory.mktemp("gcode")
+    files = {}
+    for size in sizes:
+        path = str(directory / "synthetic_{size}.gcode".format(size = size))
+        with open(path, "w") as f:
+            f.writelines(line + "\n" for line in _generateGCode(size))
+        files[size] = path
+    return files
+
+
+def _rounds(size):
+    return max(1, min(5, 1000000 // size))
+
+
+def _recordThroughput(benchmark, path):
+    with open(path, "rb") as f:
+        line_count = sum(1 for _ in f)
+    seconds = benchmark.stats.stats.mean
+    benchmark.extra_info["lines"] = line_count
+    benchmark.extra_info["lines_per_second"] = line_count / seconds
+    benchmark.extra_info["megabytes_per_second"] = os.path.getsize(path) / seconds / (1024 * 1024)
+
+
+def _recordPhases(benchmark, transform, seconds):
+    """Splits the time of a transform into where it went, from its layer metrics."""
+
+    metrics = transform.getMetrics()
+    start = time.perf_counter()
+    transform.getPreviewHTML()
+    preview_seconds = time.perf_counter() - start
+    layer_seconds = sum(entry.seconds for entry in metrics[1:])
+    benchmark.extra_info["layers"] = len(metrics) - 1
+    benchmark.extra_info["phase_seconds"] = {
+        "header": metrics[0].seconds,
+        "layers": layer_seconds,
+        "other": max(0.0, seconds - metrics[0].seconds - layer_seconds),
+        "preview_html": preview_seconds
+    }
+    benchmark.extra_info["slowest_layer_seconds"] = max((entry.seconds for entry in metrics[1:]), default = 0.0)
+    benchmark.extra_info["cached_layers"] = sum(1 for entry in metrics if entry.cached)
+
+
+def _recordPeakMemory(benchmark, function):
+    """Runs the function once more with allocations traced, which is too slow to time."""
+
+    tracemalloc.start()
+    try:
+        function()
+        benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _benchmarkUpdateGcode(benchmark, size, source, destination, processes = 1, cache = None):
+    transform = TransformGCode()
+    transform.setLayerCache(cache)
+    timings = []
+
+    def update():
+        start = time.perf_counter()
+        transform.updateGcode(source, destination, processes)
+        timings.append(time.perf_counter() - start)
+
+    with patch("UM.FileHandler.gcode.TransformGCode.openInCoach"), patch("builtins.print"):
+        if cache is not None:
+            update()  # Fills the cache, so that every round reuses all layers.
+        benchmark.pedantic(update, rounds = _rounds(size), iterations = 1)
+        _recordThroughput(benchmark, source)
+        _recordPhases(benchmark, transform, timings[-1])
+        _recordPeakMemory(benchmark, update)
+
+
+@pytest.mark.parametrize("size", sizes)
+def benchmark_updateGcode(benchmark, gcode_files, tmp_path, size):
+    _benchmarkUpdateGcode(benchmark, size, gcode_files[size], str(tmp_path / "transformed.gcode"))
+
+
+@pytest.mark.parametrize("size", sizes)
+def benchmark_updateGcodeLayerRanges(benchmark, gcode_files, tmp_path, size):
+    with patch.object(TransformGCode, "layerRangeSize", 256 * 1024):
+        _benchmarkUpdateGcode(benchmark, size, gcode_files[size], str(tmp_path / "transformed.gcode"), processes = max(2, os.cpu_count() or 1))
+
+
+@pytest.mark.parametrize("size", sizes)
+def benchmark_updateGcodeLayerCache(benchmark, gcode_files, tmp_path, size):
+    cache = LayerCache(str(tmp_path / "transformed.cache"))
+    _benchmarkUpdateGcode(benchmark, size, gcode_files[size], str(tmp_path / "transformed.gcode"), cache = cache)
+
+
+@pytest.mark.parametrize("size", sizes)
+def benchmark_transformScript(benchmark, gcode_files, tmp_path, size):
+    source = gcode_files[size]
+    command = [sys.executable, transform_script, source, str(tmp_path / "transformed.gcode")]
+    benchmark.pedantic(subprocess.run, args = (command,), kwargs = {"check": True, "stdout": subprocess.DEVNULL}, rounds = _rounds(size), iterations = 1)
+    _recordThroughput(benchmark, source)
+
+
+class _CountingFile(io.FileIO):
+    """A file that counts the writes that reach the operating system."""
+
+    def __init__(self, path):
+        super().__init__(path, "w")
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def _openCounting(path):
+    """Opens path for writing like open(path, "w", buffering = TransformGCode.bufferSize)
+    does, on top of a _CountingFile."""
+
+    raw = _CountingFile(path)
+    return io.TextIOWrapper(io.BufferedWriter(raw, TransformGCode.bufferSize)), raw
+
+
+def benchmark_writeOutput(benchmark, tmp_path):
+    """The output stage alone: numbering and writing a million lines in layers of 500 lines."""
+
+    line_count = 1000000
+    layer_lines = 500
+    codes = ["G1 X{0:.3f} Y{1:.3f} A{2:.5f}".format(i % 200 / 1.7, i % 150 / 1.3, i / 1000) for i in range(layer_lines)]
+    transform = TransformGCode()
+    files = []
+
+    def writeOutput():
+        destination, raw = _openCounting(str(tmp_path / "output.gcode"))
+        files.append(raw)
+        with destination:
+            transform._destination = destination
+            for start in range(1, line_count + 1, layer_lines):
+                transform._numbers = list(range(start, start + layer_lines))
+                transform._codes = list(codes)
+                transform._writeLines()
+
+    benchmark.pedantic(writeOutput, rounds = 5, iterations = 1)
+    benchmark.extra_info["lines_per_second"] = line_count / benchmark.stats.stats.mean
+    benchmark.extra_info["writes_per_million_lines"] = files[-1].writes * 1000000 / line_count
+    _recordPeakMemory(benchmark, writeOutput)